@@ -0,0 +1,57 @@
+# /backend/analyze_videos.py
+"""RGB/TIR 영상 쌍 오프라인 일괄 분석 (브라우저/소켓 없이 최대 속도로 실행)
+
+입력 디렉터리의 *rgb* 영상과 이름이 맞는 *tir* 영상을 짝지어 디코딩과 배치 추론을 파이프라인으로 처리하고,
+영상별 열 단위 탐지 파일(<영상>.detections.npz)과 요약(<영상>.summary.json), 전체 보고서(report.json)를 저장합니다.
+
+사용법 (backend/ 에서):
+    python analyze_videos.py [--input test_videos] [--output analysis_results/<시각>] [--model ...]
+                             [--batch-size 8] [--frame-stride 1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from app.services.cpu_scheduler import get_cpu_scheduler
+from app.services.model_registry import load_standalone_model
+from app.services.offline_analysis import (
+    DEFAULT_BATCH_SIZE, DEFAULT_FRAME_STRIDE, RESULTS_FOLDER, TEST_VIDEOS_FOLDER, analyze_directory,
+)
+from app.services.settings_service import get_setting
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RGB/TIR 영상 오프라인 일괄 분석')
+    parser.add_argument('--input', default=TEST_VIDEOS_FOLDER, help='영상 디렉터리 (기본: test_videos)')
+    parser.add_argument('--output', default=None, help='결과 디렉터리 (기본: analysis_results/<시각>)')
+    parser.add_argument('--model', default=get_setting('default_model', 'yolo11n_early_fusion.pt'))
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--frame-stride', type=int, default=DEFAULT_FRAME_STRIDE, help='N프레임마다 한 번 분석')
+    args = parser.parse_args()
+
+    output_dir = args.output or os.path.join(RESULTS_FOLDER, time.strftime('%Y%m%d_%H%M%S'))
+    get_cpu_scheduler()  # torch 스레드 설정은 모델 워밍업 전에 적용해야 함
+    model = load_standalone_model(args.model)
+    if model is None:
+        print(f"[오프라인 분석] 모델을 로드할 수 없습니다: {args.model}")
+        sys.exit(1)
+
+    def progress(pair_index, pair_count, done, total):
+        print(f"\r  [{pair_index + 1}/{pair_count}] {done}/{total or '?'} 프레임", end='', flush=True)
+
+    report = analyze_directory(model, args.model, args.input, output_dir, batch_size=args.batch_size,
+                               frame_stride=args.frame_stride, progress=progress)
+    print()
+    if not report['pairs']:
+        print(f"[오프라인 분석] RGB 영상이 없습니다: {os.path.abspath(args.input)}")
+        sys.exit(1)
+    print(f"[오프라인 분석] 영상 {report['pairs']}쌍, {report['frames_analyzed']}프레임 "
+          f"(영상 길이 {report['video_seconds']:.0f}초), {report['elapsed_seconds']:.1f}초, {report['fps']:.1f} FPS")
+    print(f"  클래스별 탐지 수: {report['detections_per_class']}")
+    print(f"  결과: {os.path.abspath(output_dir)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -29,7 +29,16 @@ def create_app(config_name):
     cors.init_app(app, resources={r"/api/*": {"origins": allowed_origins}, r"/event_recordings/*": {"origins": allowed_origins}})
     # SocketIO 설정: 정의된 목록에 대해서만 소켓 연결을 허용합니다.
     socketio.init_app(app, cors_allowed_origins=allowed_origins)
-    
+
+    # CPU 스케줄러와 추론 실행기를 다른 서비스보다 먼저 생성
+    # - torch inter-op 스레드 수는 모델 워밍업 등 첫 병렬 작업 전에만 설정 가능
+    # - eventlet tpool 스레드 수는 첫 tpool.execute() 전에만 적용되므로 모델 레지스트리 로드 등이 tpool을 먼저 사용하면
+    #   inference_workers 설정이 무시됨
+    from .services.cpu_scheduler import get_cpu_scheduler
+    from .services.inference_service import get_inference_executor
+    get_cpu_scheduler()
+    get_inference_executor()
+
     # 블루프린트 등록
     from .auth.routes import auth_bp
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -6,6 +6,7 @@ from functools import wraps
 from . import api_bp
 from ..extensions import db
 from ..models.db_models import DetectionEvent, User, Camera
+from ..services.settings_service import update_settings, load_settings, get_camera_setting
 import os
 # from werkzeug.security import generate_password_hash
 
@@ -91,7 +92,9 @@ def get_all_cameras():
         "camera_name": cam.camera_name,
         "source": cam.source,
         "location": cam.location,
-        "status": cam.status
+        "status": cam.status,
+        "rgb_source": get_camera_setting(cam.id, 'rgb_source', None),
+        "tir_source": get_camera_setting(cam.id, 'tir_source', None)
     } for cam in cameras])
     
 @api_bp.route('/cameras', methods=['POST'])
@@ -109,6 +112,13 @@ def add_camera():
     )
     db.session.add(new_cam)
     db.session.commit()
+
+    # RGB/TIR 카메라가 따로 있는 다중 스펙트럼 카메라: 센서별 소스를 카메라별 설정(settings.json)에 저장
+    sensor_sources = {key: data[key] for key in ('rgb_source', 'tir_source') if data.get(key) not in (None, '')}
+    if sensor_sources:
+        camera_settings = load_settings().get('camera_settings', {})
+        camera_settings.setdefault(str(new_cam.id), {}).update(sensor_sources)
+        update_settings({'camera_settings': camera_settings})
     return jsonify({"message": "카메라가 성공적으로 추가되었습니다."}), 201
 
 @api_bp.route('/cameras/<int:camera_id>', methods=['DELETE'])
@@ -202,7 +212,14 @@ def serve_event_recording(filename):
 @api_bp.route('/models', methods=['GET'])
 @jwt_required()
 def get_models():
-    """/backend/models_ai/ 폴더에 있는 .pt 모델 파일 목록을 반환합니다."""
+    """/backend/models_ai/ 폴더에 있는 .pt 모델 파일 목록을 반환합니다.
+
+    등록된 INT8 양자화 변형은 원본 모델 바로 뒤에 함께 반환하며,
+    ?detail=1이면 모델별 백엔드와 양자화 변형의 정확도 변화/속도 향상 정보를 함께 반환합니다.
+    """
+    from ..services.onnx_backend import get_model_backend
+    from ..services.quantization import list_quantized_variants
+
     try:
         models_path = os.path.join(current_app.root_path, '..', 'models_ai')
         
@@ -220,7 +237,32 @@ def get_models():
             return jsonify(['yolo11n_early_fusion.pt', 'yolo11n_mid_fusion.pt', 'yolo11n.pt'])
         
         print(f"[*] 발견된 모델 파일: {model_files}")
-        return jsonify(model_files)
+        variants = list_quantized_variants()
+        if request.args.get('detail') == '1':
+            models = []
+            for model_file in model_files:
+                models.append({'name': model_file, 'type': 'original', 'backend': get_model_backend(model_file)})
+                models.extend({
+                    'name': variant['name'],
+                    'type': 'quantized',
+                    'backend': 'onnx',
+                    'source': model_file,
+                    'mode': variant['mode'],
+                    'speedup': variant['speedup'],
+                    'fp32_ms': variant['fp32_ms'],
+                    'int8_ms': variant['int8_ms'],
+                    'map50_drift': variant['map50_drift'],
+                    'recall_drift': variant['recall_drift'],
+                    'size_mb': variant['size_mb'],
+                    'stale': variant['stale'],
+                } for variant in variants if variant['source'] == model_file)
+            return jsonify(models)
+
+        model_names = []
+        for model_file in model_files:
+            model_names.append(model_file)
+            model_names.extend(variant['name'] for variant in variants if variant['source'] == model_file)
+        return jsonify(model_names)
     except Exception as e:
         print(f"모델 목록을 불러오는 중 오류 발생: {e}")
         # 오류 시 기본 모델 목록 반환
@@ -257,20 +299,113 @@ def set_default_model():
         if not new_model:
             return jsonify({'error': '모델명이 필요합니다.'}), 400
         
-        # 설정 파일 업데이트
-        import json
-        settings_path = os.path.join(current_app.root_path, '..', 'settings.json')
-        
-        settings = {
-            'default_model': new_model
-        }
-        
-        with open(settings_path, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        # 설정 파일 업데이트 (다른 설정 키는 유지)
+        update_settings({'default_model': new_model})
         
         print(f"기본 모델 설정 업데이트: {new_model}")
         return jsonify({'message': f'기본 모델이 {new_model}로 설정되었습니다.'}), 200
         
     except Exception as e:
         print(f"기본 모델 설정 중 오류: {str(e)}")
-        return jsonify({'error': '기본 모델 설정에 실패했습니다.'}), 500
\ No newline at end of file
+        return jsonify({'error': '기본 모델 설정에 실패했습니다.'}), 500
+
+# --- 추론 상태 조회 API (관리자 전용) ---
+@api_bp.route('/inference/stats', methods=['GET'])
+@admin_required()
+def get_inference_status():
+    """추론 실행기 및 배치 추론 서버의 배치 크기/지연 통계를 반환합니다."""
+    from ..services.inference_service import get_inference_stats
+    from ..services.pipeline_service import get_pipeline_stats
+    stats = get_inference_stats()
+    stats['pipelines'] = get_pipeline_stats()
+    return jsonify(stats), 200
+
+# --- 로드된 AI 모델 조회 API (관리자 전용) ---
+@api_bp.route('/models/loaded', methods=['GET'])
+@admin_required()
+def get_loaded_models():
+    """모델 레지스트리에 로드되어 있는 모델 목록과 메모리 사용량을 반환합니다."""
+    from ..services.model_registry import get_model_registry
+    return jsonify(get_model_registry().stats()), 200
+
+# --- 스트림 상태 조회 API (관리자 전용) ---
+@api_bp.route('/streams/stats', methods=['GET'])
+@admin_required()
+def get_stream_stats():
+    """실행 중인 스트림별 캡처/녹화 버퍼 상태(메모리 사용량 포함)를 반환합니다."""
+    from ..services.video_service import stream_stats
+    return jsonify(stream_stats), 200
+
+@api_bp.route('/streams/transport', methods=['GET'])
+@admin_required()
+def get_stream_transport_stats():
+    """프레임 전송 방식(binary/base64)별 누적 전송량과 초당 전송량을 반환합니다."""
+    from ..services.frame_transport import get_transport_stats
+    return jsonify(get_transport_stats()), 200
+
+# --- 오프라인 일괄 분석 API (관리자 전용) ---
+@api_bp.route('/analysis/jobs', methods=['POST'])
+@admin_required()
+def create_analysis_job():
+    """test_videos/의 RGB/TIR 영상 쌍 전체를 최대 속도로 분석하는 백그라운드 작업을 시작합니다."""
+    from ..services.offline_analysis import start_analysis_job, DEFAULT_BATCH_SIZE, DEFAULT_FRAME_STRIDE
+    from ..services.settings_service import get_setting
+    data = request.get_json(silent=True) or {}
+    model_name = data.get('model') or get_setting('default_model', 'yolo11n_early_fusion.pt')
+    if '..' in model_name or '/' in model_name or '\\' in model_name:
+        return jsonify({'error': '잘못된 모델 이름입니다.'}), 400
+    try:
+        batch_size = int(data.get('batch_size', DEFAULT_BATCH_SIZE))
+        frame_stride = int(data.get('frame_stride', DEFAULT_FRAME_STRIDE))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'batch_size와 frame_stride는 정수여야 합니다.'}), 400
+    job = start_analysis_job(model_name, batch_size=max(1, batch_size), frame_stride=max(1, frame_stride))
+    return jsonify(job), 202
+
+@api_bp.route('/analysis/jobs', methods=['GET'])
+@admin_required()
+def list_analysis_jobs():
+    """오프라인 분석 작업 목록과 진행 상태를 반환합니다. (보고서 본문 제외)"""
+    from ..services.offline_analysis import analysis_jobs
+    return jsonify([{key: value for key, value in job.items() if key != 'report'}
+                    for job in analysis_jobs.values()]), 200
+
+@api_bp.route('/analysis/jobs/<job_id>', methods=['GET'])
+@admin_required()
+def get_analysis_job(job_id):
+    """오프라인 분석 작업의 상태와 완료 시 요약 보고서를 반환합니다."""
+    from ..services.offline_analysis import analysis_jobs
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '분석 작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job), 200
+
+# --- 시험 영상 미리 디코딩 API (관리자 전용) ---
+@api_bp.route('/frame_cache', methods=['POST'])
+@admin_required()
+def create_frame_cache():
+    """시험 영상 쌍을 미리 디코딩하여 프레임 캐시에 저장합니다. (rgb를 지정하지 않으면 test_videos/ 전체)"""
+    from ..services.frame_store import start_predecode
+    from ..services.offline_analysis import find_video_pairs
+    data = request.get_json(silent=True) or {}
+    test_videos_path = os.path.join(current_app.root_path, '..', 'test_videos')
+    if data.get('rgb'):
+        names = [data['rgb']] + ([data['tir']] if data.get('tir') else [])
+        if any('..' in name or '/' in name or '\\' in name for name in names):
+            return jsonify({'error': '잘못된 파일 이름입니다.'}), 400
+        rgb_path = os.path.join(test_videos_path, data['rgb'])
+        tir_path = os.path.join(test_videos_path, data['tir']) if data.get('tir') else None
+        if not os.path.exists(rgb_path) or (tir_path and not os.path.exists(tir_path)):
+            return jsonify({'error': '영상 파일을 찾을 수 없습니다.'}), 404
+        pairs = [(rgb_path, tir_path)]
+    else:
+        pairs = find_video_pairs(test_videos_path)
+    started = [os.path.basename(rgb_path) for rgb_path, tir_path in pairs if start_predecode(rgb_path, tir_path)]
+    return jsonify({'started': started}), 202
+
+@api_bp.route('/frame_cache', methods=['GET'])
+@admin_required()
+def get_frame_cache():
+    """미리 디코딩된 시험 영상 목록과 캐시 디렉터리 사용량을 반환합니다."""
+    from ..services.frame_store import get_frame_store_stats
+    return jsonify(get_frame_store_stats()), 200
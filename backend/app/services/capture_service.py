@@ -0,0 +1,236 @@
+# /backend/app/services/capture_service.py
+
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class FrameGrabber:
+    """별도 OS 스레드에서 프레임을 계속 읽어 최신 프레임만 보관하는 캡처 단계
+
+    run.py에서 eventlet을 thread=False로 패치하므로 threading.Thread는 실제 OS 스레드로 동작합니다.
+    따라서 cap.read()가 블로킹되어도 eventlet 허브(다른 소켓/REST 요청)가 멈추지 않고,
+    OpenCV 내부 버퍼에 프레임이 쌓이지 않도록 계속 비워 추론 루프는 항상 가장 최신 프레임을 처리합니다.
+    """
+
+    def __init__(self, cap, name='capture', buffer_size=1, drop_policy='oldest', pace_fps=None, loop=False):
+        self.cap = cap
+        self.name = name
+        self.buffer_size = max(1, int(buffer_size))
+        # 영상 파일을 카메라 대신 쓸 때: pace_fps 속도로만 읽고(파일은 카메라와 달리 즉시 읽히므로) 끝나면 처음부터 반복
+        self.pace_fps = pace_fps if pace_fps and pace_fps > 0 else None
+        self.loop = loop
+        # 'oldest': 버퍼가 가득 차면 가장 오래된 프레임 폐기 (최신 프레임 우선)
+        # 'newest': 버퍼가 가득 차면 새로 들어온 프레임 폐기 (연속성 우선)
+        self.drop_policy = drop_policy if drop_policy in ('oldest', 'newest') else 'oldest'
+
+        self._frames = deque()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.seq = 0                 # 캡처한 프레임 일련번호
+        self.grabbed_count = 0       # 캡처에 성공한 프레임 수
+        self.dropped_count = 0       # 소비되기 전에 폐기된 프레임 수
+        self.consumed_count = 0      # 추론 루프가 가져간 프레임 수
+        self.last_grab_time = None
+        self.is_eof = False          # 소스가 더 이상 프레임을 주지 않음 (카메라 끊김/파일 끝)
+
+    def start(self):
+        """캡처 스레드 시작"""
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name=f"FrameGrabber-{self.name}", daemon=True)
+        self._thread.start()
+        print(f"[캡처] {self.name} 캡처 스레드 시작 (버퍼: {self.buffer_size}, 폐기 정책: {self.drop_policy})")
+        return self
+
+    def _run(self):
+        next_due = time.perf_counter()
+        while not self._stop_event.is_set():
+            if self.pace_fps:
+                next_due += 1.0 / self.pace_fps
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    next_due = time.perf_counter()  # 늦어진 만큼 몰아서 읽지 않음
+            ret, frame = self.cap.read()
+            grab_time = time.time()  # 추론 시점이 아닌 캡처 시점의 타임스탬프
+            if not ret and self.loop:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self.cap.read()
+                grab_time = time.time()
+            if not ret:
+                self.is_eof = True
+                print(f"[캡처] {self.name} 프레임 읽기 실패 - 캡처 스레드 종료")
+                break
+
+            with self._lock:
+                self.seq += 1
+                self.grabbed_count += 1
+                self.last_grab_time = grab_time
+                if len(self._frames) >= self.buffer_size:
+                    self.dropped_count += 1
+                    if self.drop_policy == 'newest':
+                        continue
+                    self._frames.popleft()
+                self._frames.append((self.seq, grab_time, frame))
+
+    def read(self):
+        """가장 오래된 미소비 프레임을 (seq, timestamp, frame)으로 반환, 없으면 None
+
+        buffer_size=1이면 항상 최신 프레임 하나만 반환됩니다. 블로킹하지 않으므로
+        호출하는 greenlet은 None을 받으면 socketio.sleep()으로 양보해야 합니다.
+        """
+        with self._lock:
+            if not self._frames:
+                return None
+            self.consumed_count += 1
+            return self._frames.popleft()
+
+    def is_alive(self):
+        """캡처 스레드가 동작 중이거나 아직 소비되지 않은 프레임이 남아있는지 여부"""
+        if self._frames:
+            return True
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=1.0):
+        """캡처 스레드 종료 (cap.release()는 호출한 쪽에서 처리)"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self):
+        """캡처 통계 반환"""
+        with self._lock:
+            return {
+                'grabbed': self.grabbed_count,
+                'dropped': self.dropped_count,
+                'consumed': self.consumed_count,
+                'buffered': len(self._frames),
+                'last_grab_time': self.last_grab_time,
+            }
+
+
+class DualSensorCapture:
+    """RGB/TIR 카메라를 각각 별도 캡처 스레드로 읽고 캡처 시각이 가장 가까운 프레임끼리 짝짓는 캡처 단계
+
+    두 센서는 서로를 기다리지 않고 각자의 FrameGrabber에서 계속 읽으며, read()는 가장 최신 RGB 프레임과
+    캡처 시각 차이(skew)가 tolerance 이내인 TIR 프레임을 찾아 (seq, timestamp, RGB, TIR)로 반환합니다.
+    짝이 될 TIR 프레임이 아직 도착하지 않았으면 tolerance만큼만 기다리고, 그래도 없으면 RGB 프레임을 버립니다.
+    TIR 카메라의 해상도가 RGB와 다르면 짝지은 TIR 프레임을 RGB 해상도로 맞춰 반환합니다
+    (탐지 박스를 두 화면에 같은 좌표로 그리고 4채널 입력을 만들 수 있도록).
+    TIR 캡처가 끝나면(카메라 끊김) TIR 없이 RGB만 반환하여 스트림은 계속됩니다 (TIR 자리는 None).
+    FrameGrabber와 같은 read()/is_alive()/stop()/stats() 인터페이스를 제공합니다.
+    """
+
+    def __init__(self, rgb_cap, tir_cap, name='dual', tolerance=0.025, buffer_size=8, pace=False, loop=False):
+        self.name = name
+        self.tolerance = float(tolerance)
+        # pace=True: 영상 파일로 카메라를 대신할 때 각 파일의 원본 FPS 속도로 읽음
+        self.rgb = FrameGrabber(rgb_cap, name=f"{name}-rgb", buffer_size=buffer_size,
+                                pace_fps=rgb_cap.get(cv2.CAP_PROP_FPS) if pace else None, loop=loop)
+        self.tir = FrameGrabber(tir_cap, name=f"{name}-tir", buffer_size=buffer_size,
+                                pace_fps=tir_cap.get(cv2.CAP_PROP_FPS) if pace else None, loop=loop)
+        self._rgb_frames = deque(maxlen=buffer_size)
+        self._tir_frames = deque(maxlen=buffer_size)
+        self._skews = deque(maxlen=300)  # 최근 짝의 (TIR 시각 - RGB 시각), 초
+
+        self.paired_count = 0        # 짝지어 반환한 프레임 수
+        self.unmatched_rgb = 0       # tolerance 안에 짝이 없어 버린 RGB 프레임 수
+        self.unmatched_tir = 0       # 어떤 RGB와도 짝지어지지 않고 지나간 TIR 프레임 수
+        self.rgb_only_count = 0      # TIR 캡처 종료 후 RGB만 반환한 프레임 수
+
+    def start(self):
+        self.rgb.start()
+        self.tir.start()
+        print(f"[캡처] {self.name} RGB/TIR 동기화 캡처 시작 (허용 시각 차이: {self.tolerance * 1000:.0f}ms)")
+        return self
+
+    @property
+    def dropped_count(self):
+        return self.rgb.dropped_count
+
+    def _drain(self):
+        for grabber, frames in ((self.rgb, self._rgb_frames), (self.tir, self._tir_frames)):
+            while True:
+                grabbed = grabber.read()
+                if grabbed is None:
+                    break
+                if len(frames) == frames.maxlen and frames is self._tir_frames:
+                    self.unmatched_tir += 1
+                frames.append(grabbed)
+
+    def read(self):
+        """(seq, RGB 캡처 시각, RGB 프레임, TIR 프레임 또는 None) 반환, 반환할 짝이 아직 없으면 None (블로킹하지 않음)"""
+        self._drain()
+        if not self._rgb_frames:
+            return None
+        seq, rgb_time, frame_rgb = self._rgb_frames[-1]  # 실시간 처리는 가장 최신 RGB 기준 (이전 프레임은 폐기)
+
+        if self._tir_frames:
+            nearest = min(range(len(self._tir_frames)), key=lambda i: abs(self._tir_frames[i][1] - rgb_time))
+            _, tir_time, frame_tir = self._tir_frames[nearest]
+            skew = tir_time - rgb_time
+            if abs(skew) <= self.tolerance:
+                self.unmatched_tir += nearest  # 짝보다 먼저 들어온 TIR 프레임은 더 이상 쓸 일이 없음
+                for _ in range(nearest + 1):
+                    self._tir_frames.popleft()
+                self._rgb_frames.clear()
+                self._skews.append(skew)
+                self.paired_count += 1
+                if frame_tir.shape[:2] != frame_rgb.shape[:2]:
+                    frame_tir = cv2.resize(frame_tir, (frame_rgb.shape[1], frame_rgb.shape[0]))
+                return seq, rgb_time, frame_rgb, frame_tir
+
+        if not self.tir.is_alive():
+            self._rgb_frames.clear()
+            self.rgb_only_count += 1
+            return seq, rgb_time, frame_rgb, None
+
+        newest_tir_time = self._tir_frames[-1][1] if self._tir_frames else None
+        if (newest_tir_time is None or newest_tir_time < rgb_time) and time.time() - rgb_time <= self.tolerance:
+            return None  # 이 RGB 프레임과 짝이 될 TIR 프레임이 곧 도착할 수 있음
+
+        self.unmatched_rgb += len(self._rgb_frames)
+        self._rgb_frames.clear()
+        while self._tir_frames and self._tir_frames[0][1] < rgb_time - self.tolerance:
+            self._tir_frames.popleft()  # 다음 RGB 프레임과도 짝이 될 수 없는 오래된 TIR 프레임
+            self.unmatched_tir += 1
+        return None
+
+    def is_alive(self):
+        """RGB 캡처가 동작 중인지 여부 (TIR만 끊기면 RGB로 계속 진행)"""
+        return bool(self._rgb_frames) or self.rgb.is_alive()
+
+    def stop(self, timeout=1.0):
+        self.rgb.stop(timeout)
+        self.tir.stop(timeout)
+        self._rgb_frames.clear()
+        self._tir_frames.clear()
+
+    def stats(self):
+        """캡처/짝짓기 통계 (skew는 최근 짝 기준, TIR이 늦으면 양수)"""
+        rgb_stats, tir_stats = self.rgb.stats(), self.tir.stats()
+        skews_ms = sorted(abs(skew) * 1000 for skew in self._skews)
+        return {
+            'grabbed': rgb_stats['grabbed'],
+            'dropped': rgb_stats['dropped'],
+            'consumed': self.paired_count + self.rgb_only_count,
+            'tir_grabbed': tir_stats['grabbed'],
+            'tir_alive': self.tir.is_alive(),
+            'paired': self.paired_count,
+            'unmatched_rgb': self.unmatched_rgb,
+            'unmatched_tir': self.unmatched_tir,
+            'rgb_only': self.rgb_only_count,
+            'tolerance_ms': self.tolerance * 1000,
+            'skew_mean_ms': sum(self._skews) / len(self._skews) * 1000 if self._skews else 0.0,
+            'skew_abs_p95_ms': skews_ms[int(len(skews_ms) * 0.95) - 1] if skews_ms else 0.0,
+            'skew_abs_max_ms': skews_ms[-1] if skews_ms else 0.0,
+            'last_grab_time': rgb_stats['last_grab_time'],
+        }
@@ -0,0 +1,191 @@
+# /backend/app/services/cpu_scheduler.py
+
+import os
+import threading
+import time
+from collections import deque
+
+from .settings_service import get_setting
+
+# --- CPU 스레드 분배 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_THREADS_PER_WORKER = 0      # 추론 워커 하나가 쓸 intra-op 스레드 수 (0 = 코어 수와 활성 파이프라인 수로 자동 계산)
+DEFAULT_INTEROP_THREADS = 1         # PyTorch inter-op 스레드 수 (병렬성은 추론 워커 수로 확보)
+DEFAULT_RESERVED_CORES = 1          # eventlet 허브, 캡처, 인코딩용으로 추론에서 제외할 코어 수
+DEFAULT_CPU_AFFINITY = False        # 워커별로 겹치지 않는 코어 구간에 고정 (Linux 전용)
+FPS_WINDOW_SECONDS = 5.0            # 파이프라인별 FPS 계산 구간(초)
+
+
+def _available_cores():
+    """이 프로세스가 사용할 수 있는 CPU 코어 번호 목록"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class CpuScheduler:
+    """추론 워커 스레드별 CPU 스레드 예산 관리
+
+    PyTorch는 호출마다 모든 코어를 intra-op 스레드로 쓰려고 하므로, 여러 스트림이 동시에 추론하면
+    (워커 수 x 코어 수)개의 스레드가 경쟁하여 카메라를 추가할수록 처리량이 떨어집니다.
+    추론용 코어(전체 - 예약 코어)를 동시에 일하는 워커 수로 나눈 만큼만 각 워커에 배정하고,
+    워커 스레드가 추론을 시작할 때 자신의 예산이 바뀌었으면 torch.set_num_threads(스레드별 설정)와
+    CPU affinity를 다시 적용합니다. 파이프라인별 전송/추론 FPS도 함께 집계합니다.
+    """
+
+    def __init__(self, workers, threads_per_worker=DEFAULT_THREADS_PER_WORKER, interop_threads=DEFAULT_INTEROP_THREADS,
+                 reserved_cores=DEFAULT_RESERVED_CORES, affinity=DEFAULT_CPU_AFFINITY):
+        self.cores = _available_cores()
+        self.workers = max(1, int(workers))
+        self.fixed_threads = max(0, int(threads_per_worker))
+        self.reserved_cores = min(max(0, int(reserved_cores)), len(self.cores) - 1)
+        self.inference_cores = self.cores[self.reserved_cores:]
+        self.affinity = bool(affinity) and hasattr(os, 'sched_setaffinity')
+        self.interop_threads = max(1, int(interop_threads))
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_slot = 0
+        self._generation = 0
+        self._pipelines = {}  # 파이프라인 키 -> {'frames': deque, 'inferences': deque, 'started_at': float}
+        self.threads_per_worker = self._derive_threads()
+        self._set_interop_threads()
+
+        print(f"[CPU 스케줄러] 코어: {len(self.cores)} (추론용 {len(self.inference_cores)}, 예약 {self.reserved_cores}), "
+              f"워커: {self.workers}, 워커당 스레드: {self.threads_per_worker}, "
+              f"affinity: {'사용' if self.affinity else '사용 안 함'}")
+
+    def _set_interop_threads(self):
+        import torch
+
+        try:
+            torch.set_num_interop_threads(self.interop_threads)
+        except RuntimeError:
+            # inter-op 스레드 수는 병렬 작업이 한 번이라도 실행된 뒤에는 바꿀 수 없음 (모델 로드 전에 스케줄러를 생성해야 함)
+            print(f"[CPU 스케줄러] 경고: 이미 추론이 실행되어 inter-op 스레드 수를 {self.interop_threads}로 바꿀 수 없습니다 "
+                  f"(현재 {torch.get_num_interop_threads()})")
+            self.interop_threads = torch.get_num_interop_threads()
+
+    def worker_cores(self, slot):
+        """slot번 워커에 고정할 코어 구간 (워커끼리 겹치지 않게 추론용 코어를 나눔)"""
+        per_worker = max(1, len(self.inference_cores) // self.workers)
+        start = (slot * per_worker) % len(self.inference_cores)
+        return self.inference_cores[start:start + per_worker]
+
+    def _derive_threads(self):
+        """워커당 스레드 수 계산 (활성 파이프라인 수를 읽으므로 self._lock을 잡은 상태에서 호출)"""
+        if self.fixed_threads:
+            return self.fixed_threads
+        if self.affinity:
+            return len(self.worker_cores(0))  # 고정된 코어 구간보다 많은 스레드는 서로 경쟁만 함
+        # 동시에 추론하는 워커는 최대 min(워커 수, 활성 파이프라인 수)개
+        busy_workers = min(self.workers, max(1, len(self._pipelines)))
+        return max(1, len(self.inference_cores) // busy_workers)
+
+    def _rebalance(self):
+        """활성 파이프라인 수가 바뀌었을 때 호출 (self._lock을 잡은 상태에서 호출)"""
+        threads = self._derive_threads()
+        if threads != self.threads_per_worker:
+            self.threads_per_worker = threads
+            self._generation += 1  # 각 워커는 다음 추론 시작 시 새 예산을 적용
+            print(f"[CPU 스케줄러] 활성 파이프라인 {len(self._pipelines)}개, 워커당 스레드: {threads}")
+
+    def apply(self):
+        """워커 스레드에서 추론 직전에 호출: 이 스레드의 스레드 수/affinity를 현재 예산에 맞춤"""
+        local = self._local
+        if getattr(local, 'generation', None) == self._generation:
+            return
+        import torch
+
+        if not hasattr(local, 'slot'):
+            with self._lock:
+                local.slot = self._next_slot % self.workers
+                self._next_slot += 1
+            if self.affinity:
+                # pid 0 = 호출한 스레드만 고정 (이후 이 스레드가 만드는 OpenMP 스레드도 같은 구간을 상속)
+                os.sched_setaffinity(0, self.worker_cores(local.slot))
+        torch.set_num_threads(self.threads_per_worker)
+        local.generation = self._generation
+
+    def wrap(self, fn):
+        """fn을 실행하기 전에 워커 스레드 예산을 적용하는 함수 반환"""
+        def run_with_budget(*args, **kwargs):
+            self.apply()
+            return fn(*args, **kwargs)
+        return run_with_budget
+
+    def register_pipeline(self, key):
+        with self._lock:
+            self._pipelines[key] = {'frames': deque(), 'inferences': deque(), 'started_at': time.time()}
+            self._rebalance()
+
+    def unregister_pipeline(self, key):
+        with self._lock:
+            self._pipelines.pop(key, None)
+            self._rebalance()
+
+    def _record(self, key, field, now):
+        pipeline = self._pipelines.get(key)
+        if pipeline is None:
+            return
+        times = pipeline[field]
+        times.append(now)
+        while times and now - times[0] > FPS_WINDOW_SECONDS:
+            times.popleft()
+
+    def record_frame(self, key, now):
+        """파이프라인이 프레임 하나를 클라이언트로 보냈음을 기록"""
+        self._record(key, 'frames', now)
+
+    def record_inference(self, key, now):
+        """파이프라인이 실제 추론을 한 번 마쳤음을 기록"""
+        self._record(key, 'inferences', now)
+
+    @staticmethod
+    def _fps(times, now):
+        recent = [t for t in times if now - t <= FPS_WINDOW_SECONDS]
+        if len(recent) < 2:
+            return float(len(recent))
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-6)
+
+    def stats(self):
+        """스레드 예산과 파이프라인별 실측 FPS 반환"""
+        now = time.time()
+        with self._lock:
+            pipelines = {key: {
+                'fps': self._fps(pipeline['frames'], now),
+                'inference_fps': self._fps(pipeline['inferences'], now),
+                'uptime_seconds': now - pipeline['started_at'],
+            } for key, pipeline in self._pipelines.items()}
+        return {
+            'cores': len(self.cores),
+            'reserved_cores': self.reserved_cores,
+            'inference_cores': len(self.inference_cores),
+            'workers': self.workers,
+            'threads_per_worker': self.threads_per_worker,
+            'interop_threads': self.interop_threads,
+            'affinity': self.affinity,
+            'worker_cores': {slot: self.worker_cores(slot) for slot in range(self.workers)} if self.affinity else None,
+            'active_pipelines': len(pipelines),
+            'total_fps': sum(p['fps'] for p in pipelines.values()),
+            'total_inference_fps': sum(p['inference_fps'] for p in pipelines.values()),
+            'pipelines': pipelines,
+        }
+
+
+_cpu_scheduler = None
+
+
+def get_cpu_scheduler():
+    """프로세스 전역 CPU 스케줄러 반환 (최초 호출 시 settings.json 값으로 생성)"""
+    global _cpu_scheduler
+    if _cpu_scheduler is None:
+        from .inference_service import DEFAULT_INFERENCE_WORKERS
+
+        _cpu_scheduler = CpuScheduler(
+            workers=get_setting('inference_workers', DEFAULT_INFERENCE_WORKERS),
+            threads_per_worker=get_setting('cpu_threads_per_worker', DEFAULT_THREADS_PER_WORKER),
+            interop_threads=get_setting('cpu_interop_threads', DEFAULT_INTEROP_THREADS),
+            reserved_cores=get_setting('cpu_reserved_cores', DEFAULT_RESERVED_CORES),
+            affinity=get_setting('cpu_affinity', DEFAULT_CPU_AFFINITY),
+        )
+    return _cpu_scheduler
@@ -1,5 +1,6 @@
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from ultralytics.nn.modules.block import C3, C2f, Bottleneck
 from ultralytics.nn.modules.conv import Conv
 
@@ -39,6 +40,34 @@ class C3k2(C2f):
         )
 
 
+# ── Attention 연산 구현 ──────────────────────────────────
+# q, k: (B, h, key_dim, N), v: (B, h, head_dim, N) -> (B, h, head_dim, N)
+ATTENTION_IMPLS = ('eager', 'sdpa', 'chunked')
+ATTENTION_CHUNK_SIZE = 1024  # chunked: 한 번에 계산할 query 위치 수
+
+def _eager_attention(q, k, v, scale, chunk_size=None):
+    # 기존 구현: (B, h, N, N) attention 행렬 전체를 만듦
+    attn = (q.transpose(-2, -1) @ k) * scale
+    attn = attn.softmax(dim=-1)
+    return v @ attn.transpose(-2, -1)
+
+def _sdpa_attention(q, k, v, scale, chunk_size=None):
+    # PyTorch fused 커널(flash/memory-efficient): N x N 행렬을 메모리에 만들지 않음
+    out = F.scaled_dot_product_attention(q.transpose(-2, -1), k.transpose(-2, -1), v.transpose(-2, -1), scale=scale)
+    return out.transpose(-2, -1)
+
+def _chunked_attention(q, k, v, scale, chunk_size=ATTENTION_CHUNK_SIZE):
+    # query를 chunk_size개씩 나눠 계산: 중간 행렬이 (B, h, chunk, N)으로 제한됨
+    q, v = q.transpose(-2, -1), v.transpose(-2, -1)  # (B, h, N, key_dim), (B, h, N, head_dim)
+    chunks = []
+    for start in range(0, q.shape[2], chunk_size):
+        attn = (q[:, :, start:start + chunk_size] @ k) * scale
+        chunks.append(attn.softmax(dim=-1) @ v)
+    return torch.cat(chunks, dim=2).transpose(-2, -1)
+
+_ATTENTION_KERNELS = {'eager': _eager_attention, 'sdpa': _sdpa_attention, 'chunked': _chunked_attention}
+
+
 # ── Attention / PSABlock / C2PSA ────────────────────────
 class Attention(nn.Module):
     """
@@ -64,11 +93,9 @@ class Attention(nn.Module):
         qkv = self.qkv(x)                       # (B, h, H, W)
         qkv = qkv.reshape(B, self.num_heads, self.key_dim*2 + self.head_dim, N) # 추가된 부분
         q, k, v = qkv.split([self.key_dim, self.key_dim, self.head_dim], dim=2)
-        # (B, h, N, N)
-        attn = (q.transpose(-2, -1) @ k) * self.scale
-        attn = attn.softmax(dim=-1)
-        # (B, h, head_dim, N) @ (B, h, N, N) -> (B, h, head_dim, N)
-        x_out = v @ attn.transpose(-2, -1) # 바뀐 부분
+        # (B, h, head_dim, N): 구현은 configure_attention()으로 선택 (체크포인트에는 impl 속성이 없으므로 기본 eager)
+        impl = getattr(self, 'impl', 'eager')
+        x_out = _ATTENTION_KERNELS[impl](q, k, v, self.scale, getattr(self, 'chunk_size', ATTENTION_CHUNK_SIZE))
         x_out = x_out.reshape(B, C, H, W) + self.pe(v.reshape(B, C, H, W))
         return self.proj(x_out)
     
@@ -102,6 +129,30 @@ class C2PSA(nn.Module):
     
 
 
+# 로드 시 호출: 모델 안의 Attention 연산 구현 선택
+def configure_attention(model, impl='eager', chunk_size=ATTENTION_CHUNK_SIZE):
+    """model(nn.Module) 안의 모든 Attention에 연산 구현 지정, 바꾼 모듈 수 반환
+
+    가중치/파라미터 구조는 그대로이므로 같은 체크포인트를 그대로 사용.
+    울트라리틱스 기본 Attention도 파라미터 구성(qkv, proj, pe)과 연산이 같으므로 이 클래스로 바꿔 적용.
+    """
+    from ultralytics.nn.modules.block import Attention as UltralyticsAttention
+
+    if impl not in ATTENTION_IMPLS:
+        raise ValueError(f"지원하지 않는 attention 구현: {impl} (가능: {', '.join(ATTENTION_IMPLS)})")
+    if impl == 'sdpa' and not hasattr(F, 'scaled_dot_product_attention'):
+        impl = 'chunked'  # PyTorch 2.0 미만
+    count = 0
+    for module in model.modules():
+        if isinstance(module, UltralyticsAttention) and not isinstance(module, Attention):
+            module.__class__ = Attention
+        if isinstance(module, Attention):
+            module.impl = impl
+            module.chunk_size = int(chunk_size)
+            count += 1
+    return count
+
+
 # (선택) 나중에 호출: 울트라리틱스 네임스페이스 등록
 def register_into_ultralytics():
     import ultralytics.nn.modules as M
@@ -0,0 +1,269 @@
+# /backend/app/services/detection_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from eventlet import tpool
+
+from .detections import Detections
+from .settings_service import get_setting
+
+CACHE_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'detection_cache')
+INDEX_FILE = 'index.json'
+
+# --- 탐지 결과 캐시 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_CACHE_MAX_MB = 256          # 캐시 디렉터리 최대 크기(MB), 넘으면 오래 사용하지 않은 항목부터 삭제
+FLUSH_EVERY_FRAMES = 300            # 새로 분석한 프레임이 이만큼 쌓이면 디스크에 저장
+FINGERPRINT_CHUNK_BYTES = 1 << 20   # 파일 식별 해시에 사용할 앞/뒤 구간 크기
+TRACK_ID_COLUMN = 4                 # (N, 7) 탐지 배열의 추적 ID 열
+
+_fingerprints = {}  # (경로, 크기, mtime) -> 해시 (같은 파일을 매번 다시 읽지 않도록)
+
+
+def file_fingerprint(path):
+    """파일 내용 식별 해시 (크기 + 앞/뒤 1MB의 SHA-1, 수백 MB 영상도 즉시 계산)"""
+    if not path or not os.path.exists(path):
+        return 'none'
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    fingerprint = _fingerprints.get(key)
+    if fingerprint is None:
+        digest = hashlib.sha1(str(stat.st_size).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read(FINGERPRINT_CHUNK_BYTES))
+            if stat.st_size > FINGERPRINT_CHUNK_BYTES:
+                f.seek(max(FINGERPRINT_CHUNK_BYTES, stat.st_size - FINGERPRINT_CHUNK_BYTES))
+                digest.update(f.read(FINGERPRINT_CHUNK_BYTES))
+        fingerprint = _fingerprints[key] = digest.hexdigest()[:16]
+    return fingerprint
+
+
+class DetectionCacheSegment:
+    """한 (RGB 영상, TIR 영상, 모델) 조합의 프레임 번호별 탐지 결과
+
+    같은 조합을 보는 모든 클라이언트가 하나의 세그먼트를 공유하며, 디스크에는
+    프레임 번호 열과 (행 수, 7) 탐지 배열을 담은 .npz 파일 하나로 저장합니다.
+    """
+
+    def __init__(self, key, path, description):
+        self.key = key
+        self.path = path
+        self.description = description
+        self.names = {}
+        self.users = 0
+        self.hits = 0
+        self.misses = 0
+        self.dirty_frames = 0
+        self._frames = {}  # 프레임 번호 -> (N, 6|7) float32
+        self._write_lock = threading.Lock()  # 같은 세그먼트를 공유하는 스트림들의 저장이 겹치지 않도록
+        self._snapshot_seq = 0               # 복사한 저장 내용의 순번 (늦게 끝난 이전 저장이 최신 파일을 덮지 않도록)
+        self._written_seq = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                indexed, tracked = data['indexed'], data['tracked']
+                row_frames, rows = data['row_frame'], data['data']
+                self.names = {int(k): v for k, v in json.loads(str(data['names'])).items()}
+        except Exception as e:
+            print(f"[탐지 캐시] 손상된 캐시 파일 무시: {os.path.basename(self.path)} ({e})")
+            return
+        order = np.argsort(row_frames, kind='stable')
+        row_frames, rows = row_frames[order], rows[order]
+        starts = np.searchsorted(row_frames, indexed, side='left')
+        ends = np.searchsorted(row_frames, indexed, side='right')
+        for frame_index, is_tracked, start, end in zip(indexed.tolist(), tracked.tolist(), starts, ends):
+            frame_rows = rows[start:end]
+            self._frames[frame_index] = frame_rows if is_tracked else np.delete(frame_rows, TRACK_ID_COLUMN, axis=1)
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, frame_index):
+        """캐시된 탐지 결과 (없으면 None)"""
+        data = self._frames.get(frame_index)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Detections(data, self.names)
+
+    def put(self, frame_index, detections):
+        """실제 추론 결과 저장 (원본 프레임 좌표)"""
+        self._frames[frame_index] = np.array(detections.data, dtype=np.float32)
+        if detections.names:
+            self.names = detections.names
+        self.dirty_frames += 1
+
+    def flush(self):
+        """변경된 내용이 있으면 .npz로 저장하고 파일 크기 반환
+
+        저장할 프레임 목록은 호출한 greenlet에서 복사하고(배열은 put()에서 교체만 하므로 얕은 복사로 충분),
+        배열 합치기와 파일 쓰기는 tpool 스레드에서 실행하여 허브를 막지 않습니다.
+        """
+        if self.dirty_frames:
+            frames, names, dirty = dict(self._frames), dict(self.names), self.dirty_frames
+            self.dirty_frames = 0
+            self._snapshot_seq += 1
+            try:
+                tpool.execute(self._write, self._snapshot_seq, frames, names)
+            except Exception:
+                self.dirty_frames += dirty  # 다음 저장 때 다시 시도
+                raise
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def _write(self, seq, frames, names):
+        """frames를 .npz로 저장 (tpool 스레드에서 실행)"""
+        indexed = np.array(sorted(frames), dtype=np.int32)
+        arrays = [frames[i] for i in indexed.tolist()]
+        tracked = np.array([a.shape[1] == 7 for a in arrays], dtype=bool)
+        # 추적 ID가 없는 프레임은 -1을 채워 모든 행을 7열로 맞춤
+        padded = [a if a.shape[1] == 7 else np.insert(a, TRACK_ID_COLUMN, -1, axis=1) for a in arrays]
+        rows = np.concatenate(padded) if padded else np.empty((0, 7), dtype=np.float32)
+        row_frames = np.repeat(indexed, [len(a) for a in arrays])
+        with self._write_lock:
+            if seq < self._written_seq:
+                return  # 더 최신 내용이 이미 저장됨
+            self._written_seq = seq
+            temp_path = self.path + '.tmp.npz'
+            np.savez(temp_path, indexed=indexed, tracked=tracked, row_frame=row_frames.astype(np.int32),
+                     data=rows.astype(np.float32), names=json.dumps(names, ensure_ascii=False))
+            os.replace(temp_path, self.path)  # 저장 중 종료되어도 이전 파일은 유지
+
+    def stats(self):
+        return {
+            'key': self.key,
+            'description': self.description,
+            'frames': len(self._frames),
+            'users': self.users,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+        }
+
+
+class DetectionCache:
+    """시험 영상의 프레임별 탐지 결과 캐시
+
+    (RGB 영상 해시, TIR 영상 해시, 모델 파일 해시, 실행 방식)을 키로 세그먼트를 만들고 프레임 번호로 조회합니다.
+    반복 재생, 시간 이동, 같은 영상을 보는 다른 클라이언트는 모델을 다시 실행하지 않고 캐시 결과를 사용하며,
+    디스크 사용량이 max_mb를 넘으면 사용 중이 아닌 세그먼트를 오래 사용하지 않은 순서로 삭제합니다.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER, max_mb=DEFAULT_CACHE_MAX_MB):
+        self.folder = os.path.abspath(folder)
+        self.max_bytes = int(float(max_mb) * 1024 * 1024)
+        os.makedirs(self.folder, exist_ok=True)
+        self._index_path = os.path.join(self.folder, INDEX_FILE)
+        self._index = self._read_index()  # 키 -> {'bytes', 'last_used', 'description'}
+        self._segments = {}               # 키 -> 메모리에 올라온 DetectionCacheSegment
+        self._index_lock = threading.Lock()
+        self.eviction_count = 0
+
+    def _read_index(self):
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        """인덱스 저장 (직렬화는 호출한 greenlet에서, 파일 쓰기는 tpool 스레드에서)"""
+        tpool.execute(self._write_text, json.dumps(self._index, ensure_ascii=False, indent=2))
+
+    def _write_text(self, text):
+        with self._index_lock:
+            with open(self._index_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+    def open(self, rgb_path, tir_path, model_path, variant):
+        """영상 쌍과 모델에 해당하는 세그먼트를 열어 반환 (사용이 끝나면 close() 호출)
+
+        variant에는 같은 모델 파일이라도 결과가 달라지는 실행 방식(백엔드, 전처리 방식 등)을 넣습니다.
+        """
+        key = '_'.join((file_fingerprint(rgb_path), file_fingerprint(tir_path), file_fingerprint(model_path), variant))
+        segment = self._segments.get(key)
+        if segment is None:
+            description = {
+                'rgb': os.path.basename(rgb_path),
+                'tir': os.path.basename(tir_path) if tir_path else None,
+                'model': os.path.basename(model_path),
+                'variant': variant,
+            }
+            segment = self._segments[key] = DetectionCacheSegment(key, os.path.join(self.folder, f"{key}.npz"),
+                                                                  description)
+            if len(segment):
+                print(f"[탐지 캐시] {description['rgb']} ({description['model']}) 캐시 {len(segment)}프레임 로드")
+        segment.users += 1
+        self._touch(segment)
+        return segment
+
+    def _touch(self, segment, size=None):
+        entry = self._index.setdefault(segment.key, {'bytes': 0, 'description': segment.description})
+        entry['last_used'] = time.time()
+        if size is not None:
+            entry['bytes'] = size
+
+    def maybe_flush(self, segment):
+        """새 프레임이 FLUSH_EVERY_FRAMES개 이상 쌓였으면 저장 (스트림 루프에서 매 프레임 호출)"""
+        if segment.dirty_frames >= FLUSH_EVERY_FRAMES:
+            self._flush(segment)
+
+    def _flush(self, segment):
+        try:
+            self._touch(segment, segment.flush())
+            self._evict()
+            self._write_index()
+        except OSError as e:
+            print(f"[탐지 캐시] 저장 실패 ({segment.key}): {e}")
+
+    def close(self, segment):
+        """세그먼트 사용 종료: 디스크에 저장하고, 사용하는 스트림이 없으면 메모리에서 내림"""
+        segment.users = max(0, segment.users - 1)
+        self._flush(segment)
+        if segment.users == 0:
+            self._segments.pop(segment.key, None)
+
+    def _evict(self):
+        total = sum(entry['bytes'] for entry in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1].get('last_used', 0)):
+            if total <= self.max_bytes:
+                break
+            if key in self._segments:
+                continue  # 재생 중인 세그먼트는 삭제하지 않음
+            try:
+                os.remove(os.path.join(self.folder, f"{key}.npz"))
+            except FileNotFoundError:
+                pass
+            total -= entry['bytes']
+            del self._index[key]
+            self.eviction_count += 1
+            print(f"[탐지 캐시] {entry['description'].get('rgb')} ({entry['description'].get('model')}) 캐시 삭제 (용량 한도)")
+
+    def stats(self):
+        return {
+            'folder': self.folder,
+            'max_mb': self.max_bytes / 1024 / 1024,
+            'disk_mb': sum(entry['bytes'] for entry in self._index.values()) / 1024 / 1024,
+            'stored_segments': len(self._index),
+            'evictions': self.eviction_count,
+            'open_segments': [segment.stats() for segment in self._segments.values()],
+        }
+
+
+_detection_cache = None
+
+
+def get_detection_cache():
+    """프로세스 전역 탐지 결과 캐시 반환 (최초 호출 시 settings.json 값으로 생성)"""
+    global _detection_cache
+    if _detection_cache is None:
+        _detection_cache = DetectionCache(max_mb=get_setting('detection_cache_max_mb', DEFAULT_CACHE_MAX_MB))
+    return _detection_cache
@@ -0,0 +1,167 @@
+# /backend/app/services/detections.py
+
+import cv2
+import numpy as np
+
+# 객체 타입별 BBox 색상 (BGR)
+CLASS_COLORS = {
+    'person': (0, 0, 255),      # 빨강
+    'scrofa': (255, 0, 0),      # 파랑
+    'inermis': (0, 255, 0),     # 초록
+}
+DEFAULT_COLOR = (255, 255, 0)   # 청록
+ANIMAL_CLASSES = ('scrofa', 'inermis')
+
+
+class Detections:
+    """한 프레임의 탐지 결과를 NumPy 배열 하나로 보관하는 구조
+
+    results[0].boxes.data를 프레임당 한 번만 CPU로 가져와 (N, 6) 또는 추적 ID가 포함된 (N, 7) 배열로 보관합니다.
+    (열 순서: x1, y1, x2, y2, [track_id], confidence, class)
+    임계값 필터링은 벡터화된 마스크로 처리하고, 그리기/이벤트 판단/전송 데이터 모두 이 구조 하나를 사용합니다.
+    """
+
+    __slots__ = ('data', 'names', '_labels')
+
+    def __init__(self, data, names):
+        self.data = data
+        self.names = names or {}
+        self._labels = None
+
+    @classmethod
+    def from_results(cls, results):
+        """YOLO 결과 리스트에서 생성 (결과가 없으면 빈 탐지)"""
+        if not results:
+            return cls.empty()
+        result = results[0]
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return cls(np.empty((0, 6), dtype=np.float32), result.names)
+        # 박스별 인덱싱(box.conf[0] 등) 대신 전체 텐서를 한 번에 호스트로 복사
+        return cls(boxes.data.cpu().numpy(), result.names)
+
+    @classmethod
+    def empty(cls, names=None):
+        return cls(np.empty((0, 6), dtype=np.float32), names)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def xyxy(self):
+        return self.data[:, :4]
+
+    @property
+    def conf(self):
+        return self.data[:, -2]
+
+    @property
+    def cls(self):
+        return self.data[:, -1].astype(np.int64)
+
+    @property
+    def track_id(self):
+        """추적 ID 배열 (추적 결과가 아니면 None)"""
+        return self.data[:, 4].astype(np.int64) if self.data.shape[1] == 7 else None
+
+    def select(self, mask):
+        """마스크에 해당하는 탐지만 담은 새 Detections 반환"""
+        return Detections(self.data[mask], self.names)
+
+    def above(self, threshold):
+        """confidence가 threshold 이상인 탐지"""
+        return self.select(self.conf >= threshold)
+
+    def class_mask(self, class_names):
+        """지정한 클래스 이름에 해당하는 탐지 마스크"""
+        class_ids = [class_id for class_id, name in self.names.items() if name in class_names]
+        return np.isin(self.cls, class_ids)
+
+    def event_candidates(self, person_threshold, animal_threshold):
+        """이벤트 조건(사람/동물별 임계값)을 만족하는 탐지를 원래 순서대로 (confidence, 클래스 이름, 사람 여부) 리스트로 반환"""
+        if not len(self):
+            return []
+        person_mask = self.class_mask(('person',)) & (self.conf >= person_threshold)
+        animal_mask = self.class_mask(ANIMAL_CLASSES) & (self.conf >= animal_threshold)
+        indices = np.flatnonzero(person_mask | animal_mask)
+        confidences = self.conf[indices].tolist()
+        class_ids = self.cls[indices].tolist()
+        is_person = person_mask[indices].tolist()
+        return [(confidence, self.names[class_id], person)
+                for confidence, class_id, person in zip(confidences, class_ids, is_person)]
+
+    def to_array(self):
+        """전송용 압축 배열: 탐지마다 [클래스 ID, confidence, x1, y1, x2, y2, 추적 ID(없으면 -1)]"""
+        if not len(self):
+            return []
+        track_ids = self.track_id
+        if track_ids is None:
+            track_ids = np.full(len(self), -1, dtype=np.int64)
+        boxes = np.rint(self.xyxy).astype(np.int64)
+        confidences = np.round(self.conf.astype(np.float64), 3)
+        return [[class_id, confidence, x1, y1, x2, y2, track_id]
+                for class_id, confidence, (x1, y1, x2, y2), track_id
+                in zip(self.cls.tolist(), confidences.tolist(), boxes.tolist(), track_ids.tolist())]
+
+    def class_names(self):
+        """클래스 ID 순서의 클래스 이름 목록 (전송 배열의 클래스 ID 해석용)"""
+        if not self.names:
+            return []
+        return [self.names.get(class_id, str(class_id)) for class_id in range(max(self.names) + 1)]
+
+    def labels(self):
+        """그리기용 (좌표, 색상, 라벨, 라벨 크기) 목록 (RGB/TIR 두 프레임에서 재사용하도록 한 번만 계산)"""
+        if self._labels is None:
+            labels = []
+            for x1, y1, x2, y2, confidence, class_id in zip(*self.xyxy.astype(np.int64).T.tolist(),
+                                                             self.conf.tolist(), self.cls.tolist()):
+                class_name = self.names.get(class_id, str(class_id))
+                label = f'{class_name} {confidence:.2f}'
+                label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
+                labels.append(((x1, y1, x2, y2), CLASS_COLORS.get(class_name, DEFAULT_COLOR), label, label_size))
+            self._labels = labels
+        return self._labels
+
+
+def box_iou(a, b):
+    """(N, 4) x (M, 4) xyxy 박스 IoU 행렬"""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def match_boxes(boxes, targets, iou_threshold):
+    """(N, 6) 탐지 배열 boxes를 confidence 높은 순으로 같은 클래스의 targets 박스와 탐욕적으로 짝지어 [(i, j)] 반환
+
+    각 target은 한 번만 짝지어지며 IoU가 iou_threshold 이상이어야 합니다 (열 순서: x1, y1, x2, y2, confidence, class).
+    """
+    if not len(boxes) or not len(targets):
+        return []
+    iou = box_iou(boxes[:, :4], targets[:, :4])
+    iou[boxes[:, -1][:, None] != targets[:, -1][None, :]] = 0
+    pairs = []
+    for i in np.argsort(-boxes[:, -2]):
+        j = int(np.argmax(iou[i]))
+        if iou[i, j] >= iou_threshold:
+            pairs.append((int(i), j))
+            iou[:, j] = 0
+    return pairs
+
+
+def draw_detections(frame, detections):
+    """탐지 결과를 프레임 복사본에 그려 반환 (임계값 필터링은 호출 전에 Detections.above()로 처리)"""
+    if not len(detections):
+        return frame
+
+    annotated_frame = frame.copy()
+    for (x1, y1, x2, y2), color, label, label_size in detections.labels():
+        # BBox 그리기
+        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
+        # 라벨 배경 그리기
+        cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), (x1 + label_size[0], y1), color, -1)
+        # 라벨 텍스트 그리기
+        cv2.putText(annotated_frame, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    return annotated_frame
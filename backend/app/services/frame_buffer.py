@@ -0,0 +1,192 @@
+# /backend/app/services/frame_buffer.py
+
+import itertools
+import threading
+
+import cv2
+import numpy as np
+
+
+class FrameRangeView:
+    """링 버퍼의 시간 구간을 복사 없이 참조하는 뷰
+
+    각 프레임은 링 버퍼 배열의 뷰(ndarray)이므로 리스트처럼 len(), 인덱싱, 반복이 가능하며
+    ClipRecorder의 이전 구간 프레임(pre_frames)으로 그대로 전달할 수 있습니다. 참조하는 구간이 덮어써지지 않도록
+    사용이 끝날 때까지 FrameRingBuffer.pin()으로 고정해야 합니다.
+    """
+
+    def __init__(self, ring, slots, timestamps):
+        self._ring = ring
+        self._slots = slots
+        self.timestamps = timestamps
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __bool__(self):
+        return len(self._slots) > 0
+
+    def __getitem__(self, index):
+        return self._ring.frame_at_slot(self._slots[index])
+
+    def __iter__(self):
+        for slot in self._slots:
+            yield self._ring.frame_at_slot(slot)
+
+
+class FrameRingBuffer:
+    """미리 할당된 uint8 배열 하나와 타임스탬프 배열로 구성된 고정 용량 링 버퍼
+
+    - write(): 빈 슬롯(가장 오래된 슬롯)에 프레임을 복사하는 O(1) 쓰기
+    - view(): 시간 구간에 해당하는 프레임들을 복사 없이 참조
+    - pin()/unpin(): 이벤트 녹화가 참조하는 구간을 덮어쓰지 못하도록 고정
+
+    고정된 구간을 덮어써야 하는 쓰기는 건너뛰고 overrun_count로 집계하므로,
+    용량은 (이벤트 전 + 이벤트 후 녹화 시간 + 여유) × max_fps 이상으로 잡아야 합니다.
+    """
+
+    mode = 'raw'
+
+    def __init__(self, capacity, frame_shape, dtype=np.uint8, max_fps=None):
+        self.capacity = max(1, int(capacity))
+        self.frame_shape = tuple(frame_shape)
+        self._allocate(dtype)
+        self.timestamps = np.zeros(self.capacity, dtype=np.float64)
+        self.seqs = np.full(self.capacity, -1, dtype=np.int64)
+        # max_fps가 주어지면 그보다 촘촘한 프레임은 저장하지 않아 용량이 항상 필요한 시간을 덮도록 함
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+
+        self._lock = threading.Lock()  # 녹화 저장 스레드에서 unpin()을 호출하므로 고정 정보 보호
+        self._pins = {}
+        self._pin_ids = itertools.count(1)
+
+        self.write_count = 0        # 지금까지 저장된 프레임 수 (= 다음 프레임의 seq)
+        self.skipped_count = 0      # max_fps 제한으로 건너뛴 프레임 수
+        self.overrun_count = 0      # 고정 구간 보호로 저장하지 못한 프레임 수
+        self.last_timestamp = None
+
+    def _allocate(self, dtype):
+        self.frames = np.empty((self.capacity,) + self.frame_shape, dtype=dtype)
+
+    def _store(self, slot, frame):
+        np.copyto(self.frames[slot], frame)
+
+    def _storage_nbytes(self):
+        return self.frames.nbytes
+
+    def wants(self, timestamp):
+        """이 시각의 프레임이 max_fps 제한을 통과하여 저장될 차례인지 여부"""
+        return self.last_timestamp is None or timestamp - self.last_timestamp >= self.min_interval
+
+    def write(self, timestamp, frame):
+        """프레임을 링에 복사하여 저장, 저장 여부 반환"""
+        if not self.wants(timestamp):
+            self.skipped_count += 1
+            return False
+
+        slot = self.write_count % self.capacity
+        with self._lock:
+            old_seq = self.seqs[slot]
+            if old_seq >= 0 and self._pins and old_seq >= min(self._pins.values()):
+                self.overrun_count += 1
+                return False
+
+        self._store(slot, frame)
+        self.timestamps[slot] = timestamp
+        self.seqs[slot] = self.write_count
+        self.write_count += 1
+        self.last_timestamp = timestamp
+        return True
+
+    def __len__(self):
+        return min(self.write_count, self.capacity)
+
+    def frame_at_slot(self, slot):
+        return self.frames[slot]
+
+    def _ordered_slots(self):
+        """가장 오래된 프레임부터 순서대로 슬롯 번호 배열 반환"""
+        count = len(self)
+        start = self.write_count - count
+        return np.arange(start, self.write_count) % self.capacity
+
+    def oldest_timestamp(self):
+        if not len(self):
+            return None
+        return float(self.timestamps[(self.write_count - len(self)) % self.capacity])
+
+    def duration(self):
+        """버퍼가 덮고 있는 시간 범위(초)"""
+        if not len(self):
+            return 0.0
+        return self.last_timestamp - self.oldest_timestamp()
+
+    def view(self, start_time, end_time):
+        """start_time <= timestamp <= end_time 구간의 프레임 뷰 반환 (복사 없음)"""
+        slots = self._ordered_slots()
+        timestamps = self.timestamps[slots]
+        mask = (timestamps >= start_time) & (timestamps <= end_time)
+        return FrameRangeView(self, slots[mask], timestamps[mask])
+
+    def pin(self, start_time):
+        """start_time 이후의 프레임(현재 및 앞으로 저장될 프레임)을 덮어쓰지 못하게 고정, 고정 ID 반환"""
+        slots = self._ordered_slots()
+        candidates = slots[self.timestamps[slots] >= start_time]
+        first_seq = int(self.seqs[candidates[0]]) if len(candidates) else self.write_count
+        with self._lock:
+            pin_id = next(self._pin_ids)
+            self._pins[pin_id] = first_seq
+        return pin_id
+
+    def unpin(self, pin_id):
+        """pin()으로 고정한 구간 해제 (다른 스레드에서 호출 가능)"""
+        with self._lock:
+            self._pins.pop(pin_id, None)
+
+    def nbytes(self):
+        """버퍼가 차지하는 메모리(bytes)"""
+        return self._storage_nbytes() + self.timestamps.nbytes + self.seqs.nbytes
+
+    def stats(self):
+        """버퍼 상태 및 메모리 사용량 반환"""
+        with self._lock:
+            pinned = len(self._pins)
+        return {
+            'mode': self.mode,
+            'capacity': self.capacity,
+            'frames': len(self),
+            'frame_shape': list(self.frame_shape),
+            'duration_seconds': self.duration(),
+            'memory_mb': self.nbytes() / 1024 / 1024,
+            'pinned_ranges': pinned,
+            'skipped': self.skipped_count,
+            'overruns': self.overrun_count,
+        }
+
+
+class JpegRingBuffer(FrameRingBuffer):
+    """원본 프레임 대신 이미 인코딩된 JPEG 바이트를 보관하는 링 버퍼
+
+    대시보드 전송을 위해 cv2.imencode()로 만든 JPEG 버퍼를 그대로 저장하므로 추가 인코딩이 없고,
+    원본 대비 메모리를 약 10~20배 줄입니다. 프레임은 view()로 꺼낼 때(녹화 저장 시) 디코딩됩니다.
+    write()에는 cv2.imencode() 결과(1차원 uint8 배열) 또는 bytes를 전달합니다.
+    """
+
+    mode = 'jpeg'
+
+    def _allocate(self, dtype):
+        self.frames = [None] * self.capacity
+        self._encoded_sizes = np.zeros(self.capacity, dtype=np.int64)
+
+    def _store(self, slot, encoded):
+        self.frames[slot] = encoded
+        self._encoded_sizes[slot] = len(encoded)
+
+    def _storage_nbytes(self):
+        return int(self._encoded_sizes.sum())
+
+    def frame_at_slot(self, slot):
+        encoded = self.frames[slot]
+        if not isinstance(encoded, np.ndarray):
+            encoded = np.frombuffer(encoded, dtype=np.uint8)
+        return cv2.imdecode(encoded, cv2.IMREAD_COLOR)
@@ -0,0 +1,311 @@
+# /backend/app/services/frame_store.py
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .detection_cache import file_fingerprint
+from .seek_index import SeekIndex
+from .settings_service import get_setting
+
+STORE_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'frame_cache')
+FRAMES_FILE = 'frames.u8'
+META_FILE = 'meta.json'
+STORE_VERSION = 1
+
+# --- 디코딩 프레임 캐시 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_STORE_MAX_MB = 8192         # 캐시 디렉터리 최대 크기(MB), 넘으면 오래 사용하지 않은 영상부터 삭제
+DEFAULT_AUTO_PREDECODE = False      # 캐시에 없는 시험 영상을 재생하면 백그라운드에서 미리 디코딩
+
+_predecoding = set()                # 디코딩 중인 항목 키 (같은 영상을 중복 디코딩하지 않도록)
+_predecode_lock = threading.Lock()
+
+
+def _entry_key(video_path, gray):
+    return f"{file_fingerprint(video_path)}-{'gray' if gray else 'bgr'}"
+
+
+def _entry_dir(video_path, gray):
+    return os.path.join(os.path.abspath(STORE_FOLDER), _entry_key(video_path, gray))
+
+
+def _touch(entry_dir):
+    """마지막 사용 시각 기록 (여러 프로세스가 같은 캐시를 써도 디렉터리 mtime으로 LRU 판단)"""
+    try:
+        os.utime(entry_dir, None)
+    except OSError:
+        pass
+
+
+def _dir_bytes(entry_dir):
+    total = 0
+    for name in os.listdir(entry_dir):
+        path = os.path.join(entry_dir, name)
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def _list_entries():
+    """(디렉터리, 크기, 마지막 사용 시각) 목록 (완성된 항목만)"""
+    folder = os.path.abspath(STORE_FOLDER)
+    if not os.path.isdir(folder):
+        return []
+    entries = []
+    for name in os.listdir(folder):
+        entry_dir = os.path.join(folder, name)
+        if os.path.exists(os.path.join(entry_dir, META_FILE)):
+            entries.append((entry_dir, _dir_bytes(entry_dir), os.path.getmtime(entry_dir)))
+    return entries
+
+
+def _evict_for(required_bytes, max_bytes, keep=()):
+    """required_bytes를 새로 쓸 수 있도록 오래 사용하지 않은 항목부터 삭제, 공간을 확보하면 True"""
+    entries = sorted(_list_entries(), key=lambda entry: entry[2])
+    total = sum(size for _, size, _ in entries)
+    for entry_dir, size, _ in entries:
+        if total + required_bytes <= max_bytes:
+            break
+        if entry_dir in keep:
+            continue
+        try:
+            shutil.rmtree(entry_dir)
+        except OSError as e:
+            # Windows에서는 다른 세션이 메모리 매핑 중인 파일을 지울 수 없음
+            print(f"[프레임 캐시] 사용 중인 항목은 삭제하지 않음: {os.path.basename(entry_dir)} ({e})")
+            continue
+        total -= size
+        print(f"[프레임 캐시] {os.path.basename(entry_dir)} 삭제 (용량 한도, {size / 1024 / 1024:.0f}MB)")
+    return total + required_bytes <= max_bytes
+
+
+class FrameStoreCapture:
+    """미리 디코딩한 프레임 파일을 cv2.VideoCapture처럼 읽는 캡처
+
+    프레임 배열 파일을 읽기 전용 메모리 매핑으로 열어 read()가 복사 없이 매핑된 배열의 뷰를 반환하므로,
+    같은 영상을 재생하는 모든 클라이언트와 프로세스가 OS 페이지 캐시의 같은 메모리를 공유하고 디코딩 CPU를 쓰지 않습니다.
+    반환되는 프레임은 읽기 전용이므로 그리기 등은 복사본에 해야 합니다.
+    """
+
+    def __init__(self, entry_dir):
+        with open(os.path.join(entry_dir, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.entry_dir = entry_dir
+        self.source = meta['source']
+        self.fps = meta['fps']
+        self.timestamps = meta['timestamps']
+        self.frames = np.memmap(os.path.join(entry_dir, FRAMES_FILE), dtype=np.uint8, mode='r',
+                                shape=tuple(meta['shape']))
+        self._position = 0  # 다음 read()가 반환할 프레임 번호
+        _touch(entry_dir)
+
+    def isOpened(self):
+        return self.frames is not None
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def grab(self):
+        if self.frames is None or self._position >= len(self.frames):
+            return False
+        self._position += 1
+        return True
+
+    def retrieve(self):
+        if self.frames is None or self._position == 0:
+            return False, None
+        return True, self.frames[self._position - 1]
+
+    def get(self, prop):
+        if self.frames is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.frames))
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self.timestamps[self._position - 1] * 1000.0 if self._position else 0.0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frames.shape[2])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frames.shape[1])
+        return 0.0
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES or self.frames is None:
+            return False
+        self._position = min(max(int(value), 0), len(self.frames))
+        return True
+
+    def release(self):
+        if self.frames is not None:
+            self.frames = None  # 매핑 해제는 마지막 뷰가 사라질 때 이루어짐
+            _touch(self.entry_dir)
+
+    @property
+    def seek_index(self):
+        """모든 프레임에 바로 접근할 수 있으므로 모든 프레임을 키프레임으로 보는 시간 이동 인덱스"""
+        return SeekIndex(self.timestamps, list(range(len(self.timestamps))), self.fps, 'frame_store')
+
+
+def open_stored_video(video_path, gray=False):
+    """미리 디코딩된 프레임이 있으면 FrameStoreCapture, 없으면 None"""
+    if not video_path or not os.path.exists(video_path):
+        return None
+    entry_dir = _entry_dir(video_path, gray)
+    if not os.path.exists(os.path.join(entry_dir, META_FILE)):
+        return None
+    try:
+        return FrameStoreCapture(entry_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[프레임 캐시] {os.path.basename(video_path)} 캐시를 열 수 없어 영상을 직접 디코딩합니다: {e}")
+        return None
+
+
+def predecode_video(video_path, gray=False, max_mb=None):
+    """영상 전체를 디코딩하여 (프레임 수, H, W[, 3]) uint8 원시 배열 파일과 프레임 시각으로 저장
+
+    gray=True이면 TIR 영상처럼 그레이스케일 한 채널만 저장합니다 (스트림 루프의 TIR 입력 형식과 같음).
+    디스크 예산을 넘으면 오래 사용하지 않은 항목을 지우고, 그래도 부족하면 저장하지 않고 None을 반환합니다.
+    """
+    entry_dir = _entry_dir(video_path, gray)
+    if os.path.exists(os.path.join(entry_dir, META_FILE)):
+        _touch(entry_dir)
+        return entry_dir
+    max_bytes = int(float(max_mb if max_mb is not None else get_setting('frame_cache_max_mb', DEFAULT_STORE_MAX_MB))
+                    * 1024 * 1024)
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"영상을 열 수 없습니다: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    estimated_bytes = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) * width * height * (1 if gray else 3)
+    if not _evict_for(estimated_bytes, max_bytes, keep={entry_dir}):
+        cap.release()
+        print(f"[프레임 캐시] {os.path.basename(video_path)}: 예상 크기 {estimated_bytes / 1024 / 1024:.0f}MB가 "
+              f"디스크 예산({max_bytes / 1024 / 1024:.0f}MB)을 넘어 저장하지 않음")
+        return None
+
+    os.makedirs(os.path.abspath(STORE_FOLDER), exist_ok=True)
+    temp_dir = f"{entry_dir}.tmp-{os.getpid()}-{threading.get_ident()}"
+    os.makedirs(temp_dir, exist_ok=True)
+    started = time.time()
+    timestamps = []
+    frame_shape = None
+    try:
+        with open(os.path.join(temp_dir, FRAMES_FILE), 'wb') as f:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if gray:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                if frame_shape is None:
+                    frame_shape = frame.shape
+                elif frame.shape != frame_shape:
+                    raise ValueError(f"프레임 크기가 바뀌는 영상은 저장할 수 없습니다: {frame.shape} != {frame_shape}")
+                f.write(np.ascontiguousarray(frame).data)
+                timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+        if frame_shape is None:
+            raise ValueError("디코딩된 프레임이 없습니다")
+        if fps > 0 and timestamps[-1] <= 0:
+            timestamps = [i / fps for i in range(len(timestamps))]  # POS_MSEC를 제공하지 않는 백엔드
+        meta = {
+            'version': STORE_VERSION,
+            'source': os.path.basename(video_path),
+            'gray': gray,
+            'fps': fps,
+            'shape': [len(timestamps), *frame_shape],
+            'timestamps': [round(t, 6) for t in timestamps],
+        }
+        # meta.json이 있는 디렉터리만 완성된 항목으로 보므로 마지막에 기록하고 이름을 바꿈
+        with open(os.path.join(temp_dir, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        try:
+            os.replace(temp_dir, entry_dir)
+        except OSError:
+            if not os.path.exists(os.path.join(entry_dir, META_FILE)):
+                raise
+            shutil.rmtree(temp_dir, ignore_errors=True)  # 다른 프로세스가 먼저 같은 영상을 저장함
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    finally:
+        cap.release()
+
+    size = _dir_bytes(entry_dir)
+    print(f"[프레임 캐시] {os.path.basename(video_path)}: {len(timestamps)}프레임 저장 "
+          f"({size / 1024 / 1024:.0f}MB, {time.time() - started:.1f}초)")
+    _evict_for(0, max_bytes, keep={entry_dir})  # 예상보다 커진 경우 다른 항목으로 예산을 맞춤
+    return entry_dir
+
+
+def predecode_pair(rgb_path, tir_path=None):
+    """시험 영상 쌍을 미리 디코딩 (RGB는 컬러, TIR은 그레이스케일)"""
+    entries = {'rgb': predecode_video(rgb_path, gray=False)}
+    if tir_path:
+        entries['tir'] = predecode_video(tir_path, gray=True)
+    return entries
+
+
+def start_predecode(rgb_path, tir_path=None):
+    """영상 쌍 미리 디코딩을 별도 OS 스레드에서 시작 (이미 진행 중이면 False)
+
+    긴 영상은 수십 초가 걸리므로 실시간 추론 워커(tpool)를 점유하지 않도록 전용 스레드를 사용합니다.
+    """
+    key = (os.path.abspath(rgb_path), os.path.abspath(tir_path) if tir_path else None)
+    with _predecode_lock:
+        if key in _predecoding:
+            return False
+        _predecoding.add(key)
+
+    def run():
+        try:
+            predecode_pair(rgb_path, tir_path)
+        except Exception as e:
+            print(f"[프레임 캐시] 미리 디코딩 실패 ({os.path.basename(rgb_path)}): {e}")
+        finally:
+            with _predecode_lock:
+                _predecoding.discard(key)
+
+    threading.Thread(target=run, name=f'predecode-{os.path.basename(rgb_path)}', daemon=True).start()
+    return True
+
+
+def get_frame_store_stats():
+    """캐시 디렉터리 사용량과 저장된 영상 목록"""
+    entries = []
+    for entry_dir, size, last_used in sorted(_list_entries(), key=lambda entry: -entry[2]):
+        try:
+            with open(os.path.join(entry_dir, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        entries.append({
+            'key': os.path.basename(entry_dir),
+            'source': meta.get('source'),
+            'gray': meta.get('gray'),
+            'frames': meta['shape'][0],
+            'shape': meta['shape'][1:],
+            'size_mb': size / 1024 / 1024,
+            'last_used': last_used,
+        })
+    with _predecode_lock:
+        in_progress = [os.path.basename(rgb) for rgb, _ in _predecoding]
+    return {
+        'folder': os.path.abspath(STORE_FOLDER),
+        'max_mb': float(get_setting('frame_cache_max_mb', DEFAULT_STORE_MAX_MB)),
+        'disk_mb': sum(entry['size_mb'] for entry in entries),
+        'entries': entries,
+        'predecoding': in_progress,
+    }
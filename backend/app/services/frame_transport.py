@@ -0,0 +1,275 @@
+# /backend/app/services/frame_transport.py
+
+import base64
+import functools
+import time
+from collections import OrderedDict
+
+from ..extensions import socketio
+from .settings_service import get_setting
+
+# --- 프레임 전송 방식 ---
+# 'binary': JPEG 바이트를 Socket.IO 바이너리 첨부로 전송 (video_frame_bin 이벤트: 헤더, RGB, TIR)
+# 'base64': 기존 방식, base64 문자열을 JSON에 담아 전송 (video_frame 이벤트, 구버전 클라이언트 호환용)
+TRANSPORT_BINARY = 'binary'
+TRANSPORT_BASE64 = 'base64'
+BINARY_FRAME_EVENT = 'video_frame_bin'
+BASE64_FRAME_EVENT = 'video_frame'
+DEGRADED_EVENT = 'stream_degraded'
+
+# --- 클라이언트별 흐름 제어 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_MAX_IN_FLIGHT = 2             # 응답(ack)을 받지 못한 채 보낼 수 있는 최대 프레임 수
+DEFAULT_ACK_TIMEOUT_SECONDS = 5.0     # 이 시간 안에 ack가 없으면 해당 프레임은 유실된 것으로 간주
+DEFAULT_DEGRADED_DROP_RATIO = 0.5     # 판정 구간에서 폐기 비율이 이 값 이상이면 'degraded'
+DEGRADED_WINDOW_SECONDS = 2.0         # degraded 판정 구간(초)
+
+# (룸, sid) -> ClientFlow: 카메라 룸 구독자 및 시험 영상 클라이언트의 전송 상태
+client_flows = {}
+
+# 전송 방식별 누적 전송량 (프레임 수, 바이트 수)
+transport_stats = {
+    TRANSPORT_BINARY: {'frames': 0, 'bytes': 0},
+    TRANSPORT_BASE64: {'frames': 0, 'bytes': 0},
+}
+_stats_started_at = time.time()
+
+
+class ClientFlow:
+    """클라이언트 한 명의 프레임 전송 상태 및 ack 기반 흐름 제어
+
+    ack를 지원하는 클라이언트(ack=True)는 프레임을 받을 때마다 Socket.IO ack로 응답하며,
+    응답을 기다리는 프레임이 max_in_flight개이면 그 클라이언트에게만 새 프레임을 폐기합니다.
+    느린 연결의 클라이언트 때문에 서버의 송신 대기열이 끝없이 늘어나지 않고, 다른 구독자에게는 영향이 없습니다.
+    ack를 보내지 않는 구버전 클라이언트(ack=False)는 기존처럼 룸 브로드캐스트로 모든 프레임을 받습니다.
+    """
+
+    def __init__(self, sid, camera_id, transport, ack=False):
+        self.sid = sid
+        self.camera_id = camera_id
+        self.transport = transport
+        self.ack = ack
+        self.max_in_flight = max(1, int(get_setting('frame_max_in_flight', DEFAULT_MAX_IN_FLIGHT)))
+        self.ack_timeout = float(get_setting('frame_ack_timeout_seconds', DEFAULT_ACK_TIMEOUT_SECONDS))
+        self.degraded_drop_ratio = float(get_setting('frame_degraded_drop_ratio', DEFAULT_DEGRADED_DROP_RATIO))
+
+        self._in_flight = OrderedDict()  # ack 대기 중인 프레임: 전송 번호 -> 전송 시각 (전송 순서 유지)
+        self._next_send_id = 0
+        self.sent_count = 0
+        self.acked_count = 0
+        self.dropped_count = 0
+        self.timeout_count = 0
+        self.last_ack_time = None
+        self.last_ack_latency = None
+        self.degraded = False
+
+        self._window_started = time.time()
+        self._window_sent = 0
+        self._window_dropped = 0
+
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def try_acquire(self, now):
+        """새 프레임을 보낼 수 있으면 True (ack 시간 초과 프레임은 유실로 처리하여 자리 반환)"""
+        while self._in_flight and now - next(iter(self._in_flight.values())) > self.ack_timeout:
+            self._in_flight.popitem(last=False)
+            self.timeout_count += 1
+        return len(self._in_flight) < self.max_in_flight
+
+    def on_sent(self, now):
+        """전송 기록 후 ack 대기 프레임이면 그 프레임의 전송 번호 반환 (ack 콜백에 묶어서 전달)"""
+        self.sent_count += 1
+        self._window_sent += 1
+        if not self.ack:
+            return None
+        send_id = self._next_send_id
+        self._next_send_id += 1
+        self._in_flight[send_id] = now
+        return send_id
+
+    def on_dropped(self):
+        self.dropped_count += 1
+        self._window_dropped += 1
+
+    def on_ack(self, send_id, *args):
+        """클라이언트 ack 콜백 (send_id 프레임을 완료 처리)
+
+        시간 초과로 이미 유실 처리된 프레임의 늦은 ack는 무시하여, 그 뒤에 보낸 프레임의 자리를 비우지 않습니다.
+        """
+        sent_at = self._in_flight.pop(send_id, None)
+        if sent_at is None:
+            return
+        now = time.time()
+        self.last_ack_latency = now - sent_at
+        self.last_ack_time = now
+        self.acked_count += 1
+
+    def update_degraded(self, now):
+        """판정 구간이 끝났으면 degraded 여부를 갱신하고, 상태가 바뀐 경우에만 True 반환"""
+        if now - self._window_started < DEGRADED_WINDOW_SECONDS:
+            return False
+        total = self._window_sent + self._window_dropped
+        drop_ratio = self._window_dropped / total if total else 0.0
+        self._window_started = now
+        self._window_sent = 0
+        self._window_dropped = 0
+
+        degraded = drop_ratio >= self.degraded_drop_ratio
+        if degraded == self.degraded:
+            return False
+        self.degraded = degraded
+        return True
+
+    def stats(self):
+        return {
+            'sid': self.sid,
+            'camera_id': self.camera_id,
+            'transport': self.transport,
+            'ack': self.ack,
+            'in_flight': self.in_flight(),
+            'max_in_flight': self.max_in_flight,
+            'sent': self.sent_count,
+            'acked': self.acked_count,
+            'dropped': self.dropped_count,
+            'ack_timeouts': self.timeout_count,
+            'last_ack_latency_ms': self.last_ack_latency * 1000 if self.last_ack_latency is not None else None,
+            'degraded': self.degraded,
+        }
+
+
+def normalize_transport(transport):
+    """클라이언트가 요청한 전송 방식 정규화 (지정하지 않으면 기존 base64 방식)"""
+    return TRANSPORT_BINARY if transport == TRANSPORT_BINARY else TRANSPORT_BASE64
+
+
+def base64_room(room):
+    """base64 전송을 요청한 구독자가 참가하는 룸 이름"""
+    return f"{room}/base64"
+
+
+def transport_room(room, transport):
+    """ack를 보내지 않는 구독자가 전송 방식에 따라 참가할 브로드캐스트 룸 이름"""
+    return room if transport == TRANSPORT_BINARY else base64_room(room)
+
+
+def add_subscriber(room, sid, camera_id, transport, ack=False):
+    """룸 구독자의 전송 상태 등록 후 반환"""
+    flow = ClientFlow(sid, camera_id, normalize_transport(transport), bool(ack))
+    client_flows[(room, sid)] = flow
+    return flow
+
+
+def remove_subscriber(room, sid):
+    return client_flows.pop((room, sid), None)
+
+
+def room_flows(room):
+    return [flow for (flow_room, _), flow in client_flows.items() if flow_room == room]
+
+
+def make_frame_packet(header, rgb_jpeg, tir_jpeg):
+    """전송 단위 프레임 생성: (헤더 dict, RGB JPEG bytes, TIR JPEG bytes)
+
+    헤더에는 camera_id, seq, capture_timestamp, 재생 위치(current_time 등), person_detected 같은
+    작은 메타데이터만 담고 이미지는 인코딩 결과를 그대로 bytes로 보관합니다.
+    """
+    return header, bytes(rgb_jpeg), bytes(tir_jpeg)
+
+
+def to_base64_payload(packet):
+    """기존 video_frame 이벤트 형식(dict + base64 문자열)으로 변환"""
+    header, rgb_jpeg, tir_jpeg = packet
+    payload = dict(header)
+    payload['rgb'] = base64.b64encode(rgb_jpeg).decode('utf-8')
+    payload['tir'] = base64.b64encode(tir_jpeg).decode('utf-8')
+    return payload
+
+
+def _send(packet, target, transport, payload_cache, callback=None):
+    """프레임 한 개를 전송 (base64 변환 결과는 payload_cache로 같은 프레임 안에서 재사용)"""
+    header, rgb_jpeg, tir_jpeg = packet
+    if transport == TRANSPORT_BINARY:
+        socketio.emit(BINARY_FRAME_EVENT, (header, rgb_jpeg, tir_jpeg), room=target, callback=callback)
+        payload_bytes = len(rgb_jpeg) + len(tir_jpeg)
+    else:
+        payload = payload_cache.get(TRANSPORT_BASE64)
+        if payload is None:
+            payload = payload_cache[TRANSPORT_BASE64] = to_base64_payload(packet)
+        socketio.emit(BASE64_FRAME_EVENT, payload, room=target, callback=callback)
+        payload_bytes = len(payload['rgb']) + len(payload['tir'])
+    stats = transport_stats[transport]
+    stats['frames'] += 1
+    stats['bytes'] += payload_bytes
+
+
+def deliver(packet, flow, payload_cache=None, now=None):
+    """클라이언트 한 명에게 프레임 전송, 흐름 제어로 폐기되면 False 반환"""
+    payload_cache = {} if payload_cache is None else payload_cache
+    now = time.time() if now is None else now
+    sent = True
+    if flow.ack:
+        if flow.try_acquire(now):
+            # ack 콜백을 이 프레임의 전송 번호에 묶음 (ack가 전송 직후 도착해도 대기 목록에 먼저 등록되어 있음)
+            send_id = flow.on_sent(now)
+            _send(packet, flow.sid, flow.transport, payload_cache, callback=functools.partial(flow.on_ack, send_id))
+        else:
+            flow.on_dropped()
+            sent = False
+    else:
+        _send(packet, flow.sid, flow.transport, payload_cache)
+        flow.on_sent(now)
+    _notify_degraded(flow, now)
+    return sent
+
+
+def emit_room_frame(packet, room):
+    """카메라 룸 구독자들에게 프레임 전송
+
+    ack를 보내지 않는 구독자는 전송 방식별 룸 브로드캐스트 한 번으로, ack 구독자는 각자의
+    흐름 제어 상태에 따라 개별 전송합니다. 구독자가 없는 방식의 인코딩은 생략합니다.
+    """
+    flows = room_flows(room)
+    if not flows:
+        return
+    now = time.time()
+    payload_cache = {}
+    broadcast_transports = set()
+    for flow in flows:
+        if flow.ack:
+            deliver(packet, flow, payload_cache, now)
+        else:
+            broadcast_transports.add(flow.transport)
+            flow.on_sent(now)
+    for transport in broadcast_transports:
+        _send(packet, transport_room(room, transport), transport, payload_cache)
+
+
+def _notify_degraded(flow, now):
+    """폐기 비율 변화로 degraded 상태가 바뀌면 해당 클라이언트에게 알림"""
+    if not flow.update_degraded(now):
+        return
+    state = '저하' if flow.degraded else '회복'
+    print(f"[전송] 클라이언트 {flow.sid} 카메라 {flow.camera_id} 전송 상태 {state} "
+          f"(대기: {flow.in_flight()}/{flow.max_in_flight}, 누적 폐기: {flow.dropped_count})")
+    socketio.emit(DEGRADED_EVENT, {
+        'camera_id': flow.camera_id,
+        'degraded': flow.degraded,
+        'dropped_frames': flow.dropped_count,
+        'in_flight': flow.in_flight(),
+    }, room=flow.sid)
+
+
+def get_transport_stats():
+    """전송 방식별 누적 프레임/바이트 수, 초당 전송량 및 클라이언트별 흐름 제어 상태 반환"""
+    elapsed = max(time.time() - _stats_started_at, 1e-6)
+    return {
+        'transports': {
+            transport: {
+                'frames': stats['frames'],
+                'bytes': stats['bytes'],
+                'bytes_per_second': stats['bytes'] / elapsed,
+                'avg_frame_bytes': stats['bytes'] / stats['frames'] if stats['frames'] else 0,
+            } for transport, stats in transport_stats.items()
+        },
+        'clients': [flow.stats() for flow in client_flows.values()],
+    }
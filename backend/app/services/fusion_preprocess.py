@@ -0,0 +1,133 @@
+# /backend/app/services/fusion_preprocess.py
+
+import cv2
+import numpy as np
+
+DEFAULT_IMGSZ = 640
+DEFAULT_STRIDE = 32
+LETTERBOX_FILL = 114  # ultralytics LetterBox와 같은 여백 색상
+CHANNEL_ORDER = 'bgrt'  # 텐서 채널 순서 (탐지 캐시 키에 포함하여 순서가 바뀌면 이전 결과를 재사용하지 않음)
+PIXEL_SCALE = np.float32(1.0 / 255.0)
+
+
+class FusionPreprocessor:
+    """RGB + TIR 조기 융합 입력을 모델 입력 크기의 NCHW float 텐서로 바로 만드는 스트림별 전처리기
+
+    기존 방식(np.expand_dims → np.concatenate로 원본 해상도 HxWx4 배열 생성 → ultralytics 내부에서
+    다시 letterbox/transpose)과 달리, RGB와 TIR을 각각 letterbox 크기로 미리 할당한 버퍼에 resize한 뒤
+    미리 할당한 (1, 4, H, W) 텐서의 채널 평면에 바로 기록합니다. 프레임 크기가 같으면 프레임마다 새로 할당하는 배열이 없습니다.
+
+    ultralytics는 텐서 입력을 letterbox 없이 그대로 사용하므로 탐지 박스는 letterbox 좌표로 나오며,
+    to_frame_coords()로 원본 프레임 좌표로 되돌립니다.
+    """
+
+    # ultralytics(requirements.txt에 고정한 버전)의 BasePredictor.preprocess는 3채널 입력만 BGR→RGB로 뒤집고
+    # 4채널 HWC 입력은 그대로 transpose하므로, 기존 (B, G, R, T) 연결 입력은 같은 순서로 모델에 들어감.
+    # 기존 입력과 같은 결과가 나오도록 같은 순서로 기록 (benchmarks/fusion_preprocess_parity_check.py로 확인)
+    RGB_PLANES = (0, 1, 2)  # 원본 B, G, R 채널이 기록될 텐서 채널
+    TIR_PLANE = 3
+
+    def __init__(self, imgsz=DEFAULT_IMGSZ, stride=DEFAULT_STRIDE, pin_memory=False, auto=True):
+        import torch
+
+        self.imgsz = int(imgsz)
+        self.stride = int(stride)
+        self.pin_memory = pin_memory
+        self.auto = auto  # False면 입력 크기가 고정된 모델(ONNX)을 위해 imgsz x imgsz 정사각형으로 여백 추가
+        self._torch = torch
+        self.frame_shape = None
+        self.gain = 1.0
+        self.pad = (0, 0)
+        self.tensor = None
+        self.configure_count = 0
+
+    def _configure(self, frame_shape):
+        """프레임 크기가 바뀔 때만 letterbox 파라미터와 버퍼를 다시 할당"""
+        height, width = frame_shape[:2]
+        gain = min(self.imgsz / height, self.imgsz / width)
+        new_width, new_height = int(round(width * gain)), int(round(height * gain))
+        pad_width, pad_height = self.imgsz - new_width, self.imgsz - new_height
+        if self.auto:
+            # ultralytics LetterBox(auto=True)와 같이 stride 배수가 되도록 최소한의 여백만 추가
+            pad_width %= self.stride
+            pad_height %= self.stride
+        top, left = int(round(pad_height / 2 - 0.1)), int(round(pad_width / 2 - 0.1))
+
+        self.frame_shape = (height, width)
+        self.gain = gain
+        self.pad = (left, top)
+        self.resized_size = (new_width, new_height)
+
+        tensor_shape = (1, 4, new_height + pad_height, new_width + pad_width)
+        tensor = self._torch.full(tensor_shape, LETTERBOX_FILL / 255.0, dtype=self._torch.float32)
+        self.tensor = tensor.pin_memory() if self.pin_memory else tensor
+        planes = self.tensor.numpy()  # 텐서와 메모리를 공유하는 NumPy 뷰
+
+        self._rgb_resized = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        self._tir_resized = np.empty((new_height, new_width), dtype=np.uint8)
+        # 채널별 원본/대상 뷰도 한 번만 만들어 두어 프레임마다 뷰 객체를 만들지 않음
+        region = (0, slice(top, top + new_height), slice(left, left + new_width))
+        self._copies = [(self._rgb_resized[:, :, channel], planes[region[0], plane, region[1], region[2]])
+                        for channel, plane in enumerate(self.RGB_PLANES)]
+        self._copies.append((self._tir_resized, planes[region[0], self.TIR_PLANE, region[1], region[2]]))
+        self.configure_count += 1
+
+    def __call__(self, frame_rgb, frame_tir_gray):
+        """융합 입력 텐서를 채워 반환 (반환된 텐서는 다음 호출에서 덮어쓰므로 추론이 끝난 뒤 다시 호출해야 함)"""
+        if self.frame_shape != frame_rgb.shape[:2]:
+            self._configure(frame_rgb.shape)
+        cv2.resize(frame_rgb, self.resized_size, dst=self._rgb_resized, interpolation=cv2.INTER_LINEAR)
+        cv2.resize(frame_tir_gray, self.resized_size, dst=self._tir_resized, interpolation=cv2.INTER_LINEAR)
+        for source, target in self._copies:
+            # uint8 → float32 복사 후 같은 자료형끼리 곱함 (uint8 입력을 바로 곱하면 ufunc가 호출마다 형 변환 버퍼를 할당)
+            np.copyto(target, source, casting='unsafe')
+            np.multiply(target, PIXEL_SCALE, out=target)
+        return self.tensor
+
+    def letterbox_params(self):
+        """마지막 전처리의 (gain, pad, frame_shape) - 다른 스레드에서 좌표를 변환할 때 배치와 함께 전달"""
+        return self.gain, self.pad, self.frame_shape
+
+    def to_frame_coords(self, detections, params=None):
+        """letterbox 좌표의 탐지 박스를 원본 프레임 좌표로 변환 (Detections.data를 직접 수정)
+
+        params를 주면 현재 상태 대신 letterbox_params()로 받아 둔 값을 사용합니다.
+        """
+        gain, pad, frame_shape = params or self.letterbox_params()
+        if frame_shape is None or not len(detections):
+            return detections
+        boxes = detections.data[:, :4]
+        left, top = pad
+        boxes[:, [0, 2]] -= left
+        boxes[:, [1, 3]] -= top
+        boxes /= gain
+        height, width = frame_shape
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+        return detections
+
+    def stats(self):
+        return {
+            'imgsz': self.imgsz,
+            'frame_shape': list(self.frame_shape) if self.frame_shape else None,
+            'tensor_shape': list(self.tensor.shape) if self.tensor is not None else None,
+            'gain': self.gain if self.frame_shape else None,
+            'pad': list(self.pad) if self.frame_shape else None,
+            'reconfigurations': self.configure_count,
+        }
+
+
+def create_fusion_preprocessor(model):
+    """모델의 입력 크기/stride로 스트림 전용 전처리기 생성"""
+    import torch
+
+    imgsz = DEFAULT_IMGSZ
+    stride = DEFAULT_STRIDE
+    try:
+        imgsz = int(model.overrides.get('imgsz', DEFAULT_IMGSZ) or DEFAULT_IMGSZ)
+        stride = max(int(model.model.stride.max()), DEFAULT_STRIDE)
+    except Exception:
+        pass
+    fixed_input = getattr(model, 'fixed_input_size', False)  # ONNX 모델은 내보낼 때의 입력 크기만 받음
+    return FusionPreprocessor(imgsz=imgsz, stride=stride, pin_memory=torch.cuda.is_available() and not fixed_input,
+                              auto=not fixed_input)
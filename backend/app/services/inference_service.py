@@ -0,0 +1,358 @@
+# /backend/app/services/inference_service.py
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from eventlet import tpool
+from eventlet.event import Event
+from eventlet.queue import LightQueue, Empty
+
+from ..extensions import socketio
+from .settings_service import get_setting
+from .cpu_scheduler import get_cpu_scheduler
+from .detection_cache import get_detection_cache
+
+# --- 추론 실행기 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_INFERENCE_BACKEND = 'tpool'   # 'tpool' (eventlet.tpool) 또는 'thread' (ThreadPoolExecutor)
+DEFAULT_INFERENCE_WORKERS = 2         # 동시에 추론을 수행할 워커 스레드 수
+DEFAULT_INFERENCE_QUEUE_LIMIT = 4     # 실행 중 + 대기 중인 추론 요청의 최대 개수
+RESULT_POLL_INTERVAL = 0.002          # 'thread' 백엔드에서 결과를 기다릴 때 허브에 양보하는 간격(초)
+
+# --- 배치 추론 서버 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_BATCH_MAX_SIZE = 8            # 한 번에 묶을 최대 프레임 수
+DEFAULT_BATCH_MAX_WAIT_MS = 15        # 첫 요청 도착 후 배치를 모으는 최대 대기 시간(ms)
+DEFAULT_BATCH_QUEUE_LIMIT = 16        # 배치 서버 대기열 최대 길이
+BATCH_STATS_WINDOW = 200              # 통계 계산에 사용할 최근 배치 수
+
+
+class InferenceExecutor:
+    """모델 추론을 eventlet 허브 밖의 워커 스레드에서 실행하는 실행기
+
+    스트림 루프(greenlet)는 run()을 호출한 뒤 결과가 나올 때까지 자신만 대기하고,
+    그동안 허브는 다른 소켓 이벤트, REST 요청, 다른 카메라 스트림을 계속 처리합니다.
+    대기열이 queue_limit을 넘으면 요청을 거절(None 반환)하여 지연이 무한히 쌓이지 않게 합니다.
+    """
+
+    def __init__(self, backend=DEFAULT_INFERENCE_BACKEND, workers=DEFAULT_INFERENCE_WORKERS,
+                 queue_limit=DEFAULT_INFERENCE_QUEUE_LIMIT, scheduler=None):
+        self.backend = backend if backend in ('tpool', 'thread') else DEFAULT_INFERENCE_BACKEND
+        self.workers = max(1, int(workers))
+        self.queue_limit = max(self.workers, int(queue_limit))
+        self.scheduler = scheduler  # 워커 스레드별 CPU 스레드 예산 (CpuScheduler)
+
+        self._lock = threading.Lock()
+        self._pool = None
+        if self.backend == 'tpool':
+            # tpool 스레드 수는 첫 tpool.execute() 호출 전에만 변경 가능
+            tpool.set_num_threads(self.workers)
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='inference')
+
+        self.pending = 0          # 실행 중 + 대기 중인 요청 수
+        self.submitted_count = 0
+        self.completed_count = 0
+        self.rejected_count = 0
+        self.failed_count = 0
+        self.total_latency = 0.0
+
+        print(f"[추론 실행기] 백엔드: {self.backend}, 워커: {self.workers}, 대기열 한도: {self.queue_limit}")
+
+    def run(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs)를 워커 스레드에서 실행하고 결과를 반환
+
+        대기열이 가득 찼으면 실행하지 않고 None을 반환합니다. 호출한 쪽은 이 프레임의
+        추론을 건너뛰고 다음 프레임으로 넘어가면 됩니다. fn에서 발생한 예외는 그대로 전달됩니다.
+        """
+        with self._lock:
+            if self.pending >= self.queue_limit:
+                self.rejected_count += 1
+                return None
+            self.pending += 1
+            self.submitted_count += 1
+
+        if self.scheduler is not None:
+            fn = self.scheduler.wrap(fn)
+        started = time.time()
+        try:
+            if self.backend == 'tpool':
+                result = tpool.execute(fn, *args, **kwargs)
+            else:
+                future = self._pool.submit(fn, *args, **kwargs)
+                while not future.done():
+                    socketio.sleep(RESULT_POLL_INTERVAL)
+                result = future.result()
+        except Exception:
+            with self._lock:
+                self.failed_count += 1
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+        with self._lock:
+            self.completed_count += 1
+            self.total_latency += time.time() - started
+        return result
+
+    def is_backed_up(self):
+        """대기열이 워커 수를 넘어 요청이 밀리고 있는지 여부"""
+        return self.pending >= self.workers
+
+    def stats(self):
+        """실행기 통계 반환"""
+        with self._lock:
+            avg_latency = self.total_latency / self.completed_count if self.completed_count else 0.0
+            return {
+                'backend': self.backend,
+                'workers': self.workers,
+                'queue_limit': self.queue_limit,
+                'pending': self.pending,
+                'submitted': self.submitted_count,
+                'completed': self.completed_count,
+                'rejected': self.rejected_count,
+                'failed': self.failed_count,
+                'avg_latency_ms': avg_latency * 1000,
+            }
+
+
+_inference_executor = None
+
+
+def get_inference_executor():
+    """프로세스 전역 추론 실행기 반환 (최초 호출 시 settings.json 값으로 생성)"""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor(
+            backend=get_setting('inference_backend', DEFAULT_INFERENCE_BACKEND),
+            workers=get_setting('inference_workers', DEFAULT_INFERENCE_WORKERS),
+            queue_limit=get_setting('inference_queue_limit', DEFAULT_INFERENCE_QUEUE_LIMIT),
+            scheduler=get_cpu_scheduler(),
+        )
+    return _inference_executor
+
+
+class StreamTracker:
+    """스트림별 객체 추적기 (ultralytics의 model.track과 동일한 방식으로 트랙 ID 부여)
+
+    여러 스트림이 하나의 모델로 배치 추론을 하면 YOLO 객체 내부의 추적기를 공유할 수 없으므로,
+    스트림마다 별도의 추적기(기본: model.track과 같은 BoT-SORT)를 두고 predict() 결과에 트랙 ID를 붙입니다.
+    """
+
+    def __init__(self, tracker_cfg='botsort.yaml', frame_rate=30):
+        from ultralytics.trackers.track import TRACKER_MAP
+        from ultralytics.utils import IterableSimpleNamespace, yaml_load
+        from ultralytics.utils.checks import check_yaml
+
+        cfg = IterableSimpleNamespace(**yaml_load(check_yaml(tracker_cfg)))
+        self.tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate)
+
+    def update(self, result):
+        """단일 프레임 Results에 트랙 ID를 반영하여 반환"""
+        import torch
+
+        det = result.boxes.cpu().numpy()
+        if len(det) == 0:
+            return result
+        tracks = self.tracker.update(det, result.orig_img)
+        if len(tracks) == 0:
+            return result
+        idx = tracks[:, -1].astype(int)
+        result = result[idx]
+        result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+        return result
+
+
+class _BatchRequest:
+    __slots__ = ('stream_key', 'frame', 'enqueued_at', 'event')
+
+    def __init__(self, stream_key, frame):
+        self.stream_key = stream_key
+        self.frame = frame
+        self.enqueued_at = time.time()
+        self.event = Event()
+
+
+class BatchInferenceServer:
+    """같은 모델을 쓰는 모든 스트림의 융합 프레임을 모아 한 번에 추론하는 서버
+
+    첫 요청이 도착하면 max_wait_ms 동안(또는 max_batch_size가 찰 때까지) 다른 스트림의 요청을 모아
+    model.predict()를 한 번 호출하고, 스트림별 추적기를 거친 결과를 각 스트림에 돌려줍니다.
+    실제 추론은 InferenceExecutor를 통해 워커 스레드에서 실행됩니다.
+    """
+
+    def __init__(self, model_name, model, max_batch_size=DEFAULT_BATCH_MAX_SIZE,
+                 max_wait_ms=DEFAULT_BATCH_MAX_WAIT_MS, queue_limit=DEFAULT_BATCH_QUEUE_LIMIT):
+        self.model_name = model_name
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.queue_limit = max(self.max_batch_size, int(queue_limit))
+
+        self._queue = LightQueue()
+        self._trackers = {}
+        self._streams = set()  # 이 서버를 사용 중인 스트림 키 (모두 떠나면 서버 종료 후 모델 반환)
+        self.closed = False
+        self._batch_history = deque(maxlen=BATCH_STATS_WINDOW)
+        self.batch_count = 0
+        self.frame_count = 0
+        self.rejected_count = 0
+
+        self._task = socketio.start_background_task(self._serve)
+        print(f"[배치 추론] '{model_name}' 서버 시작 (최대 배치: {self.max_batch_size}, 최대 대기: {max_wait_ms}ms)")
+
+    def infer(self, stream_key, frame):
+        """프레임을 배치 대기열에 넣고 해당 스트림의 결과(list[Results])를 기다려 반환
+
+        대기열이 가득 찼거나 추론이 거절되면 None을 반환합니다.
+        """
+        if self.closed or self._queue.qsize() >= self.queue_limit:
+            self.rejected_count += 1
+            return None
+        request = _BatchRequest(stream_key, frame)
+        self._queue.put(request)
+        return request.event.wait()
+
+    def acquire_stream(self, stream_key):
+        """스트림이 이 서버를 사용하기 시작함을 기록"""
+        self._streams.add(stream_key)
+
+    def release_stream(self, stream_key):
+        """스트림 종료 시 해당 스트림의 추적기 정리, 마지막 스트림이면 서버를 종료하고 모델을 레지스트리에 반환"""
+        self._trackers.pop(stream_key, None)
+        self._streams.discard(stream_key)
+        if not self._streams:
+            self.close()
+
+    def close(self):
+        """배치 루프 종료, 모델 참조 반환, 서버 목록에서 제거 (모델 파일이 바뀌었으면 다음 서버는 새 모델을 로드)"""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(None)  # _serve 루프 종료 신호
+        if batch_servers.get(self.model_name) is self:
+            del batch_servers[self.model_name]
+        from .model_registry import get_model_registry
+        get_model_registry().release(self.model)
+        print(f"[배치 추론] '{self.model_name}' 서버 종료 (사용하는 스트림 없음)")
+
+    def _serve(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            batch = [request]
+            deadline = batch[0].enqueued_at + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)  # 이번 배치를 처리한 뒤 종료
+                    break
+                batch.append(request)
+
+            dispatched_at = time.time()
+            try:
+                results = get_inference_executor().run(self._predict_batch, batch)
+            except Exception as e:
+                print(f"[배치 추론] '{self.model_name}' 추론 오류: {e}")
+                results = None
+
+            finished_at = time.time()
+            if results is not None:
+                self.batch_count += 1
+                self.frame_count += len(batch)
+                self._batch_history.append({
+                    'size': len(batch),
+                    'wait_ms': (dispatched_at - batch[0].enqueued_at) * 1000,
+                    'infer_ms': (finished_at - dispatched_at) * 1000,
+                })
+            else:
+                self.rejected_count += len(batch)
+
+            for i, request in enumerate(batch):
+                request.event.send([results[i]] if results is not None else None)
+
+    def _predict_batch(self, batch):
+        """워커 스레드에서 실행: 배치 추론 후 스트림별 추적기 적용"""
+        import torch
+
+        frames = [request.frame for request in batch]
+        if isinstance(frames[0], torch.Tensor):
+            # 전처리기가 만든 NCHW 텐서는 크기가 같으면 하나의 배치 텐서로 합쳐 한 번에 추론
+            if all(frame.shape == frames[0].shape for frame in frames):
+                results = self.model.predict(torch.cat(frames), verbose=False)
+            else:
+                results = [self.model.predict(frame, verbose=False)[0] for frame in frames]
+        else:
+            results = self.model.predict(frames, verbose=False)
+        tracked = []
+        for request, result in zip(batch, results):
+            tracker = self._trackers.get(request.stream_key)
+            if tracker is None:
+                tracker = self._trackers[request.stream_key] = StreamTracker()
+            tracked.append(tracker.update(result))
+        return tracked
+
+    def stats(self):
+        """배치 크기/지연 통계 반환 (최근 BATCH_STATS_WINDOW개 배치 기준)"""
+        history = list(self._batch_history)
+        size_histogram = {}
+        for entry in history:
+            size_histogram[entry['size']] = size_histogram.get(entry['size'], 0) + 1
+        count = len(history)
+        return {
+            'model': self.model_name,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'active_streams': len(self._trackers),
+            'queued': self._queue.qsize(),
+            'batches': self.batch_count,
+            'frames': self.frame_count,
+            'rejected': self.rejected_count,
+            'avg_batch_size': sum(e['size'] for e in history) / count if count else 0.0,
+            'avg_wait_ms': sum(e['wait_ms'] for e in history) / count if count else 0.0,
+            'avg_infer_ms': sum(e['infer_ms'] for e in history) / count if count else 0.0,
+            'batch_size_histogram': size_histogram,
+        }
+
+
+batch_servers = {}  # 모델 이름별 배치 추론 서버
+
+
+def get_batch_server(model_name, model_loader, stream_key):
+    """모델 이름에 해당하는 배치 추론 서버를 stream_key 스트림용으로 반환 (없으면 model_loader로 모델을 로드하여 생성)
+
+    사용이 끝나면 server.release_stream(stream_key)를 호출해야 하며, 마지막 스트림이 떠나면 서버가 종료됩니다.
+    """
+    server = batch_servers.get(model_name)
+    if server is None:
+        model = model_loader(model_name)
+        if model is None:
+            return None
+        server = BatchInferenceServer(
+            model_name,
+            model,
+            max_batch_size=get_setting('batch_max_size', DEFAULT_BATCH_MAX_SIZE),
+            max_wait_ms=get_setting('batch_max_wait_ms', DEFAULT_BATCH_MAX_WAIT_MS),
+            queue_limit=get_setting('batch_queue_limit', DEFAULT_BATCH_QUEUE_LIMIT),
+        )
+        batch_servers[model_name] = server
+    server.acquire_stream(stream_key)
+    return server
+
+
+def get_inference_stats():
+    """추론 실행기와 배치 서버 통계를 모아 반환"""
+    return {
+        'executor': get_inference_executor().stats(),
+        'cpu': get_cpu_scheduler().stats(),
+        'detection_cache': get_detection_cache().stats(),
+        'batch_servers': [server.stats() for server in batch_servers.values()],
+    }
@@ -0,0 +1,129 @@
+# /backend/app/services/inference_stride.py
+
+import time
+from collections import deque
+
+import numpy as np
+
+from .detections import Detections
+
+# --- 추론 간격 기본 설정 (settings.json 또는 camera_settings로 카메라별 변경 가능) ---
+DEFAULT_INFERENCE_STRIDE = 1          # N프레임마다 한 번 탐지기 실행 (1 = 모든 프레임)
+DEFAULT_MAX_INFERENCE_STRIDE = 4      # 추론 대기열이 밀릴 때 자동으로 늘릴 수 있는 최대 간격
+STRIDE_RECOVERY_SECONDS = 3.0         # 대기열이 이 시간 동안 밀리지 않으면 간격을 한 단계 줄임
+FPS_WINDOW_SECONDS = 5.0              # 실효 추론 FPS 계산 구간(초)
+MAX_PROPAGATION_SECONDS = 1.0         # 마지막 실제 탐지 후 이 시간이 지나면 박스를 더 이상 이어 그리지 않음
+
+
+class AdaptiveStride:
+    """카메라별 추론 간격 관리
+
+    설정한 간격(base_stride)마다 탐지기를 실행하고, 추론 대기열이 밀리면 간격을 max_stride까지
+    한 단계씩 늘렸다가 대기열이 안정되면 다시 줄입니다. 실제 추론 시각으로 실효 추론 FPS를 계산합니다.
+    """
+
+    def __init__(self, base_stride=DEFAULT_INFERENCE_STRIDE, max_stride=DEFAULT_MAX_INFERENCE_STRIDE):
+        self.base_stride = max(1, int(base_stride))
+        self.max_stride = max(self.base_stride, int(max_stride))
+        self.stride = self.base_stride
+        self._frames_since_inference = self.stride  # 첫 프레임은 바로 추론
+        self._last_backed_up = None
+        self._last_change = time.time()
+        self._inference_times = deque()
+        self.inference_count = 0
+        self.propagated_count = 0
+
+    def should_infer(self):
+        """이번 프레임에 탐지기를 실행할 차례인지 여부"""
+        self._frames_since_inference += 1
+        if self._frames_since_inference >= self.stride:
+            self._frames_since_inference = 0
+            return True
+        self.propagated_count += 1
+        return False
+
+    def record_inference(self, now):
+        self.inference_count += 1
+        self._inference_times.append(now)
+        while self._inference_times and now - self._inference_times[0] > FPS_WINDOW_SECONDS:
+            self._inference_times.popleft()
+
+    def adapt(self, backed_up, now):
+        """추론 대기열 상태에 따라 간격 조정, 간격이 바뀌면 True 반환"""
+        if backed_up:
+            self._last_backed_up = now
+            if self.stride < self.max_stride and now - self._last_change >= 1.0:
+                self.stride += 1
+                self._last_change = now
+                return True
+        elif self.stride > self.base_stride:
+            quiet_since = max(self._last_backed_up or 0, self._last_change)
+            if now - quiet_since >= STRIDE_RECOVERY_SECONDS:
+                self.stride -= 1
+                self._last_change = now
+                return True
+        return False
+
+    def effective_fps(self, now=None):
+        """최근 FPS_WINDOW_SECONDS 동안의 실제 추론 FPS"""
+        now = time.time() if now is None else now
+        recent = [t for t in self._inference_times if now - t <= FPS_WINDOW_SECONDS]
+        if len(recent) < 2:
+            return float(len(recent))
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-6)
+
+    def stats(self):
+        return {
+            'base_stride': self.base_stride,
+            'max_stride': self.max_stride,
+            'stride': self.stride,
+            'inferences': self.inference_count,
+            'propagated_frames': self.propagated_count,
+            'effective_inference_fps': self.effective_fps(),
+        }
+
+
+class BoxPropagator:
+    """추론을 건너뛴 프레임에서 마지막 탐지 박스를 등속 모델로 이어 그리는 가벼운 예측기
+
+    추적 ID가 있는 박스는 직전 두 번의 실제 탐지에서 같은 ID의 박스 이동량으로 속도를 구해
+    경과 시간만큼 이동시키고, ID가 없거나 처음 나타난 박스는 마지막 위치를 유지합니다.
+    예측 결과는 표시용이며 이벤트 판단에는 사용하지 않습니다.
+    """
+
+    def __init__(self, max_age=MAX_PROPAGATION_SECONDS):
+        self.max_age = max_age
+        self._last = None
+        self._last_time = None
+        self._velocity = None  # 박스별 (x1, y1, x2, y2) 초당 이동량
+
+    def update(self, detections, now):
+        """실제 탐지 결과로 기준 박스와 속도 갱신"""
+        velocity = np.zeros((len(detections), 4), dtype=np.float32)
+        current_ids = detections.track_id
+        previous_ids = self._last.track_id if self._last is not None else None
+        if current_ids is not None and previous_ids is not None and len(detections):
+            dt = now - self._last_time
+            if dt > 0:
+                _, current_idx, previous_idx = np.intersect1d(current_ids, previous_ids, return_indices=True)
+                velocity[current_idx] = (detections.xyxy[current_idx] - self._last.xyxy[previous_idx]) / dt
+        self._last = detections
+        self._last_time = now
+        self._velocity = velocity
+
+    def reset(self):
+        """기준 탐지 제거 (시간 이동 등으로 장면이 바뀐 경우)"""
+        self._last = None
+        self._last_time = None
+        self._velocity = None
+
+    def predict(self, now):
+        """현재 시각의 예측 박스 (기준 탐지가 없거나 너무 오래되었으면 빈 탐지)"""
+        if self._last is None:
+            return Detections.empty()
+        elapsed = now - self._last_time
+        if elapsed > self.max_age or not len(self._last):
+            return Detections.empty(self._last.names)
+        data = self._last.data.copy()
+        data[:, :4] += self._velocity * elapsed
+        return Detections(data, self._last.names)
@@ -0,0 +1,289 @@
+# /backend/app/services/model_registry.py
+
+import copy
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+from eventlet import tpool
+from eventlet.event import Event
+
+from .settings_service import get_setting
+from .onnx_backend import BACKEND_ONNX, BACKEND_TORCH, get_model_backend, load_onnx_model
+from .quantization import BACKEND_ONNX_INT8, get_quantized_variant, load_quantized_model
+
+MODELS_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'models_ai')
+
+# --- 모델 캐시 기본 설정 (settings.json으로 변경 가능) ---
+DEFAULT_MAX_MODELS = 4            # 동시에 메모리에 유지할 최대 모델 수
+DEFAULT_MAX_MEMORY_MB = 2048      # 로드된 모델 가중치의 최대 메모리 합계(MB)
+DEFAULT_WARMUP_IMGSZ = 640        # 워밍업 더미 입력 크기
+DEFAULT_ATTENTION_IMPL = 'eager'  # C2PSA Attention 연산 구현 ('eager', 'sdpa', 'chunked')
+
+
+def get_model_path(model_name):
+    """models_ai/ 폴더 기준 모델 파일 경로 반환"""
+    return os.path.join(MODELS_FOLDER, model_name)
+
+
+def _model_input_channels(model, model_name):
+    """모델 입력 채널 수 추정 (조기 융합 모델은 RGB+TIR 4채널)"""
+    try:
+        return int(model.model.yaml.get('ch', 3))
+    except Exception:
+        return 4 if 'fusion' in model_name else 3
+
+
+def _resolve_backend(model_name):
+    """모델 이름으로 추론 백엔드 결정"""
+    # 등록된 INT8 양자화 변형(models_ai/<이름>.int8-<방식>.onnx)은 항상 ONNX Runtime으로 실행
+    if get_quantized_variant(model_name):
+        return BACKEND_ONNX_INT8
+    return get_model_backend(model_name)
+
+
+def _apply_attention_impl(model, model_name):
+    """settings.json의 attention_impl에 따라 PyTorch 모델의 Attention 연산 구현 선택"""
+    impl = get_setting('attention_impl', DEFAULT_ATTENTION_IMPL)
+    if impl == 'eager':
+        return
+    try:
+        from .custom_classes import configure_attention
+        count = configure_attention(model.model, impl)
+        if count:
+            print(f"[모델 레지스트리] '{model_name}' Attention {count}개에 '{impl}' 구현 적용")
+    except Exception as e:
+        print(f"[모델 레지스트리] Attention 구현 변경 실패 ('{model_name}'), 기본 구현을 사용합니다: {e}")
+
+
+def _model_memory_bytes(model):
+    """모델 가중치/버퍼가 차지하는 메모리(bytes) 추정"""
+    if getattr(model, 'backend', None) == BACKEND_ONNX:
+        return model.model_size_bytes  # ONNX Runtime 세션은 가중치 크기를 파일 크기로 추정
+    try:
+        module = model.model
+        total = sum(p.numel() * p.element_size() for p in module.parameters())
+        total += sum(b.numel() * b.element_size() for b in module.buffers())
+        return total
+    except Exception:
+        return 0
+
+
+class _ModelEntry:
+    def __init__(self, model_name, key, model, memory_bytes, load_seconds, warmup_seconds):
+        self.model_name = model_name
+        self.key = key
+        self.model = model
+        self.memory_bytes = memory_bytes
+        self.load_seconds = load_seconds
+        self.warmup_seconds = warmup_seconds
+        self.ref_count = 0
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.stale = False  # 모델 파일 갱신/Attention 구현 변경으로 더 이상 새 요청에 쓰이지 않는 항목
+
+
+class ModelRegistry:
+    """프로세스 전역 모델 레지스트리
+
+    모델 파일 경로와 수정 시각(mtime), 추론 백엔드(torch/onnx), Attention 구현(torch만)을 키로 각 모델을 한 번만 로드하고 워밍업한 뒤,
+    모든 스트림이 같은 가중치를 공유합니다. 사용 중이 아닌 모델은 모델 수/메모리 한도를
+    넘으면 가장 오래 사용되지 않은 것부터(LRU) 해제합니다.
+    """
+
+    def __init__(self, max_models=DEFAULT_MAX_MODELS, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+        self.max_models = max(1, int(max_models))
+        self.max_memory_bytes = int(float(max_memory_mb) * 1024 * 1024)
+        self._entries = OrderedDict()   # key -> _ModelEntry (LRU 순서: 앞쪽이 가장 오래 전 사용)
+        self._loading = {}              # key -> Event (동시에 같은 모델 로드 요청 시 한 번만 로드)
+        self.load_count = 0
+        self.hit_count = 0
+        self.eviction_count = 0
+
+    def _make_key(self, model_name):
+        model_path = os.path.abspath(get_model_path(model_name))
+        mtime = os.path.getmtime(model_path) if os.path.exists(model_path) else None
+        backend = _resolve_backend(model_name)
+        # settings.json의 attention_impl을 바꾸면 새 요청부터 새 구현으로 다시 로드 (이전 항목은 사용이 끝나면 해제)
+        attention_impl = get_setting('attention_impl', DEFAULT_ATTENTION_IMPL) if backend == BACKEND_TORCH else None
+        return (model_path, mtime, backend, attention_impl)
+
+    def acquire(self, model_name):
+        """공유 모델을 반환하고 참조 수를 증가 (로드 실패 시 None)
+
+        사용이 끝나면 release(model)을 호출해야 LRU 해제 대상이 됩니다.
+        """
+        key = self._make_key(model_name)
+
+        while key in self._loading:
+            self._loading[key].wait()  # 다른 greenlet이 같은 모델을 로드 중이면 완료까지 대기
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hit_count += 1
+        else:
+            entry = self._load(model_name, key)
+            if entry is None:
+                return None
+
+        entry.ref_count += 1
+        entry.last_used = time.time()
+        self._entries.move_to_end(key)
+        self._evict()  # 새로 로드된 모델은 참조 중이므로 해제 대상에서 제외됨
+        return entry.model
+
+    def release(self, model):
+        """acquire()로 가져온 모델의 참조 수 감소"""
+        for entry in self._entries.values():
+            if entry.model is model and entry.ref_count > 0:
+                entry.ref_count -= 1
+                entry.last_used = time.time()
+                break
+        self._evict()
+
+    def _load(self, model_name, key):
+        model_path = key[0]
+        loading_event = self._loading[key] = Event()
+        try:
+            started = time.time()
+            # 모델 로드와 워밍업은 수 초가 걸리므로 허브 밖의 스레드에서 실행
+            loaded = tpool.execute(self._load_and_warmup, model_path, model_name, key[2])
+            if loaded is None:
+                return None
+            loaded_model, warmup_seconds = loaded
+            load_seconds = time.time() - started - warmup_seconds
+
+            for old_key, old_entry in self._entries.items():
+                if old_key[0] == model_path and old_key != key:
+                    old_entry.stale = True  # 파일이 갱신된 이전 버전은 사용이 끝나는 대로 해제
+
+            entry = _ModelEntry(model_name, key, loaded_model, _model_memory_bytes(loaded_model),
+                                load_seconds, warmup_seconds)
+            self._entries[key] = entry
+            self.load_count += 1
+            backend = getattr(loaded_model, 'backend', BACKEND_TORCH)
+            print(f"[모델 레지스트리] '{model_name}' 로드 완료 (백엔드: {backend}, 로드: {load_seconds:.2f}초, "
+                  f"워밍업: {warmup_seconds:.2f}초, 메모리: {entry.memory_bytes / 1024 / 1024:.1f}MB)")
+            return entry
+        finally:
+            del self._loading[key]
+            loading_event.send(True)
+
+    @staticmethod
+    def _load_and_warmup(model_path, model_name, backend):
+        """워커 스레드에서 실행: 모델 로드 후 더미 입력으로 한 번 추론하여 워밍업"""
+        from ultralytics import YOLO
+
+        model = None
+        if backend == BACKEND_ONNX_INT8:
+            try:
+                model = load_quantized_model(model_name)
+            except Exception as e:
+                print(f"[모델 레지스트리] 양자화 모델 로드 실패 ({model_path}): {e}")
+                return None
+        elif backend == BACKEND_ONNX:
+            try:
+                model = load_onnx_model(model_name)
+            except Exception as e:
+                print(f"[모델 레지스트리] ONNX 모델 로드 실패 ('{model_name}'), PyTorch로 대체합니다: {e}")
+
+        if model is None:
+            try:
+                model = YOLO(model_path)
+            except Exception as e:
+                print(f"[모델 레지스트리] 모델 로드 실패 ({model_path}): {e}")
+                return None
+            _apply_attention_impl(model, model_name)
+
+        warmup_started = time.time()
+        try:
+            imgsz = int(model.overrides.get('imgsz', DEFAULT_WARMUP_IMGSZ) or DEFAULT_WARMUP_IMGSZ)
+            channels = getattr(model, 'channels', None) or _model_input_channels(model, model_name)
+            dummy = np.zeros((imgsz, imgsz, channels), dtype=np.uint8)
+            # 첫 추론 시 Conv+BN 융합 등이 일어나므로, 스트림이 공유하기 전에 미리 수행
+            model.predict(dummy, verbose=False)
+        except Exception as e:
+            print(f"[모델 레지스트리] 워밍업 실패 ('{model_name}'), 워밍업 없이 사용합니다: {e}")
+        return model, time.time() - warmup_started
+
+    def _evict(self):
+        """사용 중이 아닌 모델을 LRU 순서로 해제하여 모델 수/메모리 한도를 맞춤"""
+        for key, entry in list(self._entries.items()):
+            if entry.stale and entry.ref_count == 0:
+                self._remove(key, '이전 버전')
+
+        while len(self._entries) > self.max_models or self._total_memory() > self.max_memory_bytes:
+            victim = next((key for key, entry in self._entries.items() if entry.ref_count == 0), None)
+            if victim is None:
+                break  # 모두 사용 중이면 한도를 넘더라도 해제하지 않음
+            self._remove(victim, 'LRU')
+
+    def _remove(self, key, reason):
+        entry = self._entries.pop(key)
+        entry.model = None
+        self.eviction_count += 1
+        print(f"[모델 레지스트리] '{entry.model_name}' 해제 ({reason})")
+
+    def _total_memory(self):
+        return sum(entry.memory_bytes for entry in self._entries.values())
+
+    def stats(self):
+        """로드된 모델 목록과 캐시 통계 반환"""
+        return {
+            'max_models': self.max_models,
+            'max_memory_mb': self.max_memory_bytes / 1024 / 1024,
+            'total_memory_mb': self._total_memory() / 1024 / 1024,
+            'loads': self.load_count,
+            'hits': self.hit_count,
+            'evictions': self.eviction_count,
+            'models': [{
+                'model_name': entry.model_name,
+                'path': entry.key[0],
+                'mtime': entry.key[1],
+                'backend': getattr(entry.model, 'backend', BACKEND_TORCH),
+                'precision': getattr(entry.model, 'precision', 'fp32'),
+                'attention_impl': entry.key[3],
+                'memory_mb': entry.memory_bytes / 1024 / 1024,
+                'ref_count': entry.ref_count,
+                'load_seconds': entry.load_seconds,
+                'warmup_seconds': entry.warmup_seconds,
+                'loaded_at': entry.loaded_at,
+                'last_used': entry.last_used,
+                'stale': entry.stale,
+            } for entry in reversed(self._entries.values())],
+        }
+
+
+def load_standalone_model(model_name):
+    """레지스트리 캐시를 거치지 않고 설정된 백엔드로 모델을 로드 (오프라인 분석 등 서버 밖 스레드/프로세스용)"""
+    model_path = os.path.abspath(get_model_path(model_name))
+    loaded = ModelRegistry._load_and_warmup(model_path, model_name, _resolve_backend(model_name))
+    return loaded[0] if loaded is not None else None
+
+
+def create_stream_model(shared_model):
+    """공유 모델의 가중치는 그대로 쓰면서 스트림 전용 predictor/추적기를 갖는 핸들 생성
+
+    model.track(persist=True)는 YOLO 객체의 predictor에 추적기 상태를 저장하므로,
+    여러 스트림이 같은 객체를 쓰면 트랙 ID가 섞입니다. 얕은 복사로 nn.Module은 공유하고
+    predictor와 콜백 목록만 스트림별로 분리합니다.
+    """
+    stream_model = copy.copy(shared_model)
+    stream_model.predictor = None
+    stream_model.callbacks = {event: list(funcs) for event, funcs in shared_model.callbacks.items()}
+    return stream_model
+
+
+_model_registry = None
+
+
+def get_model_registry():
+    """프로세스 전역 모델 레지스트리 반환 (최초 호출 시 settings.json 값으로 생성)"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(
+            max_models=get_setting('model_cache_max_models', DEFAULT_MAX_MODELS),
+            max_memory_mb=get_setting('model_cache_max_memory_mb', DEFAULT_MAX_MEMORY_MB),
+        )
+    return _model_registry
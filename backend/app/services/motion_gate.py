@@ -0,0 +1,86 @@
+# /backend/app/services/motion_gate.py
+
+import cv2
+import numpy as np
+
+# --- 움직임 게이트 기본 설정 (settings.json 또는 camera_settings로 카메라별 변경 가능) ---
+DEFAULT_MOTION_SENSITIVITY = 0.5        # 0.0(둔감) ~ 1.0(민감)
+DEFAULT_HEARTBEAT_SECONDS = 2.0         # 변화가 없어도 이 간격마다 한 번은 추론
+DEFAULT_HOLD_SECONDS = 3.0              # 변화가 감지된 뒤 이 시간 동안은 계속 추론
+GATE_FRAME_WIDTH = 160                  # 비교용 축소 프레임 너비
+BACKGROUND_LEARNING_RATE = 0.05         # 배경 모델 갱신 비율 (클수록 빠르게 적응)
+
+
+class MotionGate:
+    """TIR 그레이스케일 프레임의 변화로 추론 필요 여부를 판단하는 사전 게이트
+
+    축소한 TIR 프레임으로 이동 평균 배경 모델을 유지하고, 배경과 차이가 큰 픽셀 비율이
+    임계값을 넘으면 장면이 변한 것으로 봅니다. 변화가 없으면 모델을 건너뛰되 heartbeat 간격마다
+    한 번은 추론하고, 탐지된 객체가 남아있는 동안(정지한 사람 등)은 계속 추론합니다.
+    """
+
+    def __init__(self, sensitivity=DEFAULT_MOTION_SENSITIVITY, heartbeat_seconds=DEFAULT_HEARTBEAT_SECONDS,
+                 hold_seconds=DEFAULT_HOLD_SECONDS):
+        sensitivity = min(max(float(sensitivity), 0.0), 1.0)
+        self.sensitivity = sensitivity
+        # 민감할수록 작은 밝기 차이와 작은 면적 변화에도 반응
+        self.pixel_threshold = 8 + (1.0 - sensitivity) * 32
+        self.area_threshold = 0.001 + (1.0 - sensitivity) * 0.02
+        self.heartbeat_seconds = float(heartbeat_seconds)
+        self.hold_seconds = float(hold_seconds)
+
+        self._background = None
+        self._last_motion_time = None
+        self._last_pass_time = None
+        self.last_change_ratio = 0.0
+
+        self.checked_count = 0      # 게이트를 거친 프레임 수
+        self.motion_count = 0       # 변화가 감지된 프레임 수
+        self.heartbeat_count = 0    # 변화 없이 heartbeat로 추론한 프레임 수
+        self.skipped_count = 0      # 추론을 건너뛴(절약한) 프레임 수
+
+    def _downscale(self, frame_gray):
+        height, width = frame_gray.shape[:2]
+        gate_height = max(1, int(height * GATE_FRAME_WIDTH / width))
+        small = cv2.resize(frame_gray, (GATE_FRAME_WIDTH, gate_height), interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def should_infer(self, frame_gray, now, has_detections=False):
+        """이번 프레임에 모델을 실행해야 하는지 여부"""
+        self.checked_count += 1
+        small = self._downscale(frame_gray)
+
+        if self._background is None or self._background.shape != small.shape:
+            self._background = small.astype(np.float32)
+            motion = True
+        else:
+            diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+            self.last_change_ratio = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+            motion = self.last_change_ratio >= self.area_threshold
+            cv2.accumulateWeighted(small, self._background, BACKGROUND_LEARNING_RATE)
+
+        if motion:
+            self.motion_count += 1
+            self._last_motion_time = now
+
+        recently_moved = self._last_motion_time is not None and now - self._last_motion_time < self.hold_seconds
+        if motion or recently_moved or has_detections:
+            self._last_pass_time = now
+            return True
+        if self._last_pass_time is None or now - self._last_pass_time >= self.heartbeat_seconds:
+            self._last_pass_time = now
+            self.heartbeat_count += 1
+            return True
+        self.skipped_count += 1
+        return False
+
+    def stats(self):
+        return {
+            'sensitivity': self.sensitivity,
+            'checked': self.checked_count,
+            'motion_frames': self.motion_count,
+            'heartbeats': self.heartbeat_count,
+            'skipped_inferences': self.skipped_count,
+            'skip_ratio': self.skipped_count / self.checked_count if self.checked_count else 0.0,
+            'last_change_ratio': self.last_change_ratio,
+        }
@@ -0,0 +1,342 @@
+# /backend/app/services/offline_analysis.py
+
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+import cv2
+import numpy as np
+
+from .detections import Detections
+from .fusion_preprocess import create_fusion_preprocessor
+
+TEST_VIDEOS_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'test_videos')
+RESULTS_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'analysis_results')
+
+# --- 오프라인 분석 기본 설정 ---
+DEFAULT_BATCH_SIZE = 8              # 한 번에 추론할 프레임 수
+DEFAULT_FRAME_STRIDE = 1            # N프레임마다 한 번 분석 (1 = 모든 프레임)
+DECODE_QUEUE_BATCHES = 4            # 디코딩 스레드가 미리 준비해 둘 최대 배치 수
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def find_video_pairs(directory):
+    """디렉터리의 (RGB 영상, 짝이 되는 TIR 영상 또는 None) 목록 (파일 이름의 'rgb'를 'tir'로 바꿔 짝 찾기)"""
+    files = sorted(f for f in os.listdir(directory) if f.lower().endswith(VIDEO_EXTENSIONS))
+    by_lower = {f.lower(): f for f in files}
+    pairs = []
+    for name in files:
+        if 'rgb' not in name.lower():
+            continue
+        tir_name = by_lower.get(name.lower().replace('rgb', 'tir'))
+        pairs.append((os.path.join(directory, name), os.path.join(directory, tir_name) if tir_name else None))
+    return pairs
+
+
+class _FrameDecoder(threading.Thread):
+    """RGB/TIR 영상을 디코딩하여 융합 입력 배치를 만드는 스레드
+
+    추론 스레드가 현재 배치를 처리하는 동안 다음 배치를 미리 디코딩/전처리하여 대기열에 넣습니다.
+    대기열이 가득 차면 디코딩을 멈추므로 메모리는 DECODE_QUEUE_BATCHES개 배치로 제한됩니다.
+    전처리기의 letterbox 상태는 이 스레드가 바꾸므로 배치마다 (gain, pad, frame_shape)를 함께 넣어
+    추론 스레드가 그 값으로 좌표를 변환하게 합니다 (프레임 크기가 바뀌면 배치를 먼저 보냄).
+    TIR 영상이 없으면 실시간 처리와 같이 RGB 그레이스케일을 TIR 채널로 사용합니다.
+    """
+
+    def __init__(self, rgb_path, tir_path, preprocessor, batch_size, frame_stride):
+        super().__init__(name='offline-decoder', daemon=True)
+        self.rgb_path = rgb_path
+        self.tir_path = tir_path
+        self.preprocessor = preprocessor
+        self.batch_size = batch_size
+        self.frame_stride = frame_stride
+        self.batches = queue.Queue(maxsize=DECODE_QUEUE_BATCHES)
+        self.decoded_frames = 0
+        self.decode_seconds = 0.0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _put(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self.batches.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        cap_rgb = cv2.VideoCapture(self.rgb_path)
+        cap_tir = cv2.VideoCapture(self.tir_path) if self.tir_path else None
+        try:
+            indices, batch, params = [], None, None
+            frame_index = 0
+            while not self._stop_event.is_set():
+                started = time.perf_counter()
+                if frame_index % self.frame_stride:
+                    # 분석하지 않는 프레임은 디코딩 없이 건너뜀 (grab만 수행)
+                    if not cap_rgb.grab() or (cap_tir is not None and not cap_tir.grab()):
+                        break
+                    frame_index += 1
+                    self.decode_seconds += time.perf_counter() - started
+                    continue
+
+                ok, frame_rgb = cap_rgb.read()
+                if not ok:
+                    break
+                if cap_tir is not None:
+                    ok, frame_tir = cap_tir.read()
+                    if not ok:
+                        break
+                    if frame_tir.shape[:2] != frame_rgb.shape[:2]:
+                        frame_tir = cv2.resize(frame_tir, (frame_rgb.shape[1], frame_rgb.shape[0]))
+                    frame_tir_gray = cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)
+                else:
+                    frame_tir_gray = cv2.cvtColor(frame_rgb, cv2.COLOR_BGR2GRAY)
+
+                tensor = self.preprocessor(frame_rgb, frame_tir_gray).numpy()
+                frame_params = self.preprocessor.letterbox_params()
+                if indices and frame_params != params:
+                    # 프레임 크기가 바뀌어 좌표 변환 값이 달라지면 지금까지의 배치를 먼저 보냄
+                    if not self._put((indices, batch[:len(indices)], params)):
+                        return
+                    indices, batch = [], None
+                params = frame_params
+                if batch is None:
+                    # 추론 스레드가 이전 배치를 쓰는 동안 덮어쓰지 않도록 배치마다 새 배열 사용
+                    batch = np.empty((self.batch_size,) + tensor.shape[1:], dtype=np.float32)
+                batch[len(indices)] = tensor[0]
+                indices.append(frame_index)
+                frame_index += 1
+                self.decoded_frames += 1
+                self.decode_seconds += time.perf_counter() - started
+
+                if len(indices) == self.batch_size:
+                    if not self._put((indices, batch, params)):
+                        return
+                    indices, batch = [], None
+            if indices:
+                self._put((indices, batch[:len(indices)], params))
+        except Exception as e:
+            self._put(e)
+        finally:
+            cap_rgb.release()
+            if cap_tir is not None:
+                cap_tir.release()
+            self._put(None)  # 끝 표시
+
+
+def _video_info(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    finally:
+        cap.release()
+    return fps, frames
+
+
+def analyze_pair(model, model_name, rgb_path, tir_path, output_dir, batch_size=DEFAULT_BATCH_SIZE,
+                 frame_stride=DEFAULT_FRAME_STRIDE, progress=None):
+    """RGB/TIR 영상 한 쌍을 전송/대기 없이 최대 속도로 분석하여 열 단위 탐지 파일과 요약을 저장
+
+    출력 (<RGB 파일 이름>.detections.npz):
+        frame (int32), timestamp (float32, 초), xyxy (float32, N x 4, 원본 프레임 좌표), conf (float32), cls (int16)
+        - 탐지 하나가 한 행이며, 같은 프레임의 탐지는 같은 frame 값을 가짐
+    요약 (<RGB 파일 이름>.summary.json): 처리 FPS, 클래스별 탐지 수 등. 요약 dict를 반환합니다.
+    """
+    import torch
+
+    video_fps, total_frames = _video_info(rgb_path)
+    preprocessor = create_fusion_preprocessor(model)
+    decoder = _FrameDecoder(rgb_path, tir_path, preprocessor, max(1, int(batch_size)), max(1, int(frame_stride)))
+
+    frame_columns, box_columns = [], []
+    names = {}
+    frames_with_detections = 0
+    analyzed_frames = batch_count = 0
+    inference_seconds = 0.0
+    started = time.perf_counter()
+    decoder.start()
+    try:
+        while True:
+            item = decoder.batches.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            indices, batch, params = item
+
+            inference_started = time.perf_counter()
+            results = model.predict(torch.from_numpy(batch), verbose=False)
+            inference_seconds += time.perf_counter() - inference_started
+            batch_count += 1
+
+            for frame_index, result in zip(indices, results):
+                detections = preprocessor.to_frame_coords(Detections.from_results([result]), params)
+                names = detections.names or names
+                if len(detections):
+                    frames_with_detections += 1
+                    frame_columns.append(np.full(len(detections), frame_index, dtype=np.int32))
+                    box_columns.append(detections.data[:, [0, 1, 2, 3, -2, -1]])
+            analyzed_frames += len(indices)
+            if progress:
+                progress(indices[-1] + 1, total_frames)
+    finally:
+        decoder.stop()
+        decoder.join()
+    elapsed = time.perf_counter() - started
+
+    frames = np.concatenate(frame_columns) if frame_columns else np.empty(0, dtype=np.int32)
+    boxes = np.concatenate(box_columns).astype(np.float32) if box_columns else np.empty((0, 6), dtype=np.float32)
+    classes = boxes[:, 5].astype(np.int16)
+
+    stem = os.path.splitext(os.path.basename(rgb_path))[0]
+    output_path = os.path.join(output_dir, f"{stem}.detections.npz")
+    np.savez_compressed(
+        output_path,
+        frame=frames,
+        timestamp=(frames / video_fps).astype(np.float32) if video_fps > 0 else np.zeros(len(frames), np.float32),
+        xyxy=boxes[:, :4],
+        conf=boxes[:, 4],
+        cls=classes,
+    )
+
+    class_ids, class_counts = np.unique(classes, return_counts=True)
+    summary = {
+        'rgb': os.path.basename(rgb_path),
+        'tir': os.path.basename(tir_path) if tir_path else None,
+        'model': model_name,
+        'backend': getattr(model, 'backend', 'torch'),
+        'output': os.path.basename(output_path),
+        'video_fps': video_fps,
+        'video_seconds': total_frames / video_fps if video_fps > 0 else None,
+        'frames_decoded': decoder.decoded_frames,
+        'frames_analyzed': analyzed_frames,
+        'frame_stride': decoder.frame_stride,
+        'batch_size': decoder.batch_size,
+        'elapsed_seconds': elapsed,
+        'fps': analyzed_frames / elapsed if elapsed > 0 else 0.0,
+        'realtime_factor': (total_frames / video_fps) / elapsed if video_fps > 0 and elapsed > 0 else None,
+        'decode_ms_per_frame': decoder.decode_seconds / max(decoder.decoded_frames, 1) * 1000,
+        'inference_ms_per_frame': inference_seconds / max(analyzed_frames, 1) * 1000,
+        'avg_batch_ms': inference_seconds / max(batch_count, 1) * 1000,
+        'detections': int(len(frames)),
+        'frames_with_detections': frames_with_detections,
+        'detections_per_class': {names.get(int(c), str(int(c))): int(n) for c, n in zip(class_ids, class_counts)},
+        'class_names': {int(k): v for k, v in names.items()},
+    }
+    with open(os.path.join(output_dir, f"{stem}.summary.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"[오프라인 분석] {summary['rgb']}: {analyzed_frames}프레임, {summary['fps']:.1f} FPS, "
+          f"탐지 {summary['detections']}개 {summary['detections_per_class']}")
+    return summary
+
+
+def analyze_directory(model, model_name, input_dir, output_dir, batch_size=DEFAULT_BATCH_SIZE,
+                      frame_stride=DEFAULT_FRAME_STRIDE, progress=None):
+    """디렉터리의 모든 RGB/TIR 영상 쌍을 분석하고 전체 보고서(report.json)를 저장하여 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    pairs = find_video_pairs(input_dir)
+    started = time.perf_counter()
+    summaries = []
+    for pair_index, (rgb_path, tir_path) in enumerate(pairs):
+        pair_progress = None
+        if progress:
+            def pair_progress(done, total, pair_index=pair_index):
+                progress(pair_index, len(pairs), done, total)
+        summaries.append(analyze_pair(model, model_name, rgb_path, tir_path, output_dir,
+                                      batch_size=batch_size, frame_stride=frame_stride, progress=pair_progress))
+    elapsed = time.perf_counter() - started
+
+    per_class = {}
+    for summary in summaries:
+        for name, count in summary['detections_per_class'].items():
+            per_class[name] = per_class.get(name, 0) + count
+    analyzed = sum(s['frames_analyzed'] for s in summaries)
+    report = {
+        'input_dir': os.path.abspath(input_dir),
+        'model': model_name,
+        'pairs': len(summaries),
+        'frames_analyzed': analyzed,
+        'video_seconds': sum(s['video_seconds'] or 0 for s in summaries),
+        'elapsed_seconds': elapsed,
+        'fps': analyzed / elapsed if elapsed > 0 else 0.0,
+        'detections': sum(s['detections'] for s in summaries),
+        'detections_per_class': per_class,
+        'videos': summaries,
+    }
+    with open(os.path.join(output_dir, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+# --- API용 백그라운드 분석 작업 ---
+MAX_FINISHED_JOBS = 20  # 메모리에 보관할 끝난 작업 수 (결과 파일은 analysis_results/에 남음)
+analysis_jobs = {}  # 작업 ID -> 상태 dict
+
+
+def _prune_finished_jobs():
+    """끝난 작업은 최근 MAX_FINISHED_JOBS개만 남김 (보고서가 커서 작업을 계속 쌓아 두지 않도록)"""
+    finished = sorted((job for job in list(analysis_jobs.values()) if job['finished_at'] is not None),
+                      key=lambda job: job['finished_at'])
+    for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        analysis_jobs.pop(job['id'], None)
+
+
+def _run_job(job):
+    from .model_registry import load_standalone_model
+
+    try:
+        model = load_standalone_model(job['model'])
+        if model is None:
+            raise RuntimeError(f"모델을 로드할 수 없습니다: {job['model']}")
+
+        def progress(pair_index, pair_count, done, total):
+            job['progress'] = {'pair': pair_index + 1, 'pairs': pair_count, 'frame': done, 'frames': total}
+
+        job['status'] = 'running'
+        job['report'] = analyze_directory(model, job['model'], job['input_dir'], job['output_dir'],
+                                          batch_size=job['batch_size'], frame_stride=job['frame_stride'],
+                                          progress=progress)
+        job['status'] = 'completed'
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = str(e)
+        print(f"[오프라인 분석] 작업 {job['id']} 실패: {e}")
+    finally:
+        job['finished_at'] = time.time()
+
+
+def start_analysis_job(model_name, input_dir=TEST_VIDEOS_FOLDER, batch_size=DEFAULT_BATCH_SIZE,
+                       frame_stride=DEFAULT_FRAME_STRIDE):
+    """분석 작업을 별도 OS 스레드에서 시작하고 작업 정보를 반환
+
+    수 시간 걸릴 수 있으므로 실시간 추론 워커(tpool)를 점유하지 않도록 전용 스레드를 사용합니다.
+    결과는 analysis_results/<작업 ID>/에 저장됩니다.
+    """
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        'id': job_id,
+        'model': model_name,
+        'input_dir': os.path.abspath(input_dir),
+        'output_dir': os.path.abspath(os.path.join(RESULTS_FOLDER, job_id)),
+        'batch_size': int(batch_size),
+        'frame_stride': int(frame_stride),
+        'status': 'queued',
+        'progress': None,
+        'report': None,
+        'error': None,
+        'created_at': time.time(),
+        'finished_at': None,
+    }
+    _prune_finished_jobs()
+    analysis_jobs[job_id] = job
+    threading.Thread(target=_run_job, args=(job,), name=f'offline-analysis-{job_id}', daemon=True).start()
+    print(f"[오프라인 분석] 작업 {job_id} 시작 (모델: {model_name}, 입력: {job['input_dir']})")
+    return job
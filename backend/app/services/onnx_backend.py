@@ -0,0 +1,239 @@
+# /backend/app/services/onnx_backend.py
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .fusion_preprocess import FusionPreprocessor
+from .settings_service import get_setting
+
+MODELS_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'models_ai')
+
+# --- ONNX 내보내기/추론 기본 설정 ---
+DEFAULT_IMGSZ = 640             # 내보낼 때 고정되는 입력 크기 (imgsz x imgsz)
+DEFAULT_OPSET = 17
+DEFAULT_CONF = 0.25             # ultralytics predict 기본값과 동일하게 유지 (PyTorch 결과와 비교 가능하도록)
+DEFAULT_IOU = 0.7
+DEFAULT_MAX_DET = 300
+BACKEND_TORCH = 'torch'
+BACKEND_ONNX = 'onnx'
+
+
+def get_model_backend(model_name):
+    """settings.json의 model_backends에서 모델별 추론 백엔드 조회 ('torch' 또는 'onnx')"""
+    backends = get_setting('model_backends', {}) or {}
+    backend = backends.get(model_name, BACKEND_TORCH)
+    return backend if backend in (BACKEND_TORCH, BACKEND_ONNX) else BACKEND_TORCH
+
+
+def get_onnx_paths(model_name):
+    """models_ai/ 기준 (원본 .pt, 내보낸 .onnx, 메타데이터 .onnx.json) 경로"""
+    source_path = os.path.abspath(os.path.join(MODELS_FOLDER, model_name))
+    onnx_path = os.path.splitext(source_path)[0] + '.onnx'
+    return source_path, onnx_path, onnx_path + '.json'
+
+
+def _register_custom_modules():
+    """.pt를 언피클할 때 필요한 커스텀 모듈 등록 (video_service와 같은 방식)"""
+    from ultralytics.nn.modules import conv
+    from .custom_classes import Silence, SilenceChannel
+
+    conv.Silence = Silence
+    conv.SilenceChannel = SilenceChannel
+
+
+def _non_max_suppression():
+    """ultralytics의 NMS 함수 (버전에 따라 ultralytics.utils.nms 또는 ultralytics.utils.ops에 있음)"""
+    try:
+        from ultralytics.utils.nms import non_max_suppression
+    except ImportError:
+        from ultralytics.utils.ops import non_max_suppression
+    return non_max_suppression
+
+
+def read_metadata(metadata_path):
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_export_current(model_name):
+    """내보낸 ONNX 파일이 있고 원본 .pt가 그 뒤로 바뀌지 않았는지 여부"""
+    source_path, onnx_path, metadata_path = get_onnx_paths(model_name)
+    metadata = read_metadata(metadata_path)
+    if metadata is None or not os.path.exists(onnx_path) or not os.path.exists(source_path):
+        return False
+    return metadata.get('source_mtime') == os.path.getmtime(source_path)
+
+
+def export_onnx(model_name, imgsz=DEFAULT_IMGSZ, opset=DEFAULT_OPSET):
+    """조기 융합 .pt 모델을 models_ai/<이름>.onnx로 내보내고 메타데이터 반환
+
+    ultralytics의 model.export()는 버전에 따라 더미 입력을 3채널로 만들기 때문에 4채널 융합 모델을
+    내보내지 못하므로, 직접 4채널 더미 입력으로 torch.onnx.export를 호출합니다.
+    - Silence/SilenceChannel: 등록 후 로드하면 Identity/Slice 연산으로 그대로 변환됨
+    - C3k2/C2PSA(Attention): 입력 크기를 고정하면 reshape 크기가 상수로 고정되어 그대로 변환됨
+    - Detect 헤드: export 모드로 바꿔 (batch, 4 + 클래스 수, 앵커 수) 원시 출력을 내보내고 NMS는 런타임에서 수행
+    """
+    import torch
+    from ultralytics import YOLO
+    from ultralytics.nn.modules import Detect
+
+    _register_custom_modules()
+    source_path, onnx_path, metadata_path = get_onnx_paths(model_name)
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {source_path}")
+
+    started = time.time()
+    yolo = YOLO(source_path)
+    channels = int(yolo.model.yaml.get('ch', 3))
+    if channels != 4:
+        raise ValueError(f"ONNX 백엔드는 4채널 융합 모델만 지원합니다 ('{model_name}' 입력 채널: {channels})")
+
+    network = yolo.model.float().fuse(verbose=False).eval()
+    for module in network.modules():
+        if isinstance(module, Detect):
+            module.export = True
+            module.format = 'onnx'
+            module.dynamic = False
+    for parameter in network.parameters():
+        parameter.requires_grad = False
+
+    dummy = torch.zeros(1, channels, imgsz, imgsz)
+    with torch.no_grad():
+        network(dummy)  # Detect 앵커를 고정 입력 크기로 미리 계산
+        torch.onnx.export(
+            network, dummy, onnx_path,
+            opset_version=opset,
+            input_names=['images'],
+            output_names=['output0'],
+            dynamic_axes={'images': {0: 'batch'}, 'output0': {0: 'batch'}},  # 배치 추론 서버용으로 배치 크기만 가변
+            do_constant_folding=True,
+        )
+
+    metadata = {
+        'source': os.path.basename(source_path),
+        'source_mtime': os.path.getmtime(source_path),
+        'imgsz': imgsz,
+        'channels': channels,
+        'stride': int(network.stride.max()),
+        'names': {int(k): v for k, v in yolo.names.items()},
+        'opset': opset,
+        'exported_at': time.time(),
+    }
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    print(f"[ONNX] '{model_name}' 내보내기 완료: {os.path.basename(onnx_path)} "
+          f"({imgsz}x{imgsz}, opset {opset}, {time.time() - started:.1f}초)")
+    return metadata
+
+
+class OnnxFusionModel:
+    """ONNX Runtime(CPU)으로 4채널 융합 모델을 실행하는 어댑터
+
+    start_video_processing과 배치 추론 서버가 쓰는 YOLO 객체의 일부(predict, track(persist=True),
+    names, overrides, predictor, callbacks)를 같은 형태로 제공하고, 결과도 ultralytics Results로 반환하므로
+    Detections.from_results와 StreamTracker를 그대로 사용할 수 있습니다.
+    - NCHW 텐서 입력(FusionPreprocessor 출력): 그대로 실행하며 박스는 입력 텐서(letterbox) 좌표
+    - HxWx4 배열 입력: 내부 전처리기로 letterbox한 뒤 박스를 원본 프레임 좌표로 되돌림
+    """
+
+    backend = BACKEND_ONNX
+    precision = 'fp32'  # INT8 양자화 변형은 quantization.load_quantized_model에서 변경
+    fixed_input_size = True
+
+    def __init__(self, onnx_path, metadata, conf=DEFAULT_CONF, iou=DEFAULT_IOU, max_det=DEFAULT_MAX_DET):
+        import onnxruntime as ort
+
+        from .cpu_scheduler import get_cpu_scheduler
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # 세션의 intra-op 스레드 풀은 동시에 실행되는 모든 워커가 공유하므로 추론용 코어 수만큼만 사용
+        options.intra_op_num_threads = len(get_cpu_scheduler().inference_cores)
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.onnx_path = onnx_path
+        self.model_size_bytes = os.path.getsize(onnx_path)
+
+        self.imgsz = int(metadata['imgsz'])
+        self.channels = int(metadata.get('channels', 4))
+        self.stride = int(metadata.get('stride', 32))
+        self.names = {int(k): v for k, v in metadata['names'].items()}
+        self.overrides = {'imgsz': self.imgsz}
+        self.conf, self.iou, self.max_det = conf, iou, max_det
+
+        # YOLO 객체와 같이 predictor에 track(persist=True)용 추적기를 보관
+        # (create_stream_model이 스트림별 핸들에서 None으로 초기화하므로 추적 상태가 스트림마다 분리됨)
+        self.predictor = None
+        self.callbacks = {}
+        # HxWx4 배열 입력용 전처리기 (스트림별 핸들이 공유하므로 잠금으로 보호)
+        self._preprocessor = FusionPreprocessor(imgsz=self.imgsz, stride=self.stride, auto=False)
+        self._preprocess_lock = threading.Lock()
+
+    def _prepare(self, source):
+        """입력을 (NCHW float32 배열, 원본 이미지 목록, 박스를 되돌릴 원본 크기 목록)으로 변환"""
+        import torch
+        from ultralytics.utils import ops
+
+        if isinstance(source, torch.Tensor):
+            batch = source if source.dim() == 4 else source.unsqueeze(0)
+            return batch.numpy(), ops.convert_torch2numpy_batch(batch), [None] * len(batch)
+
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        tensors = []
+        with self._preprocess_lock:
+            for frame in frames:
+                # 채널 슬라이스 뷰는 cv2.resize가 받지 못하므로 연속 배열로 변환 (HxWx4 입력 호환 경로)
+                rgb = np.ascontiguousarray(frame[:, :, :3])
+                tir = np.ascontiguousarray(frame[:, :, 3])
+                tensors.append(self._preprocessor(rgb, tir).numpy().copy())
+        return np.concatenate(tensors), list(frames), [frame.shape[:2] for frame in frames]
+
+    def predict(self, source, verbose=False, conf=None, iou=None, **kwargs):
+        """ultralytics model.predict와 같이 list[Results] 반환"""
+        import torch
+        from ultralytics.engine.results import Results
+        from ultralytics.utils import ops
+
+        batch, orig_imgs, orig_shapes = self._prepare(source)
+        started = time.time()
+        output = self.session.run(None, {self.input_name: batch})[0]
+        predictions = _non_max_suppression()(
+            torch.from_numpy(output),
+            conf if conf is not None else self.conf,
+            iou if iou is not None else self.iou,
+            max_det=self.max_det,
+        )
+
+        results = []
+        for prediction, orig_img, orig_shape in zip(predictions, orig_imgs, orig_shapes):
+            if orig_shape is not None and len(prediction):
+                prediction[:, :4] = ops.scale_boxes(batch.shape[2:], prediction[:, :4], orig_shape)
+            results.append(Results(orig_img, path='', names=self.names, boxes=prediction))
+        if verbose:
+            print(f"[ONNX] 추론 {len(results)}장, {(time.time() - started) * 1000:.1f}ms")
+        return results
+
+    def track(self, source, persist=False, verbose=False, **kwargs):
+        """ultralytics model.track과 같이 추적기를 거친 list[Results] 반환 (단일 스트림용)"""
+        from .inference_service import StreamTracker
+
+        if self.predictor is None or not persist:
+            self.predictor = StreamTracker()
+        return [self.predictor.update(result) for result in self.predict(source, verbose=verbose, **kwargs)]
+
+
+def load_onnx_model(model_name):
+    """내보낸 ONNX 모델을 로드 (없거나 원본 .pt가 더 최신이면 먼저 내보냄)"""
+    _, onnx_path, metadata_path = get_onnx_paths(model_name)
+    if not is_export_current(model_name):
+        print(f"[ONNX] '{model_name}'의 ONNX 파일이 없거나 오래되어 새로 내보냅니다.")
+        export_onnx(model_name)
+    return OnnxFusionModel(onnx_path, read_metadata(metadata_path))
@@ -0,0 +1,163 @@
+# /backend/app/services/pipeline_service.py
+
+import time
+
+import eventlet
+from flask_socketio import join_room, leave_room
+
+from .settings_service import get_setting
+from .video_service import start_video_processing, latest_frames
+from .frame_transport import add_subscriber, remove_subscriber, transport_room, deliver
+
+DEFAULT_PIPELINE_STOP_GRACE_SECONDS = 5.0  # 마지막 구독자가 떠난 뒤 파이프라인을 유지하는 시간(초)
+
+# 카메라 ID별 처리 파이프라인: 카메라 하나당 캡처/추론/인코딩을 한 번만 수행하고 룸으로 전송
+camera_pipelines = {}
+
+
+def camera_room(camera_id):
+    """카메라별 Socket.IO 룸 이름"""
+    return f"camera_{camera_id}"
+
+
+def subscribe(app, sid, stream_config):
+    """클라이언트를 카메라 파이프라인에 구독시킴 (첫 구독자이면 파이프라인 시작)
+
+    이미 실행 중인 파이프라인이 있으면 마지막으로 전송된 프레임을 즉시 보내
+    새 구독자가 다음 프레임을 기다리지 않고 바로 화면을 볼 수 있게 합니다.
+    stream_config['transport']가 'binary'이면 바이너리 프레임, 그 외에는 기존 base64 프레임을 받습니다.
+    stream_config['ack']가 True이면 프레임마다 ack를 받는 흐름 제어 대상이 되어 룸 브로드캐스트 대신 개별 전송됩니다.
+    """
+    camera_id = stream_config['camera_id']
+    room = camera_room(camera_id)
+    flow = add_subscriber(room, sid, camera_id, stream_config.get('transport'), stream_config.get('ack'))
+    if not flow.ack:
+        join_room(transport_room(room, flow.transport), sid=sid, namespace='/')
+
+    pipeline = camera_pipelines.get(camera_id)
+    if pipeline is None:
+        task = eventlet.spawn(start_video_processing, app, room, stream_config)
+        pipeline = {
+            'task': task,
+            'room': room,
+            'model': stream_config.get('model'),
+            'overlay': stream_config.get('overlay') or 'server',
+            'subscribers': {},  # sid -> ClientFlow (전송 방식 및 흐름 제어 상태)
+            'stop_timer': None,
+            'started_at': time.time(),
+        }
+        camera_pipelines[camera_id] = pipeline
+        task.link(_on_pipeline_exit, camera_id)
+        print(f"[파이프라인] 카메라 {camera_id} 파이프라인 시작 (모델: {pipeline['model']}, 룸: {room})")
+    else:
+        if pipeline['stop_timer'] is not None:
+            pipeline['stop_timer'].cancel()
+            pipeline['stop_timer'] = None
+            print(f"[파이프라인] 카메라 {camera_id} 종료 예약 취소 (새 구독자: {sid})")
+        if stream_config.get('model') and stream_config.get('model') != pipeline['model']:
+            print(f"[파이프라인] 카메라 {camera_id}는 이미 '{pipeline['model']}' 모델로 실행 중입니다. "
+                  f"요청된 모델 '{stream_config.get('model')}' 대신 기존 파이프라인에 합류합니다.")
+        if (stream_config.get('overlay') or 'server') != pipeline['overlay']:
+            print(f"[파이프라인] 카메라 {camera_id}는 이미 '{pipeline['overlay']}' 표시 방식으로 실행 중입니다. "
+                  f"프레임 헤더의 overlay 값으로 탐지 결과를 직접 그릴지 판단해야 합니다.")
+        last_frame = latest_frames.get(room)
+        if last_frame is not None:
+            deliver(last_frame, flow)
+
+    pipeline['subscribers'][sid] = flow
+    print(f"[파이프라인] 카메라 {camera_id} 구독: {sid} (구독자 {len(pipeline['subscribers'])}명)")
+    return pipeline
+
+
+def unsubscribe(sid, camera_id, leave=True):
+    """클라이언트의 카메라 구독 해제 (마지막 구독자이면 유예 시간 후 파이프라인 종료)"""
+    pipeline = camera_pipelines.get(camera_id)
+    if pipeline is None or sid not in pipeline['subscribers']:
+        return False
+
+    flow = pipeline['subscribers'].pop(sid)
+    remove_subscriber(pipeline['room'], sid)
+    if leave and not flow.ack:
+        leave_room(transport_room(pipeline['room'], flow.transport), sid=sid, namespace='/')
+    print(f"[파이프라인] 카메라 {camera_id} 구독 해제: {sid} (남은 구독자 {len(pipeline['subscribers'])}명)")
+
+    if not pipeline['subscribers'] and pipeline['stop_timer'] is None:
+        grace = float(get_setting('pipeline_stop_grace_seconds', DEFAULT_PIPELINE_STOP_GRACE_SECONDS))
+        pipeline['stop_timer'] = eventlet.spawn_after(grace, _stop_if_idle, camera_id)
+        print(f"[파이프라인] 카메라 {camera_id} 구독자 없음 - {grace:.1f}초 후 종료 예정")
+    return True
+
+
+def unsubscribe_all(sid):
+    """클라이언트 연결 해제 시 모든 카메라 구독 해제 (룸은 Socket.IO가 자동으로 정리)"""
+    for camera_id in list(camera_pipelines.keys()):
+        unsubscribe(sid, camera_id, leave=False)
+
+
+def get_subscriptions(sid):
+    """클라이언트가 구독 중인 카메라 ID 목록"""
+    return [camera_id for camera_id, pipeline in camera_pipelines.items() if sid in pipeline['subscribers']]
+
+
+def _stop_if_idle(camera_id):
+    pipeline = camera_pipelines.get(camera_id)
+    if pipeline is None:
+        return
+    pipeline['stop_timer'] = None
+    if pipeline['subscribers']:
+        return
+    stop_pipeline(camera_id)
+
+
+def stop_pipeline(camera_id):
+    """카메라 파이프라인 즉시 종료"""
+    pipeline = camera_pipelines.pop(camera_id, None)
+    if pipeline is None:
+        return
+    if pipeline['stop_timer'] is not None:
+        pipeline['stop_timer'].cancel()
+    for sid in pipeline['subscribers']:
+        remove_subscriber(pipeline['room'], sid)
+    try:
+        pipeline['task'].kill()
+    except Exception as e:
+        print(f"[파이프라인] 카메라 {camera_id} 작업 종료 오류: {e}")
+    latest_frames.pop(pipeline['room'], None)
+    print(f"[파이프라인] 카메라 {camera_id} 파이프라인 종료")
+
+
+def stop_all_pipelines():
+    """모든 카메라 파이프라인 종료 (서버 종료 시 사용), 종료한 파이프라인 수 반환"""
+    camera_ids = list(camera_pipelines.keys())
+    for camera_id in camera_ids:
+        stop_pipeline(camera_id)
+    return len(camera_ids)
+
+
+def _on_pipeline_exit(task, camera_id):
+    """카메라 연결 끊김 등으로 파이프라인이 스스로 끝난 경우 등록 정보 정리"""
+    pipeline = camera_pipelines.get(camera_id)
+    if pipeline is not None and pipeline['task'] is task:
+        camera_pipelines.pop(camera_id, None)
+        for sid in pipeline['subscribers']:
+            remove_subscriber(pipeline['room'], sid)
+        if pipeline['stop_timer'] is not None:
+            pipeline['stop_timer'].cancel()
+        latest_frames.pop(pipeline['room'], None)
+        print(f"[파이프라인] 카메라 {camera_id} 파이프라인이 종료되어 정리했습니다.")
+
+
+def get_pipeline_stats():
+    """실행 중인 카메라 파이프라인 상태 반환"""
+    now = time.time()
+    return [{
+        'camera_id': camera_id,
+        'room': pipeline['room'],
+        'model': pipeline['model'],
+        'overlay': pipeline['overlay'],
+        'subscribers': len(pipeline['subscribers']),
+        'transports': sorted({flow.transport for flow in pipeline['subscribers'].values()}),
+        'degraded_subscribers': sum(1 for flow in pipeline['subscribers'].values() if flow.degraded),
+        'uptime_seconds': now - pipeline['started_at'],
+        'stopping': pipeline['stop_timer'] is not None,
+    } for camera_id, pipeline in camera_pipelines.items()]
@@ -0,0 +1,127 @@
+# /backend/app/services/playback_clock.py
+
+import time
+from collections import deque
+
+import cv2
+
+# --- 시험 영상 재생 시계 기본 설정 ---
+LATE_TOLERANCE_FRAMES = 1.0     # 마감 시각을 이 프레임 수(원본 프레임 간격 기준) 이상 넘긴 프레임은 디코딩 없이 건너뜀
+MAX_SKIP_FRAMES = 120           # 한 번에 건너뛸 최대 프레임 수 (건너뛰기만 하다가 화면이 멈추지 않도록)
+MAX_LAG_SECONDS = 1.0           # 건너뛸 프레임이 없는데도 이만큼 늦으면 기준점을 다시 잡음 (지연 누적 방지)
+RATE_WINDOW_SECONDS = 3.0       # 실제 재생 속도 계산 구간(초)
+
+
+class PlaybackClock:
+    """영상 타임스탬프 기준 재생 시계
+
+    (실제 시각, 영상 시각) 기준점에서 프레임마다 '기준 실제 시각 + (프레임 시각 - 기준 영상 시각) / 재생 속도'를
+    마감 시각으로 계산합니다. 처리 시간과 관계없이 마감 시각까지만 기다리므로 추론이 오래 걸려도 재생 속도가 유지되고,
+    이미 마감을 넘긴 프레임은 grab()만 하고 건너뛰어 2x/4x에서도 시계가 뒤처지지 않습니다.
+    시간 이동/반복/일시정지 후에는 reset()으로 기준점을 다시 잡습니다.
+    """
+
+    def __init__(self, fps, rate=1.0, timestamps=None):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.timestamps = timestamps  # 프레임 번호 -> 영상 시각(초), 없으면 고정 FPS로 계산
+        self.rate = max(float(rate), 0.01)
+        self.position = 0.0           # 마지막으로 표시한 프레임의 영상 시각 (UI에 보고하는 current_time)
+        self.skipped_frames = 0
+        self.presented_frames = 0
+        self.resync_count = 0
+        self._anchor_wall = None
+        self._anchor_media = 0.0
+        self._presented = deque()     # (실제 시각, 영상 시각) - 실제 재생 속도 계산용
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.fps
+
+    def media_time(self, frame_index):
+        """프레임 번호의 영상 시각(초)"""
+        if self.timestamps:
+            return self.timestamps[min(max(int(frame_index), 0), len(self.timestamps) - 1)]
+        return max(int(frame_index), 0) / self.fps
+
+    def reset(self, media_time, now=None):
+        """media_time 프레임을 지금 표시하는 것으로 기준점 재설정 (시작, 시간 이동, 반복, 일시정지 해제 시)"""
+        self._anchor_wall = time.perf_counter() if now is None else now
+        self._anchor_media = media_time
+        self._presented.clear()
+
+    def set_rate(self, rate, now=None):
+        """재생 속도 변경 (현재 위치에서 새 속도로 기준점 재설정)"""
+        rate = max(float(rate), 0.01)
+        if rate != self.rate:
+            self.rate = rate
+            if self._anchor_wall is not None:
+                self.reset(self.position, now)
+
+    def deadline(self, media_time):
+        """media_time 프레임을 표시해야 하는 실제 시각 (perf_counter 기준)"""
+        if self._anchor_wall is None:
+            self.reset(media_time)
+        return self._anchor_wall + (media_time - self._anchor_media) / self.rate
+
+    def is_late(self, media_time, now=None):
+        """프레임이 허용치 이상 늦어 디코딩/추론 없이 건너뛰어야 하는지 여부"""
+        now = time.perf_counter() if now is None else now
+        return now - self.deadline(media_time) > LATE_TOLERANCE_FRAMES * self.frame_interval
+
+    def skip_late_frames(self, cap, tir_cap=None):
+        """다음 프레임이 늦은 동안 두 캡처에서 grab()만 하여(색 변환/추론 없음) 건너뛰고 건너뛴 수 반환
+
+        TIR을 먼저 grab()하고 실패하면(TIR 영상이 먼저 끝남) 건너뛰기를 멈춰 두 캡처가 같은 프레임 수만큼만 진행하도록 합니다.
+        RGB grab()이 실패하면 영상 끝이므로 호출한 쪽의 read() 실패 처리(처음으로 되감기)에 맡깁니다.
+        """
+        skipped = 0
+        now = time.perf_counter()
+        while skipped < MAX_SKIP_FRAMES and self.is_late(self.media_time(cap.get(cv2.CAP_PROP_POS_FRAMES)), now):
+            if tir_cap is not None and not tir_cap.grab():
+                break
+            if not cap.grab():
+                break
+            skipped += 1
+        self.skipped_frames += skipped
+        return skipped
+
+    def present(self, media_time, now=None):
+        """프레임 media_time을 처리해 보내기 직전 호출: 위치/실제 속도 갱신, 지연이 과하면 기준점 재설정"""
+        now = time.perf_counter() if now is None else now
+        self.position = media_time
+        self.presented_frames += 1
+        if now - self.deadline(media_time) > MAX_LAG_SECONDS:
+            # 건너뛸 프레임도 없이 늦어지는 경우(영상 끝 등) 늦은 만큼 계속 따라잡으려 하지 않도록 기준점만 이동
+            # (실제 재생 속도 구간은 유지하여 따라가지 못하는 상황이 achieved_rate에 드러나도록 함)
+            self._anchor_wall = now
+            self._anchor_media = media_time
+            self.resync_count += 1
+        self._presented.append((now, media_time))
+        while self._presented and now - self._presented[0][0] > RATE_WINDOW_SECONDS:
+            self._presented.popleft()
+
+    def wait_seconds(self, next_media_time, now=None):
+        """다음 프레임의 마감 시각까지 남은 시간 (이미 지났으면 0)"""
+        now = time.perf_counter() if now is None else now
+        return max(0.0, self.deadline(next_media_time) - now)
+
+    def achieved_rate(self):
+        """최근 구간의 실제 재생 속도 (영상 진행 시간 / 실제 경과 시간)"""
+        if len(self._presented) < 2:
+            return 0.0
+        (first_wall, first_media), (last_wall, last_media) = self._presented[0], self._presented[-1]
+        elapsed = last_wall - first_wall
+        return (last_media - first_media) / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        achieved = self.achieved_rate()
+        return {
+            'requested_rate': self.rate,
+            'achieved_rate': achieved,
+            'rate_ratio': achieved / self.rate if self.rate else 0.0,
+            'source_fps': self.fps,
+            'position': self.position,
+            'presented_frames': self.presented_frames,
+            'skipped_frames': self.skipped_frames,
+            'resyncs': self.resync_count,
+        }
@@ -0,0 +1,297 @@
+# /backend/app/services/quantization.py
+
+import json
+import math
+import os
+import time
+
+import cv2
+import numpy as np
+
+from .detections import match_boxes
+from .fusion_preprocess import CHANNEL_ORDER, FusionPreprocessor
+from .offline_analysis import TEST_VIDEOS_FOLDER, find_video_pairs
+from .onnx_backend import MODELS_FOLDER, OnnxFusionModel, get_onnx_paths, load_onnx_model, read_metadata
+from .settings_service import get_setting
+
+VARIANTS_MANIFEST = os.path.join(MODELS_FOLDER, 'quantized_variants.json')
+
+# --- INT8 양자화 기본 설정 ---
+QUANTIZATION_MODES = ('dynamic', 'static')
+BACKEND_ONNX_INT8 = 'onnx-int8'
+DEFAULT_CALIBRATION_FRAMES = 64     # 정적 양자화 보정에 쓸 프레임 수 (test_videos 전체에서 고르게 추출)
+DEFAULT_EVAL_FRAMES = 64            # 정확도/속도 비교에 쓸 프레임 수 (보정 프레임과 겹치지 않게 추출)
+DEFAULT_MAX_DRIFT = 0.03            # FP32 대비 허용하는 mAP50/recall 하락폭 (settings.json의 quantization_max_drift)
+MATCH_IOU = 0.5                     # mAP50 기준 IoU
+CALIBRATION_OFFSET = 0.25           # 영상 구간 내 보정 프레임 위치 (구간 비율)
+EVAL_OFFSET = 0.75                  # 영상 구간 내 평가 프레임 위치 (보정 프레임과 다른 위치)
+
+
+def variant_name(model_name, mode):
+    """양자화 변형 모델 이름 (models_ai/ 안의 파일 이름으로도 사용)"""
+    return f"{os.path.splitext(model_name)[0]}.int8-{mode}.onnx"
+
+
+def load_manifest():
+    """등록된 양자화 변형 목록 {변형 이름: 정보}"""
+    return read_metadata(VARIANTS_MANIFEST) or {}
+
+
+def _save_manifest(manifest):
+    with open(VARIANTS_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def get_quantized_variant(model_name):
+    """등록된 양자화 변형이면 정보 반환 (파일이 없어졌으면 None)"""
+    variant = load_manifest().get(model_name)
+    if variant is None or not os.path.exists(os.path.join(MODELS_FOLDER, model_name)):
+        return None
+    return variant
+
+
+def list_quantized_variants():
+    """파일이 남아있는 등록된 양자화 변형 목록
+
+    원본 .pt가 양자화 이후 바뀌었거나, 정적 양자화 보정 입력의 채널 순서가 현재 전처리기와 다르면 stale 표시
+    """
+    variants = []
+    for name, variant in load_manifest().items():
+        if not os.path.exists(os.path.join(MODELS_FOLDER, name)):
+            continue
+        source_path = os.path.join(MODELS_FOLDER, variant['source'])
+        stale = not os.path.exists(source_path) or os.path.getmtime(source_path) != variant.get('source_mtime')
+        stale = stale or (variant.get('mode') == 'static' and variant.get('channel_order') != CHANNEL_ORDER)
+        variants.append(dict(variant, name=name, stale=stale))
+    return variants
+
+
+def load_quantized_model(model_name):
+    """등록된 양자화 변형을 ONNX Runtime 어댑터로 로드 (클래스 이름/입력 크기는 원본 FP32 메타데이터 사용)"""
+    variant = get_quantized_variant(model_name)
+    if variant is None:
+        raise FileNotFoundError(f"등록된 양자화 모델이 아닙니다: {model_name}")
+    _, _, metadata_path = get_onnx_paths(variant['source'])
+    model = OnnxFusionModel(os.path.join(MODELS_FOLDER, model_name), read_metadata(metadata_path))
+    model.precision = f"int8-{variant['mode']}"
+    return model
+
+
+def sample_fusion_frames(count, imgsz, stride, offset):
+    """test_videos 영상 쌍 전체에서 count개 프레임을 고르게 뽑아 (1, 4, imgsz, imgsz) 입력 배열로 생성
+
+    각 영상을 같은 길이의 구간으로 나누고 구간 안의 offset 비율 위치 프레임을 사용하므로,
+    offset이 다르면 서로 겹치지 않는 프레임 집합이 됩니다. 메모리를 아끼기 위해 한 장씩 생성합니다.
+    """
+    # TIR 영상이 짝지어진 쌍만 사용 (양자화 모델도 실제 융합 입력으로 보정/평가)
+    pairs = [(rgb_path, tir_path) for rgb_path, tir_path in find_video_pairs(TEST_VIDEOS_FOLDER) if tir_path]
+    if not pairs or count <= 0:
+        return
+    preprocessor = FusionPreprocessor(imgsz=imgsz, stride=stride, auto=False)
+    per_pair = math.ceil(count / len(pairs))
+    produced = 0
+    for rgb_path, tir_path in pairs:
+        cap_rgb, cap_tir = cv2.VideoCapture(rgb_path), cv2.VideoCapture(tir_path)
+        try:
+            total = int(min(cap_rgb.get(cv2.CAP_PROP_FRAME_COUNT), cap_tir.get(cv2.CAP_PROP_FRAME_COUNT)))
+            for i in range(min(per_pair, total)):
+                if produced >= count:
+                    return
+                index = int((i + offset) * total / per_pair)
+                cap_rgb.set(cv2.CAP_PROP_POS_FRAMES, index)
+                cap_tir.set(cv2.CAP_PROP_POS_FRAMES, index)
+                ok_rgb, frame_rgb = cap_rgb.read()
+                ok_tir, frame_tir = cap_tir.read()
+                if not ok_rgb or not ok_tir:
+                    break
+                if frame_tir.shape[:2] != frame_rgb.shape[:2]:
+                    frame_tir = cv2.resize(frame_tir, (frame_rgb.shape[1], frame_rgb.shape[0]))
+                # 전처리기 텐서는 다음 호출에서 덮어쓰므로 복사해서 넘김
+                yield preprocessor(frame_rgb, cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)).numpy().copy()
+                produced += 1
+        finally:
+            cap_rgb.release()
+            cap_tir.release()
+
+
+def _calibration_reader(input_name, frames):
+    """onnxruntime 정적 양자화용 CalibrationDataReader (프레임을 하나씩 읽어 전달)"""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class _FusionCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self._frames = iter(frames)
+            self.count = 0
+
+        def get_next(self):
+            frame = next(self._frames, None)
+            if frame is None:
+                return None
+            self.count += 1
+            return {input_name: frame}
+
+    return _FusionCalibrationReader()
+
+
+def _true_positives(reference, candidate):
+    """candidate 박스(confidence 순)가 같은 클래스의 reference 박스와 IoU >= MATCH_IOU로 짝지어졌는지 여부"""
+    tp = np.zeros(len(candidate), dtype=bool)
+    for i, _ in match_boxes(candidate, reference, MATCH_IOU):
+        tp[i] = True
+    return tp
+
+
+def _average_precision(confidences, true_positives, reference_count):
+    """all-point 보간 AP (VOC/COCO 방식)"""
+    order = np.argsort(-confidences)
+    tp = true_positives[order]
+    cum_tp = np.cumsum(tp)
+    cum_fp = np.cumsum(~tp)
+    recall = np.concatenate(([0.0], cum_tp / reference_count, [1.0]))
+    precision = np.concatenate(([1.0], cum_tp / np.maximum(cum_tp + cum_fp, 1), [0.0]))
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    changed = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[changed + 1] - recall[changed]) * precision[changed + 1]))
+
+
+def evaluate_variant(reference_model, candidate_model, frames):
+    """FP32 모델의 탐지 결과를 기준(정답)으로 양자화 모델의 mAP50/recall과 프레임당 추론 시간 측정
+
+    test_videos에는 라벨이 없으므로 절대 정확도가 아니라 FP32 대비 변화량(drift)을 보는 지표입니다.
+    """
+    import torch
+
+    per_class = {}  # 클래스 -> ([confidence], [tp], 기준 박스 수)
+    reference_seconds = candidate_seconds = 0.0
+    frame_count = matched = reference_total = 0
+    for frame in frames:
+        tensor = torch.from_numpy(frame)
+        if frame_count == 0:
+            reference_model.predict(tensor)  # 첫 실행 지연은 속도 비교에서 제외
+            candidate_model.predict(tensor)
+
+        started = time.perf_counter()
+        reference = reference_model.predict(tensor)[0].boxes.data.cpu().numpy()
+        reference_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        candidate = candidate_model.predict(tensor)[0].boxes.data.cpu().numpy()
+        candidate_seconds += time.perf_counter() - started
+
+        tp = _true_positives(reference, candidate)
+        for cls in set(reference[:, 5].astype(int)) | set(candidate[:, 5].astype(int)):
+            confidences, tps, count = per_class.setdefault(cls, ([], [], [0]))
+            mask = candidate[:, 5] == cls
+            confidences.extend(candidate[mask, 4])
+            tps.extend(tp[mask])
+            count[0] += int(np.sum(reference[:, 5] == cls))
+        matched += int(tp.sum())
+        reference_total += len(reference)
+        frame_count += 1
+
+    aps = [_average_precision(np.asarray(confidences), np.asarray(tps, dtype=bool), count[0])
+           for confidences, tps, count in per_class.values() if count[0] > 0]
+    candidate_total = sum(len(confidences) for confidences, _, _ in per_class.values())
+    if aps:
+        map50 = float(np.mean(aps))
+    else:
+        map50 = 1.0 if candidate_total == 0 else 0.0  # 기준 박스가 없으면 양자화 모델도 없어야 일치
+    return {
+        'frames': frame_count,
+        'reference_boxes': reference_total,
+        'candidate_boxes': candidate_total,
+        'map50': map50,
+        'recall': matched / reference_total if reference_total else 1.0,
+        'fp32_ms': reference_seconds / max(frame_count, 1) * 1000,
+        'int8_ms': candidate_seconds / max(frame_count, 1) * 1000,
+    }
+
+
+def quantize_model(model_name, mode='static', calibration_frames=DEFAULT_CALIBRATION_FRAMES,
+                   eval_frames=DEFAULT_EVAL_FRAMES, max_drift=None):
+    """조기 융합 모델의 INT8 양자화 변형을 만들고, FP32 대비 정확도 변화가 한도 이내일 때만 등록
+
+    - dynamic: 가중치만 UINT8로 저장하고 활성값은 실행 중 양자화 (보정 데이터 불필요)
+    - static: test_videos 프레임으로 활성값 범위를 보정한 QDQ 모델 (CPU에서 보통 더 빠름)
+    mAP50 또는 recall 하락폭이 max_drift(기본: settings.json의 quantization_max_drift)를 넘으면
+    만든 파일을 지우고 등록하지 않습니다. 결과 정보(dict)를 반환합니다.
+    """
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_dynamic, quantize_static
+
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"지원하지 않는 양자화 방식입니다: {mode} (가능: {', '.join(QUANTIZATION_MODES)})")
+    if max_drift is None:
+        max_drift = float(get_setting('quantization_max_drift', DEFAULT_MAX_DRIFT))
+
+    reference_model = load_onnx_model(model_name)  # FP32 ONNX가 없거나 오래되었으면 먼저 내보냄
+    source_path, fp32_path, _ = get_onnx_paths(model_name)
+    name = variant_name(model_name, mode)
+    output_path = os.path.join(MODELS_FOLDER, name)
+
+    started = time.time()
+    if mode == 'dynamic':
+        # ONNX Runtime CPU의 ConvInteger는 uint8 가중치만 지원하므로 QInt8로 만들면 세션 생성이 실패함
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QUInt8)
+    else:
+        frames = sample_fusion_frames(calibration_frames, reference_model.imgsz, reference_model.stride,
+                                      CALIBRATION_OFFSET)
+        quantize_static(
+            fp32_path, output_path, _calibration_reader(reference_model.input_name, frames),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+            op_types_to_quantize=['Conv', 'MatMul'],  # 연산량 대부분인 연산만 양자화하고 Detect 후처리는 FP32 유지
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+    build_seconds = time.time() - started
+
+    candidate_model = None
+    try:
+        candidate_model = OnnxFusionModel(output_path, read_metadata(get_onnx_paths(model_name)[2]))
+        metrics = evaluate_variant(
+            reference_model, candidate_model,
+            sample_fusion_frames(eval_frames, reference_model.imgsz, reference_model.stride, EVAL_OFFSET),
+        )
+    except Exception:
+        # 로드/평가에 실패한 양자화 파일은 등록하지 않고 지움
+        del candidate_model
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    map50_drift = 1.0 - metrics['map50']
+    recall_drift = 1.0 - metrics['recall']
+    result = dict(
+        metrics,
+        name=name,
+        source=model_name,
+        source_mtime=os.path.getmtime(source_path),
+        mode=mode,
+        channel_order=CHANNEL_ORDER,
+        map50_drift=map50_drift,
+        recall_drift=recall_drift,
+        max_drift=max_drift,
+        speedup=metrics['fp32_ms'] / metrics['int8_ms'] if metrics['int8_ms'] else 0.0,
+        size_mb=os.path.getsize(output_path) / 1024 / 1024,
+        fp32_size_mb=os.path.getsize(fp32_path) / 1024 / 1024,
+        build_seconds=build_seconds,
+        built_at=time.time(),
+    )
+
+    manifest = load_manifest()
+    if metrics['frames'] == 0 or max(map50_drift, recall_drift) > max_drift:
+        result['registered'] = False
+        manifest.pop(name, None)
+        _save_manifest(manifest)
+        del candidate_model
+        os.remove(output_path)
+        reason = '평가 프레임 없음' if metrics['frames'] == 0 else \
+            f"mAP50 하락 {map50_drift:.3f}, recall 하락 {recall_drift:.3f} > 한도 {max_drift:.3f}"
+        print(f"[양자화] '{name}' 등록 거부 ({reason})")
+        return result
+
+    result['registered'] = True
+    manifest[name] = {key: value for key, value in result.items() if key not in ('name', 'registered')}
+    _save_manifest(manifest)
+    print(f"[양자화] '{name}' 등록 완료 (mAP50 하락: {map50_drift:.3f}, recall 하락: {recall_drift:.3f}, "
+          f"속도: {result['speedup']:.2f}배, {result['fp32_ms']:.1f}ms → {result['int8_ms']:.1f}ms)")
+    return result
@@ -0,0 +1,177 @@
+# /backend/app/services/recording_service.py
+
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+
+def open_video_writer(file_path, fps, frame_size):
+    """웹 브라우저 호환 우선순위에 따라 코덱을 시도하여 VideoWriter를 여는 함수
+
+    (writer, 실제 파일 경로, 코덱 설명)을 반환하며, 모든 조합이 실패하면 (None, file_path, None)을 반환합니다.
+    """
+    recordings_dir = os.path.dirname(file_path)
+    if recordings_dir and not os.path.exists(recordings_dir):
+        os.makedirs(recordings_dir)
+        print(f"[녹화] 디렉토리 생성: {recordings_dir}")
+
+    # 웹 브라우저 최적화: H.264/MP4 형식을 최우선으로 설정
+    # OpenH264 라이브러리를 통한 H.264 코덱 지원 (웹 표준)
+    codec_combinations = [
+        (cv2.VideoWriter_fourcc(*'H264'), '.mp4', 'H.264 MP4 (OpenH264)'),     # 1순위: H.264 표준
+        (cv2.VideoWriter_fourcc(*'avc1'), '.mp4', 'H.264 AVC1 MP4'),           # 2순위: H.264 대안
+        (cv2.VideoWriter_fourcc(*'mp4v'), '.mp4', 'MPEG-4 MP4'),               # 3순위: MPEG-4 백업
+        # AVI는 웹 브라우저 <video> 태그에서 재생되지 않으므로 최후 백업으로만 유지
+        (cv2.VideoWriter_fourcc(*'MJPG'), '.avi', 'Motion JPEG AVI (백업)'),    # 4순위: 최후 백업
+    ]
+
+    # 각 조합을 순서대로 시도
+    for fourcc, ext, description in codec_combinations:
+        # 파일 확장자 변경
+        test_file_path = os.path.splitext(file_path)[0] + ext
+
+        print(f"[녹화] {description} 시도 중... (파일: {os.path.basename(test_file_path)})")
+        writer = cv2.VideoWriter(test_file_path, fourcc, fps, frame_size)
+
+        if writer.isOpened():
+            print(f"[녹화] {description} 성공!")
+
+            # H.264/MP4 성공 시 특별 로깅
+            if 'H.264' in description and '.mp4' in description:
+                print(f"[녹화] ✅ H.264/MP4 형식으로 저장됨 - 웹 브라우저 완벽 호환!")
+            elif '.avi' in description:
+                print(f"[녹화] ⚠️  AVI 형식으로 저장됨 - 웹 브라우저에서 재생되지 않을 수 있음")
+            return writer, test_file_path, description
+
+        print(f"[녹화] {description} 실패")
+        writer.release()
+
+    print(f"[녹화 실패] 모든 코덱 조합으로 VideoWriter를 열 수 없습니다: {file_path}")
+    return None, file_path, None
+
+
+def _as_image(frame):
+    """링 버퍼 항목(원본 배열 또는 JPEG 바이트)을 BGR 이미지로 변환"""
+    if isinstance(frame, (bytes, bytearray)):
+        frame = np.frombuffer(frame, dtype=np.uint8)
+    if frame.ndim == 1:
+        return cv2.imdecode(frame, cv2.IMREAD_COLOR)
+    return frame
+
+
+class ClipRecorder:
+    """이벤트 발생 시점부터 프레임이 도착하는 대로 인코딩하는 점진적 녹화기
+
+    별도 OS 스레드에서 VideoWriter를 열고 링 버퍼의 이벤트 이전 구간을 먼저 기록한 뒤,
+    append()로 전달되는 이벤트 이후 프레임을 이어서 기록합니다. finish()를 호출하면 파일을 마무리하고
+    on_complete(최종 파일명 또는 None)를 호출합니다. 메모리에는 인코딩 대기 중인 몇 프레임만 남습니다.
+
+    녹화 FPS는 시작 시 고정하고, 각 프레임을 캡처 타임스탬프에 맞춰 배치(필요시 직전 프레임 반복)하므로
+    처리 속도가 흔들려도 영상 길이는 실제 경과 시간과 일치합니다.
+    """
+
+    def __init__(self, file_path, start_time, fps, pre_frames, on_complete=None, on_pre_flushed=None):
+        self.file_path = file_path
+        self.start_time = start_time
+        self.fps = max(1.0, float(fps))
+        self.on_complete = on_complete
+        self.on_pre_flushed = on_pre_flushed  # 이전 구간 기록 완료 시 호출 (링 버퍼 고정 해제용)
+
+        self._pre_frames = pre_frames
+        self._queue = queue.Queue()
+        self._finished = False
+        self.written_frames = 0
+        self.received_frames = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"ClipRecorder-{os.path.basename(file_path)}",
+                                        daemon=True)
+        self._thread.start()
+
+    def append(self, timestamp, frame):
+        """이벤트 이후 프레임 추가 (블로킹하지 않음)"""
+        if self._finished:
+            return
+        self.received_frames += 1
+        self._queue.put((timestamp, frame))
+
+    def finish(self):
+        """녹화 종료 요청 (남은 프레임을 기록하고 파일을 마무리)"""
+        if self._finished:
+            return
+        self._finished = True
+        self._queue.put(None)
+
+    def pending_frames(self):
+        """인코딩 대기 중인 프레임 수"""
+        return self._queue.qsize()
+
+    def _run(self):
+        writer = None
+        result_filename = None
+        last_image = None
+        try:
+            for timestamp, frame in zip(self._pre_frames.timestamps, self._pre_frames):
+                image = _as_image(frame)
+                if writer is None:
+                    height, width = image.shape[:2]
+                    writer, final_path, description = open_video_writer(self.file_path, self.fps, (width, height))
+                    if writer is None:
+                        return
+                    print(f"[녹화] 점진적 녹화 시작 - 형식: {description}, 크기: {width}x{height}, FPS: {self.fps:.2f}")
+                last_image = self._write_until(writer, float(timestamp), image, last_image)
+            pre_count = self.written_frames
+            self._pre_frames = None
+            if self.on_pre_flushed:
+                self.on_pre_flushed()
+            print(f"[녹화] 이전 구간 {pre_count}프레임 기록 완료, 이후 프레임 기록 중")
+
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                timestamp, frame = item
+                image = _as_image(frame)
+                if writer is None:
+                    height, width = image.shape[:2]
+                    writer, final_path, description = open_video_writer(self.file_path, self.fps, (width, height))
+                    if writer is None:
+                        return
+                last_image = self._write_until(writer, timestamp, image, last_image)
+
+            if writer is None:
+                print(f"[녹화 실패] 기록할 프레임이 없습니다: {self.file_path}")
+                return
+            writer.release()
+            writer = None
+
+            if os.path.exists(final_path):
+                file_size = os.path.getsize(final_path)
+                print(f"[녹화 완료] 영상이 다음 경로에 저장되었습니다: {final_path}")
+                print(f"[녹화 완료] 파일 크기: {file_size} bytes ({file_size/1024:.2f} KB)")
+                print(f"[녹화 완료] 저장된 프레임 수: {self.written_frames}, 실제 영상 길이: {self.written_frames / self.fps:.1f}초")
+                result_filename = os.path.basename(final_path)
+            else:
+                print(f"[녹화 실패] 파일이 생성되지 않았습니다: {final_path}")
+        except Exception as e:
+            print(f"[녹화 실패] 점진적 녹화 중 오류: {e}")
+        finally:
+            if writer is not None:
+                writer.release()
+            if self._pre_frames is not None and self.on_pre_flushed:
+                self.on_pre_flushed()
+            if self.on_complete:
+                self.on_complete(result_filename)
+
+    def _write_until(self, writer, timestamp, image, last_image):
+        """timestamp까지의 출력 프레임 슬롯을 채움 (빈 슬롯은 직전 프레임 반복)"""
+        target_count = int((timestamp - self.start_time) * self.fps) + 1
+        while self.written_frames < target_count - 1 and last_image is not None:
+            writer.write(last_image)
+            self.written_frames += 1
+        if self.written_frames < target_count:
+            writer.write(image)
+            self.written_frames += 1
+        return image
@@ -0,0 +1,226 @@
+# /backend/app/services/seek_index.py
+
+import bisect
+import json
+import os
+import time
+
+import cv2
+
+INDEX_SUFFIX = '.seekidx.json'
+INDEX_VERSION = 1
+
+# --- 시간 이동 기본 설정 ---
+MAX_FORWARD_DECODE_FRAMES = 90  # 현재 위치에서 이 프레임 수 이내로 앞으로 이동하면 seek 없이 디코딩만 진행
+
+_indexes = {}  # 절대 경로 -> SeekIndex (같은 영상을 여러 클라이언트가 재생해도 한 번만 읽음)
+
+
+def get_index_path(video_path):
+    """영상 옆에 저장되는 인덱스 파일 경로 (<영상>.seekidx.json)"""
+    return video_path + INDEX_SUFFIX
+
+
+class SeekIndex:
+    """영상 한 개의 프레임별 표시 시각(PTS)과 키프레임 목록
+
+    초 단위 시간을 CAP_PROP_FPS로 곱하는 대신 실제 프레임 시각에서 목표 프레임을 찾고,
+    그 앞의 키프레임으로 이동한 뒤 목표 프레임까지 디코딩하여 긴 GOP의 MP4에서도 정확한 프레임에 도착합니다.
+    """
+
+    def __init__(self, timestamps, keyframes, fps, source):
+        self.timestamps = timestamps  # 표시 순서 프레임 번호 -> 초
+        self.keyframes = keyframes    # 키프레임 번호 (오름차순, 알 수 없으면 빈 목록)
+        self.fps = fps
+        self.source = source          # 'pyav' 또는 'opencv'
+
+    @property
+    def frame_count(self):
+        return len(self.timestamps)
+
+    @property
+    def duration(self):
+        if not self.timestamps:
+            return 0.0
+        return self.timestamps[-1] + (1.0 / self.fps if self.fps > 0 else 0.0)
+
+    def frame_at(self, seconds):
+        """seconds 시점에 화면에 표시되는 프레임 번호"""
+        if not self.timestamps:
+            return 0
+        index = bisect.bisect_right(self.timestamps, seconds + 1e-6) - 1
+        return min(max(index, 0), len(self.timestamps) - 1)
+
+    def time_of(self, frame_index):
+        """프레임 번호의 표시 시각(초)"""
+        if not self.timestamps:
+            return 0.0
+        return self.timestamps[min(max(frame_index, 0), len(self.timestamps) - 1)]
+
+    def keyframe_before(self, frame_index):
+        """frame_index 이하에서 가장 가까운 키프레임 번호 (키프레임 정보가 없으면 None)"""
+        if not self.keyframes:
+            return None
+        position = bisect.bisect_right(self.keyframes, frame_index) - 1
+        return self.keyframes[max(position, 0)]
+
+    def to_dict(self, size, mtime):
+        return {
+            'version': INDEX_VERSION,
+            'size': size,
+            'mtime': mtime,
+            'fps': self.fps,
+            'source': self.source,
+            'timestamps': [round(t, 6) for t in self.timestamps],
+            'keyframes': self.keyframes,
+        }
+
+
+def _build_with_pyav(video_path):
+    """PyAV로 패킷만 읽어(디코딩 없음) 프레임 시각과 키프레임 수집"""
+    import av
+
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        time_base = float(stream.time_base)
+        fps = float(stream.average_rate) if stream.average_rate else 0.0
+        packets = []
+        for packet in container.demux(stream):
+            if packet.pts is None or packet.size == 0:
+                continue
+            packets.append((packet.pts, packet.is_keyframe))
+    # B-프레임이 있으면 디코딩 순서와 표시 순서가 다르므로 PTS로 정렬하여 프레임 번호를 매김
+    packets.sort()
+    start_pts = packets[0][0] if packets else 0
+    timestamps = [(pts - start_pts) * time_base for pts, _ in packets]
+    keyframes = [index for index, (_, is_keyframe) in enumerate(packets) if is_keyframe]
+    return SeekIndex(timestamps, keyframes, fps, 'pyav')
+
+
+def _build_with_opencv(video_path):
+    """OpenCV로 전체 프레임을 grab()하며 시각 수집 (키프레임 정보는 얻을 수 없음)"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"영상을 열 수 없습니다: {video_path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        timestamps = []
+        while cap.grab():  # 색 변환(retrieve) 없이 디코딩만 진행
+            timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+    finally:
+        cap.release()
+    if timestamps and fps > 0 and timestamps[-1] <= 0:
+        # 일부 백엔드는 POS_MSEC를 제공하지 않으므로 고정 FPS로 계산
+        timestamps = [i / fps for i in range(len(timestamps))]
+    return SeekIndex(timestamps, [], fps, 'opencv')
+
+
+def build_seek_index(video_path):
+    """영상의 시간 이동 인덱스 생성 (PyAV 패킷 기반, PyAV가 없거나 읽지 못하는 영상이면 OpenCV 디코딩 기반)
+
+    OpenCV 인덱스는 영상 전체를 디코딩해야 하고 키프레임 정보가 없어 이동할 때마다 처음부터 디코딩하므로
+    PyAV(requirements.txt의 av)를 설치해 사용합니다.
+    """
+    try:
+        return _build_with_pyav(video_path)
+    except ImportError:
+        print("[시간 이동 인덱스] 경고: PyAV(av)가 설치되지 않아 OpenCV로 전체 영상을 디코딩하여 인덱스를 만듭니다")
+    except Exception as e:
+        print(f"[시간 이동 인덱스] PyAV로 읽을 수 없어 OpenCV로 인덱스를 만듭니다 ({os.path.basename(video_path)}): {e}")
+    return _build_with_opencv(video_path)
+
+
+def load_seek_index(video_path):
+    """영상의 시간 이동 인덱스 반환 (저장된 인덱스가 최신이면 읽고, 아니면 생성 후 영상 옆에 저장)
+
+    시간이 걸릴 수 있으므로 스트림 greenlet에서는 tpool.execute()로 호출합니다.
+    """
+    if not video_path or not os.path.exists(video_path):
+        return None
+    stat = os.stat(video_path)
+    key = os.path.abspath(video_path)
+    cached = _indexes.get(key)
+    if cached is not None and cached[0] == (stat.st_size, stat.st_mtime):
+        return cached[1]
+
+    index_path = get_index_path(video_path)
+    index = None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if (data.get('version') == INDEX_VERSION and data.get('size') == stat.st_size
+                and data.get('mtime') == stat.st_mtime):
+            index = SeekIndex(data['timestamps'], data['keyframes'], data['fps'], data['source'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if index is None:
+        started = time.time()
+        try:
+            index = build_seek_index(video_path)
+        except Exception as e:
+            print(f"[시간 이동 인덱스] 생성 실패 ({os.path.basename(video_path)}), 프레임 번호로 이동합니다: {e}")
+            return None
+        print(f"[시간 이동 인덱스] {os.path.basename(video_path)}: {index.frame_count}프레임, "
+              f"키프레임 {len(index.keyframes)}개 ({index.source}, {time.time() - started:.2f}초)")
+        try:
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(index.to_dict(stat.st_size, stat.st_mtime), f)
+        except OSError as e:
+            print(f"[시간 이동 인덱스] 저장 실패 (메모리에서만 사용): {e}")
+
+    _indexes[key] = ((stat.st_size, stat.st_mtime), index)
+    return index
+
+
+def seek_capture(cap, index, target_frame):
+    """cap의 다음 read()가 target_frame을 반환하도록 이동하고 디코딩한 프레임 수 반환
+
+    - 목표가 현재 위치 바로 앞이면 seek 없이 grab()으로 진행
+    - 아니면 목표 이전의 가장 가까운 키프레임으로 이동한 뒤 목표까지 grab()
+    키프레임 정보가 없으면(OpenCV로 만든 인덱스) 임의 위치 seek는 프레임이 어긋날 수 있으므로
+    앞으로 이동할 때는 현재 위치에서, 뒤로 이동할 때는 첫 프레임에서부터 목표까지 grab()합니다.
+    인덱스가 아예 없으면 목표 프레임으로 바로 이동합니다 (기존 동작).
+    """
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))  # 다음 read()가 반환할 프레임 번호
+    if index is None:
+        if position != target_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
+        return 0
+    keyframe = index.keyframe_before(target_frame)
+    if keyframe is None:
+        if position > target_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # 첫 프레임으로의 이동은 키프레임 정보 없이도 정확함
+            position = 0
+    elif not (position <= target_frame and target_frame - position <= MAX_FORWARD_DECODE_FRAMES
+              and keyframe <= position):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)  # 키프레임에서는 디코더가 바로 시작하므로 위치가 어긋나지 않음
+        position = keyframe
+    decoded = 0
+    while position < target_frame and cap.grab():  # 중간 프레임은 색 변환 없이 버림
+        position += 1
+        decoded += 1
+    return decoded
+
+
+def seek_pair(seconds, rgb_cap, rgb_index, tir_cap=None, tir_index=None):
+    """RGB/TIR 캡처를 같은 표시 시각의 프레임으로 함께 이동
+
+    RGB 영상에서 seconds에 표시되는 프레임을 찾고, TIR 영상은 그 프레임의 실제 시각에 해당하는 프레임으로 맞춥니다
+    (두 영상의 FPS가 달라도 같은 장면에 정렬). (RGB 프레임 번호, 실제 시각, 디코딩한 프레임 수) 반환.
+    """
+    if rgb_index:
+        rgb_frame = rgb_index.frame_at(seconds)
+        actual_time = rgb_index.time_of(rgb_frame)
+    else:
+        fps = rgb_cap.get(cv2.CAP_PROP_FPS) or 30
+        rgb_frame = int(seconds * fps)
+        actual_time = rgb_frame / fps
+    decoded = seek_capture(rgb_cap, rgb_index, rgb_frame)
+    if tir_cap is not None:
+        if tir_index:
+            tir_frame = tir_index.frame_at(actual_time)
+        else:
+            tir_frame = int(actual_time * (tir_cap.get(cv2.CAP_PROP_FPS) or 30))
+        decoded += seek_capture(tir_cap, tir_index, tir_frame)
+    return rgb_frame, actual_time, decoded
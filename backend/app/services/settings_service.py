@@ -0,0 +1,42 @@
+# /backend/app/services/settings_service.py
+
+import json
+import os
+
+SETTINGS_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'settings.json')
+
+
+def load_settings():
+    """settings.json 전체를 딕셔너리로 읽어오는 함수 (파일이 없거나 손상되면 빈 딕셔너리)"""
+    try:
+        if os.path.exists(SETTINGS_PATH):
+            with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+                if isinstance(settings, dict):
+                    return settings
+    except Exception as e:
+        print(f"[설정] settings.json 읽기 실패: {e}")
+    return {}
+
+
+def get_setting(key, default=None):
+    """settings.json에서 단일 설정값을 읽어오는 함수 (키가 없으면 기본값)"""
+    return load_settings().get(key, default)
+
+
+def get_camera_setting(camera_id, key, default=None):
+    """카메라별 설정값 조회 (camera_settings.<카메라 ID>.<키> → 전역 <키> → 기본값 순)"""
+    settings = load_settings()
+    camera_settings = settings.get('camera_settings', {}).get(str(camera_id), {})
+    if key in camera_settings:
+        return camera_settings[key]
+    return settings.get(key, default)
+
+
+def update_settings(updates):
+    """기존 설정을 유지하면서 주어진 키만 갱신하여 settings.json에 저장"""
+    settings = load_settings()
+    settings.update(updates)
+    with open(SETTINGS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, ensure_ascii=False, indent=2)
+    return settings
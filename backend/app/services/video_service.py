@@ -3,14 +3,12 @@
 # OpenCV를 가장 먼저 임포트하여 비디오 백엔드 초기화 우선순위 확보
 import cv2
 import numpy as np
-import base64
 import time
 import os
 import threading
-from collections import deque
 from datetime import datetime
 import json
-from concurrent.futures import ThreadPoolExecutor
+from eventlet import tpool
 
 # OpenH264 DLL 경로 설정 제거 (버전 호환성 문제로 인해)
 # 호환되는 openh264-2.3.1-win64.dll을 python.exe와 동일한 폴더에 배치하면
@@ -21,9 +19,24 @@ print("INFO: OpenH264 지원 - 호환 DLL이 Python 폴더에 있으면 자동 
 from flask import current_app
 from ..extensions import socketio, db
 from ..models.db_models import DetectionEvent, EventFile, Camera
+from .capture_service import FrameGrabber, DualSensorCapture
+from .frame_buffer import FrameRingBuffer, JpegRingBuffer
+from .recording_service import ClipRecorder
+from .detections import Detections, draw_detections
+from .motion_gate import MotionGate, DEFAULT_MOTION_SENSITIVITY, DEFAULT_HEARTBEAT_SECONDS
+from .fusion_preprocess import CHANNEL_ORDER, create_fusion_preprocessor
+from .inference_stride import AdaptiveStride, BoxPropagator, DEFAULT_INFERENCE_STRIDE, DEFAULT_MAX_INFERENCE_STRIDE
+from .frame_transport import make_frame_packet, emit_room_frame, deliver, add_subscriber, remove_subscriber
+from .inference_service import get_inference_executor, get_batch_server
+from .cpu_scheduler import get_cpu_scheduler
+from .detection_cache import get_detection_cache, file_fingerprint
+from .seek_index import load_seek_index, seek_pair
+from .frame_store import open_stored_video, start_predecode, DEFAULT_AUTO_PREDECODE
+from .playback_clock import PlaybackClock
+from .settings_service import get_setting, get_camera_setting
+from .model_registry import get_model_registry, create_stream_model, get_model_path
 
 # AI 관련 임포트는 마지막에
-from ultralytics import YOLO
 from ultralytics.nn.modules import conv
 
 # --- 커스텀 AI 모델 클래스 등록 ---
@@ -37,27 +50,29 @@ except ImportError:
 
 def get_default_model_from_settings():
     """settings.json에서 기본 모델 이름을 읽어오는 함수"""
-    try:
-        import json
-        # settings.json 경로를 정확하게 잡아줍니다.
-        settings_path = os.path.join(os.path.dirname(__file__), '..', '..', 'settings.json')
-        if os.path.exists(settings_path):
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                return settings.get('default_model', 'yolo11n_early_fusion.pt') # 파일이 있어도 키가 없으면 기본값
-    except Exception:
-        pass # 오류 발생 시 기본값 반환
-    return 'yolo11n_early_fusion.pt'
+    return get_setting('default_model', 'yolo11n_early_fusion.pt') # 파일이나 키가 없으면 기본값
 
 # --- 전역 설정 ---
 DEFAULT_MODEL_NAME = get_default_model_from_settings()
-MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'models_ai', DEFAULT_MODEL_NAME)
 MODEL_TYPE = 'early_fusion'
 RECORD_SECONDS_BEFORE = 10  # 이벤트 발생 이전 녹화 시간
 RECORD_SECONDS_AFTER = 10   # 이벤트 발생 이후 녹화 시간
 TOTAL_RECORD_SECONDS = RECORD_SECONDS_BEFORE + RECORD_SECONDS_AFTER  # 총 녹화 시간
 FPS = 40
 RECORDINGS_FOLDER = "event_recordings"
+FRAME_BUFFER_MAX_FPS = get_setting('frame_buffer_max_fps', 15)  # 녹화용 링 버퍼에 저장할 최대 FPS (메모리 크기 결정)
+FRAME_BUFFER_MARGIN_SECONDS = 2.0  # 녹화 구간 외 여유 시간
+# 녹화 버퍼 모드: 'raw' (원본 프레임 배열) 또는 'jpeg' (인코딩된 JPEG 바이트, 메모리 약 10~20배 절약)
+FRAME_BUFFER_MODE = get_setting('frame_buffer_mode', 'raw')
+# 'jpeg' 모드에서 저장할 영상: 'raw' (BBox 없는 원본) 또는 'annotated' (대시보드로 전송한 BBox 포함 영상을 그대로 재사용)
+FRAME_BUFFER_JPEG_SOURCE = get_setting('frame_buffer_jpeg_source', 'raw')
+CAPTURE_BUFFER_SIZE = 1          # 캡처 스레드가 보관할 최신 프레임 수 (1 = 최신 프레임만)
+CAPTURE_DROP_POLICY = 'oldest'   # 버퍼가 가득 찼을 때 폐기할 프레임 ('oldest' 또는 'newest')
+DEFAULT_DUAL_TOLERANCE_MS = 25   # RGB/TIR 카메라 프레임을 같은 시점으로 짝지을 최대 캡처 시각 차이(ms)
+
+# --- 카메라 파이프라인별 마지막 전송 프레임 (새 구독자에게 즉시 전송) ---
+latest_frames = {}  # 룸 이름 -> 마지막 전송 프레임 (헤더, RGB JPEG, TIR JPEG)
+stream_stats = {}   # 룸 이름(또는 시험 영상 sid) -> 캡처/버퍼 등 스트림 상태 (관리자 API로 조회)
 
 # --- 시험 영상 제어용 전역 변수 ---
 test_video_controls = {}  # 클라이언트별 비디오 제어 상태 저장
@@ -116,23 +131,21 @@ BBOX_DISPLAY_THRESHOLD = 0.7       # BBox 표시 임계값: 70%
 
 # --- AI 모델 로드 ---
 def load_model(model_name='yolo11n_early_fusion.pt'):
-    """동적으로 모델을 로드하는 함수"""
-    model_path = os.path.join(os.path.dirname(__file__), '..', '..', 'models_ai', model_name)
-    try:
-        loaded_model = YOLO(model_path)
-        print(f"'{model_path}' 모델 로드 성공.")
-        return loaded_model
-    except Exception as e:
-        print(f"모델 로드 실패: {e}")
-        return None
+    """모델 레지스트리에서 공유 모델을 가져오는 함수 (처음 요청될 때만 파일에서 로드 및 워밍업)
 
-# 기본 모델 로드
-try:
-    model = YOLO(MODEL_PATH)
-    print(f"'{MODEL_PATH}' 기본 모델 로드 성공.")
-except Exception as e:
-    model = None
-    print(f"기본 모델 로드 실패: {e}")
+    반환된 모델은 get_model_registry().release(model)로 반환해야 LRU 해제 대상이 됩니다.
+    """
+    loaded_model = get_model_registry().acquire(model_name)
+    if loaded_model is None:
+        print(f"모델 로드 실패: {model_name}")
+    return loaded_model
+
+
+def create_frame_buffer(frame_shape):
+    """이벤트 전/후 녹화 구간을 모두 담을 수 있는 크기로 링 버퍼 생성"""
+    capacity = int((TOTAL_RECORD_SECONDS + FRAME_BUFFER_MARGIN_SECONDS) * FRAME_BUFFER_MAX_FPS) + 1
+    buffer_class = JpegRingBuffer if FRAME_BUFFER_MODE == 'jpeg' else FrameRingBuffer
+    return buffer_class(capacity, frame_shape, max_fps=FRAME_BUFFER_MAX_FPS)
 
 
 def transform_rgb_to_tir(frame_rgb):
@@ -141,89 +154,6 @@ def transform_rgb_to_tir(frame_rgb):
     # return frame_tir_color, gray
     return gray
 
-def save_video_clip(buffer, file_path, fps):
-    """비디오 클립을 저장하고 실제 저장된 파일명을 반환"""
-    print(f"[녹화 시작] 버퍼 크기: {len(buffer)} 프레임")
-    if not buffer: 
-        print("[녹화 실패] 버퍼가 비어있습니다.")
-        return None
-    
-    recordings_dir = os.path.dirname(file_path)
-    if not os.path.exists(recordings_dir): 
-        os.makedirs(recordings_dir)
-        print(f"[녹화] 디렉토리 생성: {recordings_dir}")
-    
-    height, width, _ = buffer[0].shape
-    expected_duration = len(buffer) / fps if fps > 0 else 0
-    print(f"[녹화] 프레임 크기: {width}x{height}, FPS: {fps:.2f}")
-    print(f"[녹화] 예상 영상 길이: {expected_duration:.1f}초")
-    
-    # 웹 브라우저 최적화: H.264/MP4 형식을 최우선으로 설정
-    # OpenH264 라이브러리를 통한 H.264 코덱 지원 (웹 표준)
-    codec_combinations = [
-        (cv2.VideoWriter_fourcc(*'H264'), '.mp4', 'H.264 MP4 (OpenH264)'),     # 1순위: H.264 표준
-        (cv2.VideoWriter_fourcc(*'avc1'), '.mp4', 'H.264 AVC1 MP4'),           # 2순위: H.264 대안
-        (cv2.VideoWriter_fourcc(*'mp4v'), '.mp4', 'MPEG-4 MP4'),               # 3순위: MPEG-4 백업
-        # AVI는 웹 브라우저 <video> 태그에서 재생되지 않으므로 최후 백업으로만 유지
-        (cv2.VideoWriter_fourcc(*'MJPG'), '.avi', 'Motion JPEG AVI (백업)'),    # 4순위: 최후 백업
-    ]
-    
-    writer = None
-    used_combination = None
-    final_file_path = file_path
-    
-    # 각 조합을 순서대로 시도
-    for fourcc, ext, description in codec_combinations:
-        # 파일 확장자 변경
-        base_path = os.path.splitext(file_path)[0]
-        test_file_path = base_path + ext
-        
-        print(f"[녹화] {description} 시도 중... (파일: {os.path.basename(test_file_path)})")
-        writer = cv2.VideoWriter(test_file_path, fourcc, fps, (width, height))
-        
-        if writer.isOpened():
-            used_combination = (fourcc, ext, description)
-            final_file_path = test_file_path
-            print(f"[녹화] {description} 성공!")
-            
-            # H.264/MP4 성공 시 특별 로깅
-            if 'H.264' in description and '.mp4' in description:
-                print(f"[녹화] ✅ H.264/MP4 형식으로 저장됨 - 웹 브라우저 완벽 호환!")
-            elif '.avi' in description:
-                print(f"[녹화] ⚠️  AVI 형식으로 저장됨 - 웹 브라우저에서 재생되지 않을 수 있음")
-            
-            break
-        else:
-            print(f"[녹화] {description} 실패")
-        writer.release()
-    
-    if not writer or not writer.isOpened():
-        print(f"[녹화 실패] 모든 코덱 조합으로 VideoWriter를 열 수 없습니다: {file_path}")
-        return None
-    
-    print(f"[녹화] 최종 사용된 형식: {used_combination[2]}")
-    
-    frame_count = 0
-    for frame in list(buffer): 
-        writer.write(frame)
-        frame_count += 1
-    
-    writer.release()
-    
-    # 파일 크기 확인
-    if os.path.exists(final_file_path):
-        file_size = os.path.getsize(final_file_path)
-        actual_duration = frame_count / fps if fps > 0 else 0
-        print(f"[녹화 완료] 영상이 다음 경로에 저장되었습니다: {final_file_path}")
-        print(f"[녹화 완료] 파일 크기: {file_size} bytes ({file_size/1024:.2f} KB)")
-        print(f"[녹화 완료] 저장된 프레임 수: {frame_count}, 실제 영상 길이: {actual_duration:.1f}초")
-        print(f"[녹화 완료] 형식: {used_combination[2]} (웹 브라우저 호환)")
-        
-        return os.path.basename(final_file_path)
-    else:
-        print(f"[녹화 실패] 파일이 생성되지 않았습니다: {final_file_path}")
-        return None
-
 def update_event_file_path(event_file_id, new_filename):
     """메인 스레드에서 DB 파일 경로를 업데이트"""
     try:
@@ -241,53 +171,39 @@ def update_event_file_path(event_file_id, new_filename):
         print(f"[DB 업데이트] 실패: {e}")
         return False
 
-def draw_detections_on_frame(frame, results, confidence_threshold=BBOX_DISPLAY_THRESHOLD):
-    """confidence 임계값 이상인 탐지 결과만 프레임에 그리기"""
-    if not results or len(results) == 0: return frame
-    
-    annotated_frame = frame.copy()
-    names = results[0].names
+def parse_camera_source(source):
+    """카메라 소스 설정값을 cv2.VideoCapture 인자로 변환 (숫자는 장치 번호, 그 외는 파일 경로/스트림 URL)"""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source.strip())
+    return source
+
+def open_camera(video_source):
+    """Windows에서 웹캠 접근을 위해 여러 백엔드를 차례로 시도하여 카메라 열기"""
+    cap = None
+    backends_to_try = [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]
     
-    for box in results[0].boxes:
-        confidence = float(box.conf[0])
-        
-        # confidence 임계값 체크
-        if confidence < confidence_threshold:
-            continue
-            
-        x1, y1, x2, y2 = map(int, box.xyxy[0])
-        cls = int(box.cls[0])
-        class_name = names[cls]
-        
-        # 객체 타입에 따른 색상 설정
-        if class_name == 'person':
-            color = (0, 0, 255)  # 빨강
-        elif class_name == 'scrofa':
-            color = (255, 0, 0)  # 파랑
-        elif class_name == 'inermis':
-            color = (0, 255, 0)  # 초록
-        else:
-            color = (255, 255, 0)  # 청록
-        
-        # BBox 그리기
-        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
-        
-        # 라벨 그리기 (객체 타입 + confidence)
-        label = f'{class_name} {confidence:.2f}'
-        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
-        
-        # 라벨 배경 그리기
-        cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), 
-                     (x1 + label_size[0], y1), color, -1)
-        
-        # 라벨 텍스트 그리기
-        cv2.putText(annotated_frame, label, (x1, y1 - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    for backend in backends_to_try:
+        print(f"백엔드 {backend}로 카메라 {video_source} 열기 시도...")
+        cap = cv2.VideoCapture(video_source, backend)
+        if cap.isOpened():
+            print(f"백엔드 {backend}로 카메라 {video_source} 열기 성공!")
+            break
+        cap.release()
+        cap = None
     
-    return annotated_frame
+    # 모든 백엔드 실패시 기본 방식으로 시도
+    if cap is None:
+        print("모든 백엔드 실패, 기본 방식으로 시도...")
+        cap = cv2.VideoCapture(video_source)
+    return cap
 
 
 def start_video_processing(app, sid, stream_config):
+    """영상 캡처/추론/전송 루프
+
+    sid는 결과를 전송할 대상입니다. 시험 영상은 요청한 클라이언트의 sid,
+    실시간 카메라는 여러 구독자가 함께 받는 카메라 룸 이름(camera_<id>)입니다.
+    """
     # 1. stream_config에서 파라미터 추출 ---
     is_live = stream_config.get('is_live_stream', False)
     is_test_video = not is_live
@@ -300,44 +216,61 @@ def start_video_processing(app, sid, stream_config):
         camera_id_raw = stream_config.get('camera_id', 0)
         # camera_id가 1이면 실제로는 0번 카메라 사용 (Windows 기본 웹캠)
         video_source = 0 if camera_id_raw == 1 else int(camera_id_raw) - 1
-        print(f"카메라 ID {camera_id_raw} → 비디오 소스 {video_source}")
+        # 카메라별 설정에 RGB/TIR 소스(장치 번호, 스트림 URL 또는 영상 파일)가 있으면 그 소스를 사용
+        video_source = parse_camera_source(get_camera_setting(camera_id_raw, 'rgb_source', None) or video_source)
+        live_tir_source = parse_camera_source(get_camera_setting(camera_id_raw, 'tir_source', None))
+        print(f"카메라 ID {camera_id_raw} → 비디오 소스 {video_source}"
+              + (f", TIR 소스 {live_tir_source}" if live_tir_source is not None else ""))
         rgb_path = None
         tir_path = None
     else: # 시험 영상
         rgb_path = stream_config.get('rgb_path')
         tir_path = stream_config.get('tir_path')
         video_source = rgb_path
+        live_tir_source = None
 
     is_multi_spectral = stream_config.get('is_multi_spectral', False)
     camera_id_for_db = stream_config.get('camera_id') # DB 저장용 ID
 
     # 2. 모델 로드 ---
-    current_model = load_model(model_name)
-    if not current_model:
-        socketio.emit('error', {'message': f"AI 모델 '{model_name}'을 로드할 수 없습니다. 기본 모델을 사용합니다."}, room=sid)
-        current_model = model # 기본 모델로 대체
+    # 배치 추론이 켜져 있으면 같은 모델을 쓰는 모든 스트림이 하나의 배치 서버(모델)를 공유
+    batch_server = None
+    stream_key = f"{sid}:{camera_id_for_db if is_live else 'test_video'}"
+    if get_setting('batch_inference', False):
+        batch_server = get_batch_server(model_name, load_model, stream_key)
+    shared_model = None
+    if not batch_server:
+        shared_model = load_model(model_name)
+        if not shared_model:
+            socketio.emit('error', {'message': f"AI 모델 '{model_name}'을 로드할 수 없습니다. 기본 모델을 사용합니다."}, room=sid)
+            shared_model = load_model(DEFAULT_MODEL_NAME) # 기본 모델로 대체
+            model_name = DEFAULT_MODEL_NAME
+    if batch_server:
+        current_model = batch_server.model
+    elif shared_model:
+        # 가중치는 레지스트리의 공유 모델을 쓰고, 추적기 상태만 이 스트림 전용으로 분리
+        current_model = create_stream_model(shared_model)
+    else:
+        current_model = None
     
     # 3. 비디오 캡처 초기화 ---
     if is_live:
-        # Windows에서 웹캠 접근을 위한 다양한 백엔드 시도
-        cap = None
-        backends_to_try = [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]
-        
-        for backend in backends_to_try:
-            print(f"백엔드 {backend}로 카메라 {video_source} 열기 시도...")
-            cap = cv2.VideoCapture(video_source, backend)
-            if cap.isOpened():
-                print(f"백엔드 {backend}로 카메라 {video_source} 열기 성공!")
-                break
-            cap.release()
-            cap = None
-        
-        # 모든 백엔드 실패시 기본 방식으로 시도
+        cap = open_camera(video_source)
+    else:
+        # 프레임 캐시/탐지 캐시 키로 쓰는 파일 식별 해시는 파일을 읽으므로 tpool에서 미리 계산 (이후 호출은 메모리 조회)
+        fingerprint_paths = [video_source, tir_path if is_multi_spectral else None,
+                             get_model_path(model_name) if current_model else None]
+        for path in fingerprint_paths:
+            if path:
+                tpool.execute(file_fingerprint, path)
+        # 미리 디코딩된 프레임 파일이 있으면 메모리 매핑으로 읽고 (디코딩 없음), 없으면 영상을 직접 디코딩
+        cap = open_stored_video(video_source)
         if cap is None:
-            print("모든 백엔드 실패, 기본 방식으로 시도...")
+            if get_setting('frame_cache_auto_predecode', DEFAULT_AUTO_PREDECODE):
+                start_predecode(rgb_path, tir_path if is_multi_spectral and tir_path != rgb_path else None)  # 다음 재생부터 캐시 사용
             cap = cv2.VideoCapture(video_source)
-    else:
-        cap = cv2.VideoCapture(video_source)
+        else:
+            print(f"[프레임 캐시] {os.path.basename(rgb_path)} 미리 디코딩된 프레임 사용")
 
     if not cap or not cap.isOpened():
         error_msg = f"비디오 소스({video_source})를 열 수 없습니다."
@@ -348,25 +281,104 @@ def start_video_processing(app, sid, stream_config):
             print(f"[DEBUG] OpenCV 버전: {cv2.__version__}")
             print(f"[DEBUG] 사용 가능한 백엔드들: {[cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]}")
         socketio.emit('error', {'message': error_msg}, room=sid)
+        if batch_server:
+            batch_server.release_stream(stream_key)
+        if shared_model:
+            get_model_registry().release(shared_model)
         return
 
     tir_cap = None
     if is_multi_spectral and tir_path and tir_path != rgb_path:
-        tir_cap = cv2.VideoCapture(tir_path)
+        tir_cap = open_stored_video(tir_path, gray=True) or cv2.VideoCapture(tir_path)
         if not tir_cap.isOpened():
             socketio.emit('error', {'message': f"TIR 영상({tir_path})을 열 수 없습니다."}, room=sid)
             cap.release()
+            if batch_server:
+                batch_server.release_stream(stream_key)
+            if shared_model:
+                get_model_registry().release(shared_model)
             return
 
+    # 실시간 다중 스펙트럼: TIR 카메라가 따로 있으면 RGB/TIR를 각자의 캡처 스레드로 읽고 캡처 시각으로 짝지음
+    live_tir_cap = None
+    if is_live and is_multi_spectral and live_tir_source is not None:
+        live_tir_cap = open_camera(live_tir_source)
+        if not live_tir_cap.isOpened():
+            socketio.emit('error', {'message': f"TIR 카메라({live_tir_source})를 열 수 없습니다."}, room=sid)
+            cap.release()
+            live_tir_cap.release()
+            if batch_server:
+                batch_server.release_stream(stream_key)
+            if shared_model:
+                get_model_registry().release(shared_model)
+            return
+
+    # 실시간 카메라는 별도 OS 스레드에서 캡처하여 최신 프레임만 추론 루프에 전달
+    # (시험 영상은 재생 제어/시간 이동이 필요하므로 기존처럼 루프에서 순차적으로 읽음)
+    grabber = None
+    live_frame_tir = None
+    if is_live:
+        # 소스가 영상 파일이면 시험용 대체 카메라로 보고 원본 FPS 속도로 읽으며 반복 재생
+        file_sources = all(isinstance(source, str) and os.path.isfile(source)
+                           for source in (video_source, live_tir_source) if source is not None)
+        if live_tir_cap:
+            grabber = DualSensorCapture(
+                cap, live_tir_cap, name=f"camera-{camera_id_for_db}",
+                tolerance=get_camera_setting(camera_id_for_db, 'dual_capture_tolerance_ms', DEFAULT_DUAL_TOLERANCE_MS) / 1000,
+                pace=file_sources, loop=file_sources)
+        else:
+            grabber = FrameGrabber(cap, name=f"camera-{camera_id_for_db}", buffer_size=CAPTURE_BUFFER_SIZE,
+                                   drop_policy=CAPTURE_DROP_POLICY,
+                                   pace_fps=cap.get(cv2.CAP_PROP_FPS) if file_sources else None, loop=file_sources)
+        grabber.start()
+
     # 4. 처리 루프 설정 ---
-    # 시간 기반 버퍼: (timestamp, frame) 튜플로 저장
-    frame_buffer = deque()  # maxlen 제거하여 시간 기준으로 직접 관리
+    # 시간 기반 링 버퍼: 첫 프레임 크기로 고정 용량 배열을 한 번만 할당 (프레임마다 복사본을 만들지 않음)
+    frame_buffer = None
     last_event_time = 0
     event_cooldown = 30
     current_recording = None  # 현재 진행 중인 녹화 정보
+    last_status_log_time = None  # 상태 로그 중복 출력 방지용
+    inference_executor = get_inference_executor()
+    # 카메라별 추론 간격: N프레임마다 탐지기를 실행하고 건너뛴 프레임은 예측 박스로 표시
+    inference_stride = AdaptiveStride(
+        get_camera_setting(camera_id_for_db, 'inference_stride', DEFAULT_INFERENCE_STRIDE),
+        get_camera_setting(camera_id_for_db, 'inference_max_stride', DEFAULT_MAX_INFERENCE_STRIDE),
+    )
+    box_propagator = BoxPropagator()
+    fusion_preprocessor = None
+    if current_model and get_setting('fusion_preprocessing', True):
+        fusion_preprocessor = create_fusion_preprocessor(current_model)
+    # 시험 영상은 (영상 쌍, 모델)별 프레임 탐지 결과를 캐시하여 반복 재생/시간 이동/다른 클라이언트가 재사용
+    detection_cache = None
+    cache_segment = None
+    video_frame_index = None
+    if is_test_video and current_model and get_setting('detection_cache_enabled', True):
+        try:
+            detection_cache = get_detection_cache()
+            cache_variant = (f"{getattr(current_model, 'backend', 'torch')}-"
+                             f"{'letterbox-' + CHANNEL_ORDER if fusion_preprocessor else 'concat'}")
+            cache_segment = detection_cache.open(rgb_path, tir_path if tir_cap else None,
+                                                 get_model_path(model_name), cache_variant)
+        except Exception as e:
+            print(f"[탐지 캐시] 캐시를 사용할 수 없어 모든 프레임을 추론합니다: {e}")
+            detection_cache = None
+    last_person_detected = False
+    last_detection_count = 0
+    # 실시간 카메라는 TIR 프레임 변화로 추론 필요 여부를 먼저 판단 (시험 영상은 모든 프레임 분석)
+    motion_gate = None
+    if is_live and get_camera_setting(camera_id_for_db, 'motion_gate_enabled', True):
+        motion_gate = MotionGate(
+            sensitivity=get_camera_setting(camera_id_for_db, 'motion_sensitivity', DEFAULT_MOTION_SENSITIVITY),
+            heartbeat_seconds=get_camera_setting(camera_id_for_db, 'motion_heartbeat_seconds', DEFAULT_HEARTBEAT_SECONDS),
+        )
+    sent_seq = 0  # 전송한 프레임 일련번호 (프레임 헤더의 seq)
+    # 'client': 서버는 원본 프레임만 인코딩하고 탐지 결과는 배열로 보내 대시보드가 그림 (그리기/복사 생략)
+    client_overlay = stream_config.get('overlay') == 'client'
     
-    # 시험 영상인 경우 제어 상태 초기화
+    # 시험 영상인 경우 제어 상태 초기화 (프레임은 요청한 클라이언트 한 명에게만 흐름 제어를 적용하여 전송)
     if is_test_video:
+        test_flow = add_subscriber(sid, sid, 'test_video', stream_config.get('transport'), stream_config.get('ack'))
         test_video_controls[sid] = {
             'is_paused': False,
             'current_time': 0.0,
@@ -375,326 +387,443 @@ def start_video_processing(app, sid, stream_config):
             '_last_logged_rate': None  # 로깅 추적용
         }
 
+    # 시험 영상은 프레임 시각/키프레임 인덱스로 시간 이동 (최초 1회 생성 후 영상 옆에 저장, 허브를 막지 않도록 tpool에서 실행)
+    rgb_seek_index = None
+    tir_seek_index = None
+    if is_test_video:
+        rgb_seek_index = getattr(cap, 'seek_index', None) or tpool.execute(load_seek_index, rgb_path)
+        if tir_cap:
+            tir_seek_index = getattr(tir_cap, 'seek_index', None) or tpool.execute(load_seek_index, tir_path)
+    # 시험 영상 재생 시계: 처리 시간과 관계없이 원본 프레임 시각과 재생 속도에 맞춰 프레임별 마감 시각을 지킴
+    playback_clock = None
+    was_paused = False
+    if is_test_video:
+        playback_clock = PlaybackClock(cap.get(cv2.CAP_PROP_FPS),
+                                       timestamps=rgb_seek_index.timestamps if rgb_seek_index else None)
+
     if is_live:
-        print(f"[실시간] 카메라 {video_source} 스트리밍 시작 (모델: {model_name}, 클라이언트: {sid})")
+        print(f"[실시간] 카메라 {video_source} 스트리밍 시작 (모델: {model_name}, 룸: {sid})")
         if cap:
             print(f"[실시간] 카메라 설정 - 해상도: {int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}, FPS: {cap.get(cv2.CAP_PROP_FPS)}")
     else:
         print(f"[시험 영상] 분석 시작: RGB={os.path.basename(rgb_path)}, TIR={os.path.basename(tir_path)}, 모델={model_name}, 클라이언트: {sid}")
 
+    cpu_scheduler = get_cpu_scheduler()
     with app.app_context():
-        while True:
-            # 시험 영상인 경우 제어 상태 확인
-            if is_test_video:
-                control_state = get_test_video_control(sid)
+        try:
+            cpu_scheduler.register_pipeline(stream_key)  # 활성 파이프라인 수에 맞춰 워커당 스레드 수 재분배
+            while True:
+                # 시험 영상인 경우 제어 상태 확인
+                if is_test_video:
+                    control_state = get_test_video_control(sid)
                 
-                # 시간 이동 요청 처리
-                if control_state.get('seek_time') is not None:
-                    seek_time = control_state['seek_time']
-                    video_fps = cap.get(cv2.CAP_PROP_FPS)
-                    if video_fps <= 0:
-                        video_fps = 30  # 기본값 설정
-                    
-                    seek_frame = int(seek_time * video_fps)
-                    print(f"[비디오 제어] 시간 이동 요청: {seek_time}초 -> {seek_frame}프레임 (FPS: {video_fps})")
+                    # 시간 이동 요청 처리
+                    if control_state.get('seek_time') is not None:
+                        seek_time = control_state['seek_time']
+                        seek_started = time.perf_counter()
+                        # 프레임 시각 인덱스로 목표 프레임을 찾고, 키프레임부터 디코딩하여 RGB/TIR를 같은 시각에 정렬
+                        seek_frame, seek_actual_time, decoded_frames = seek_pair(
+                            seek_time, cap, rgb_seek_index, tir_cap, tir_seek_index)
+                        box_propagator.reset()  # 이동 전 위치의 예측 박스를 새 위치에 표시하지 않음
+                        playback_clock.reset(seek_actual_time)  # 이동한 위치부터 마감 시각을 다시 계산
                     
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
-                    if tir_cap:
-                        tir_cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
-                    
-                    # 시간 이동 완료 후 seek_time 초기화
-                    test_video_controls[sid]['seek_time'] = None
-                    print(f"[비디오 제어] 시간 이동 실행 완료: {seek_time}초")
+                        # 시간 이동 완료 후 seek_time 초기화
+                        test_video_controls[sid]['seek_time'] = None
+                        print(f"[비디오 제어] 시간 이동 실행 완료: {seek_time}초 -> {seek_frame}프레임 ({seek_actual_time:.3f}초), "
+                              f"디코딩 {decoded_frames}프레임, {(time.perf_counter() - seek_started) * 1000:.1f}ms")
                 
-                # 일시정지 상태 확인
-                if control_state.get('is_paused', False):
-                    socketio.sleep(0.1)  # 일시정지 중에는 대기
-                    continue
+                    # 일시정지 상태 확인
+                    if control_state.get('is_paused', False):
+                        was_paused = True
+                        socketio.sleep(0.1)  # 일시정지 중에는 대기
+                        continue
+                    if was_paused:
+                        # 일시정지했던 시간만큼 늦은 것으로 보고 프레임을 건너뛰지 않도록 다음 프레임부터 기준점 재설정
+                        playback_clock.reset(playback_clock.media_time(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+                        was_paused = False
                 
-                # 재생 속도 적용 (FPS 조정)
-                playback_rate = control_state.get('playback_rate', 1.0)
-                base_fps = max(FPS, 60)  # 기본 FPS
-                adjusted_fps = base_fps * playback_rate
+                    # 재생 속도 적용 (원본 영상 FPS 기준 배속)
+                    playback_rate = control_state.get('playback_rate', 1.0)
+                    playback_clock.set_rate(playback_rate)
                 
-                # 배속 변경 시 로깅 (1회만)
-                last_logged_rate = control_state.get('_last_logged_rate')
-                if last_logged_rate != playback_rate:
-                    print(f"[비디오 제어] 재생 속도 적용: {playback_rate}x, 기본 FPS: {base_fps}, 조정된 FPS: {adjusted_fps}")
-                    test_video_controls[sid]['_last_logged_rate'] = playback_rate
-            else:
-                adjusted_fps = FPS
-            
-            ret, frame_rgb = cap.read()
-            if not ret:
-                if is_test_video: # 시험 영상이면 반복 재생
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    if tir_cap:
-                        tir_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    continue
-                break # 라이브 스트림이면 종료
-
-            # 현재 시간과 함께 프레임 저장
-            current_time = time.time()
-            frame_buffer.append((current_time, frame_rgb.copy()))
+                    # 배속 변경 시 로깅 (1회만)
+                    last_logged_rate = control_state.get('_last_logged_rate')
+                    if last_logged_rate != playback_rate:
+                        print(f"[비디오 제어] 재생 속도 적용: {playback_rate}x, 원본 FPS: {playback_clock.fps:.2f}, "
+                              f"목표 FPS: {playback_clock.fps * playback_clock.rate:.2f}")
+                        test_video_controls[sid]['_last_logged_rate'] = playback_rate
             
-            # 10초보다 오래된 프레임들을 버퍼에서 제거 (시간 기준)
-            # 여유를 두어 버퍼가 충분히 성장할 수 있도록 함 (12초 이상 시 제거)
-            buffer_cleanup_threshold = RECORD_SECONDS_BEFORE + 2.0  # 12초
-            buffer_time_limit = current_time - buffer_cleanup_threshold
-            removed_count = 0
-            while frame_buffer and frame_buffer[0][0] < buffer_time_limit:
-                frame_buffer.popleft()
-                removed_count += 1
+                if grabber:
+                    # 캡처 스레드가 보관한 최신 프레임 사용 (캡처 시점 타임스탬프 포함)
+                    grabbed = grabber.read()
+                    if grabbed is None:
+                        if not grabber.is_alive():
+                            break # 카메라 연결이 끊기면 종료
+                        socketio.sleep(0.005)  # 새 프레임이 올 때까지 허브에 양보
+                        continue
+                    frame_seq, current_time, frame_rgb = grabbed[:3]
+                    live_frame_tir = grabbed[3] if len(grabbed) > 3 else None  # RGB와 짝지어진 TIR 카메라 프레임
+                else:
+                    if playback_clock:
+                        # 이미 마감 시각을 넘긴 프레임은 grab()만 하고 건너뜀 (색 변환/추론/인코딩 생략)
+                        playback_clock.skip_late_frames(cap, tir_cap)
+                    ret, frame_rgb = cap.read()
+                    if not ret:
+                        if is_test_video: # 시험 영상이면 반복 재생
+                            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                            if tir_cap:
+                                tir_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                            playback_clock.reset(playback_clock.media_time(0))
+                            continue
+                        break # 라이브 스트림이면 종료
+
+                    # 현재 시간과 함께 프레임 저장
+                    current_time = time.time()
+                    if is_test_video:
+                        video_frame_index = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1  # 방금 읽은 프레임 번호
+                        playback_clock.present(playback_clock.media_time(video_frame_index))
+                if frame_buffer is None or frame_buffer.frame_shape != frame_rgb.shape:
+                    frame_buffer = create_frame_buffer(frame_rgb.shape)
+                    print(f"[버퍼] 링 버퍼 할당: {frame_buffer.capacity}프레임 ({frame_rgb.shape[1]}x{frame_rgb.shape[0]}), "
+                          f"메모리: {frame_buffer.nbytes() / 1024 / 1024:.1f}MB")
+                # 이전 + 이후 녹화 구간을 모두 담는 링에 기록 (이후 프레임도 같은 링에서 꺼내 씀)
+                # 'jpeg' 모드는 인코딩이 끝난 뒤 JPEG 바이트를 기록
+                if frame_buffer.mode == 'raw':
+                    if frame_buffer.write(current_time, frame_rgb) and current_recording is not None:
+                        current_recording['recorder'].append(current_time, frame_rgb)
             
-            # 주기적으로 버퍼 상태 로깅 (5초마다)
-            if len(frame_buffer) > 0 and int(current_time) % 5 == 0:
-                buffer_duration = current_time - frame_buffer[0][0]
-                estimated_fps = len(frame_buffer) / buffer_duration if buffer_duration > 0 else 0
-                cleanup_threshold = buffer_cleanup_threshold
-                ready_for_recording = buffer_duration >= (RECORD_SECONDS_BEFORE - 0.05)
-                print(f"[버퍼 상태] 시간 범위: {buffer_duration:.3f}초, 프레임 수: {len(frame_buffer)}, 실측 FPS: {estimated_fps:.1f}, 제거된 프레임: {removed_count}")
-                print(f"[버퍼 상태] 정리 기준: {cleanup_threshold:.1f}초, 녹화 준비: {'✅' if ready_for_recording else '❌'}")
+                # 주기적으로 버퍼 상태 로깅 (5초마다)
+                if len(frame_buffer) > 0 and int(current_time) % 5 == 0 and int(current_time) != last_status_log_time:
+                    last_status_log_time = int(current_time)
+                    buffer_stats = frame_buffer.stats()
+                    buffer_duration = buffer_stats['duration_seconds']
+                    estimated_fps = buffer_stats['frames'] / buffer_duration if buffer_duration > 0 else 0
+                    ready_for_recording = buffer_duration >= (RECORD_SECONDS_BEFORE - 0.05)
+                    print(f"[버퍼 상태] 시간 범위: {buffer_duration:.3f}초, 프레임 수: {buffer_stats['frames']}/{buffer_stats['capacity']}, 실측 FPS: {estimated_fps:.1f}, 메모리: {buffer_stats['memory_mb']:.1f}MB")
+                    print(f"[버퍼 상태] 고정 구간: {buffer_stats['pinned_ranges']}, 녹화 준비: {'✅' if ready_for_recording else '❌'}")
+                    stream_stats.setdefault(sid, {})['buffer'] = buffer_stats
+                    if current_model:
+                        stride_stats = stream_stats[sid]['inference'] = inference_stride.stats()
+                        print(f"[추론 상태] 간격: {stride_stats['stride']}프레임, 실효 추론 FPS: {stride_stats['effective_inference_fps']:.1f}, "
+                              f"추론: {stride_stats['inferences']}, 예측 표시: {stride_stats['propagated_frames']}")
+                    if playback_clock:
+                        playback_stats = stream_stats[sid]['playback'] = playback_clock.stats()
+                        print(f"[재생 시계] 요청 속도: {playback_stats['requested_rate']}x, 실제 속도: {playback_stats['achieved_rate']:.2f}x, "
+                              f"건너뛴 프레임: {playback_stats['skipped_frames']}, 기준점 재설정: {playback_stats['resyncs']}")
+                    if cache_segment is not None:
+                        cache_stats = stream_stats[sid]['detection_cache'] = cache_segment.stats()
+                        print(f"[탐지 캐시] 저장된 프레임: {cache_stats['frames']}, 적중: {cache_stats['hits']}, "
+                              f"미적중: {cache_stats['misses']} ({cache_stats['hit_ratio'] * 100:.1f}%)")
+                    if motion_gate:
+                        gate_stats = stream_stats[sid]['motion_gate'] = motion_gate.stats()
+                        print(f"[움직임 게이트] 검사: {gate_stats['checked']}, 변화: {gate_stats['motion_frames']}, "
+                              f"heartbeat: {gate_stats['heartbeats']}, 생략한 추론: {gate_stats['skipped_inferences']} "
+                              f"({gate_stats['skip_ratio'] * 100:.1f}%)")
+                    if grabber:
+                        capture_stats = grabber.stats()
+                        stream_stats[sid]['capture'] = capture_stats
+                        print(f"[캡처 상태] 캡처: {capture_stats['grabbed']}, 처리: {capture_stats['consumed']}, 폐기: {capture_stats['dropped']}")
+                        if live_tir_cap:
+                            print(f"[RGB/TIR 동기화] 짝: {capture_stats['paired']}, 짝 없는 RGB: {capture_stats['unmatched_rgb']}, "
+                                  f"짝 없는 TIR: {capture_stats['unmatched_tir']}, 시각 차이 평균 {capture_stats['skew_mean_ms']:.1f}ms "
+                                  f"(p95 {capture_stats['skew_abs_p95_ms']:.1f}ms, 최대 {capture_stats['skew_abs_max_ms']:.1f}ms)"
+                                  + (", TIR 끊김 - RGB로 대체 중" if not capture_stats['tir_alive'] else ""))
             
-            # 현재 진행 중인 녹화가 있으면 이후 프레임 수집
-            if current_recording is not None:
-                current_recording['post_event_frames'].append((current_time, frame_rgb.copy()))
-                
-                # 시간 기준으로 이후 10초 수집 완료 확인
-                time_elapsed = current_time - current_recording['event_timestamp']
-                if time_elapsed >= RECORD_SECONDS_AFTER:
-                    # 이후 프레임 수집 완료, 녹화 시작
-                    print(f"[녹화] 이후 {time_elapsed:.1f}초 프레임 수집 완료, 영상 생성 시작")
-                    
-                    # 시간 기준으로 정확한 20초 분량 추출
-                    start_time = current_recording['event_timestamp'] - RECORD_SECONDS_BEFORE
-                    end_time = current_recording['event_timestamp'] + RECORD_SECONDS_AFTER
-                    
-                    # 이전 프레임에서 시간 범위에 맞는 것들만 추출
-                    pre_frames = []
-                    for timestamp, frame in current_recording['pre_event_frames']:
-                        if start_time <= timestamp <= current_recording['event_timestamp']:
-                            pre_frames.append(frame)
-                    
-                    # 이후 프레임에서 시간 범위에 맞는 것들만 추출
-                    post_frames = []
-                    for timestamp, frame in current_recording['post_event_frames']:
-                        if current_recording['event_timestamp'] < timestamp <= end_time:
-                            post_frames.append(frame)
-                    
-                    # 최종 버퍼 생성
-                    final_buffer = pre_frames + post_frames
-                    
-                    # 실제 20초 분량이 되도록 정확한 FPS 계산
-                    if len(final_buffer) > 0:
-                        calculated_fps = len(final_buffer) / TOTAL_RECORD_SECONDS
-                        print(f"[녹화] 시간 기준 정확한 20초 분량 - 이전: {len(pre_frames)}프레임, 이후: {len(post_frames)}프레임, 총: {len(final_buffer)}프레임")
-                        print(f"[녹화] 계산된 FPS: {calculated_fps:.2f} (총 {len(final_buffer)}프레임 ÷ {TOTAL_RECORD_SECONDS}초)")
-                        
-                        # 별도 스레드에서 영상 저장하고 완료 시 DB 업데이트
-                        # 클로저로 현재 값들을 캡처
-                        original_filename = os.path.basename(current_recording['file_path'])
-                        event_file_id = current_recording['event_file_id']
-                        
-                        def video_save_callback(future):
-                            """영상 저장 완료 시 호출되는 콜백"""
-                            try:
-                                result_filename = future.result()
-                                if result_filename and result_filename != original_filename:
-                                    # 확장자가 변경된 경우에만 DB 업데이트
-                                    print(f"[영상 저장 완료] 파일명 변경 감지: {original_filename} -> {result_filename}")
-                                    socketio.start_background_task(
-                                        update_event_file_path, 
-                                        event_file_id, 
-                                        result_filename
-                                    )
-                                else:
-                                    print(f"[영상 저장 완료] 파일명 변경 없음: {result_filename}")
-                            except Exception as e:
-                                print(f"[영상 저장 콜백] 오류: {e}")
-                        
-                        # ThreadPoolExecutor를 사용해서 결과를 받을 수 있도록 함
-                        executor = ThreadPoolExecutor(max_workers=1)
-                        future = executor.submit(save_video_clip, final_buffer, current_recording['file_path'], calculated_fps)
-                        future.add_done_callback(video_save_callback)
+                # 현재 진행 중인 녹화가 있으면 이후 구간이 끝났는지 확인 (이후 프레임은 버퍼 기록 시 녹화기로 전달됨)
+                if current_recording is not None:
+                    # 시간 기준으로 이후 10초 수집 완료 확인
+                    time_elapsed = current_time - current_recording['event_timestamp']
+                    if time_elapsed >= RECORD_SECONDS_AFTER:
+                        recorder = current_recording['recorder']
+                        print(f"[녹화] 이후 {time_elapsed:.1f}초 프레임 전달 완료 (수신: {recorder.received_frames}프레임, "
+                              f"인코딩 대기: {recorder.pending_frames()}프레임), 파일 마무리 중")
+                        recorder.finish()
+                        current_recording = None
                     else:
-                        print(f"[녹화 실패] 수집된 프레임이 없습니다.")
-                    
-                    # 녹화 완료 처리
-                    current_recording = None
-                    print(f"[녹화] 20초 분량 영상 저장 스레드 시작됨")
-                else:
-                    # 진행률 출력 (2초마다)
-                    if int(time_elapsed) % 2 == 0 and time_elapsed != current_recording.get('last_progress_time', -1):
-                        current_recording['last_progress_time'] = time_elapsed
-                        progress = min(time_elapsed / RECORD_SECONDS_AFTER * 100, 100)
-                        print(f"[녹화 진행] 이후 프레임 수집 중: {time_elapsed:.1f}/{RECORD_SECONDS_AFTER}초 ({progress:.1f}%)")
+                        # 진행률 출력 (2초마다)
+                        if int(time_elapsed) % 2 == 0 and time_elapsed != current_recording.get('last_progress_time', -1):
+                            current_recording['last_progress_time'] = time_elapsed
+                            progress = min(time_elapsed / RECORD_SECONDS_AFTER * 100, 100)
+                            print(f"[녹화 진행] 이후 프레임 기록 중: {time_elapsed:.1f}/{RECORD_SECONDS_AFTER}초 ({progress:.1f}%)")
             
-            # TIR 프레임 처리
-            if tir_cap:
-                ret_tir, frame_tir = tir_cap.read()
-                if ret_tir:
-                    frame_tir_gray = cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)
-                else: # TIR 영상 프레임이 없으면 RGB로 변환
+                # TIR 프레임 처리
+                if live_frame_tir is not None:
+                    frame_tir_gray = live_frame_tir if live_frame_tir.ndim == 2 else cv2.cvtColor(live_frame_tir, cv2.COLOR_BGR2GRAY)
+                elif tir_cap:
+                    ret_tir, frame_tir = tir_cap.read()
+                    if ret_tir:
+                        # 미리 디코딩된 TIR 프레임은 이미 그레이스케일
+                        frame_tir_gray = frame_tir if frame_tir.ndim == 2 else cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)
+                    else: # TIR 영상 프레임이 없으면 RGB로 변환
+                        frame_tir_gray = transform_rgb_to_tir(frame_rgb)
+                else: # TIR 영상이 없으면 RGB로 변환
                     frame_tir_gray = transform_rgb_to_tir(frame_rgb)
-            else: # TIR 영상이 없으면 RGB로 변환
-                frame_tir_gray = transform_rgb_to_tir(frame_rgb)
             
-            # AI 모델 입력 데이터 준비
-            annotated_frame_rgb = frame_rgb.copy()
-            annotated_frame_tir = cv2.cvtColor(frame_tir_gray, cv2.COLOR_GRAY2BGR)
+                # AI 모델 입력 데이터 준비
+                annotated_frame_rgb = frame_rgb  # 그리기는 복사본에 하므로 탐지가 없거나 클라이언트 표시 모드이면 원본을 그대로 인코딩
+                annotated_frame_tir = cv2.cvtColor(frame_tir_gray, cv2.COLOR_GRAY2BGR)
             
-            is_person_detected = False
+                is_person_detected = False
+                detection_count = 0
+                display_detections = None
             
-            if current_model:
-                frame_tir_gray_reshaped = np.expand_dims(frame_tir_gray, axis=-1)
-                input_data = np.concatenate((frame_rgb, frame_tir_gray_reshaped), axis=-1)
-                results = current_model.track(input_data, verbose=False, persist=True)
+                if current_model:
+                    results = None
+                    detections = None
+                    is_real_detection = False
+                    if cache_segment is not None:
+                        detections = cache_segment.get(video_frame_index)  # 이전에 분석한 프레임이면 모델 실행 생략
+                    # 정적인 장면(TIR 변화 없음)이면 모델 실행 생략, 변화가 있을 때만 추론 간격에 따라 실행
+                    scene_active = detections is None and (motion_gate is None or motion_gate.should_infer(
+                        frame_tir_gray, current_time, has_detections=bool(last_detection_count)))
+                    if scene_active and inference_stride.should_infer():
+                        if fusion_preprocessor is not None:
+                            # 미리 할당한 NCHW 텐서에 모델 입력 크기로 바로 기록 (원본 해상도 4채널 배열을 만들지 않음)
+                            input_data = fusion_preprocessor(frame_rgb, frame_tir_gray)
+                        else:
+                            frame_tir_gray_reshaped = np.expand_dims(frame_tir_gray, axis=-1)
+                            input_data = np.concatenate((frame_rgb, frame_tir_gray_reshaped), axis=-1)
+                        # 추론은 워커 스레드에서 실행되며, 이 greenlet만 결과를 기다림
+                        if batch_server:
+                            results = batch_server.infer(stream_key, input_data)
+                        else:
+                            results = inference_executor.run(current_model.track, input_data, verbose=False, persist=True)
+                    if results is not None:
+                        # 탐지 결과 전체를 프레임당 한 번만 NumPy 배열로 가져와 표시/이벤트 판단에 공통으로 사용
+                        detections = Detections.from_results(results)
+                        if fusion_preprocessor is not None:
+                            fusion_preprocessor.to_frame_coords(detections)  # letterbox 좌표 → 원본 프레임 좌표
+                        if cache_segment is not None:
+                            cache_segment.put(video_frame_index, detections)
+                        inference_stride.record_inference(current_time)
+                        cpu_scheduler.record_inference(stream_key, current_time)
+                        is_real_detection = True
+                    if detections is None:
+                        # 추론 간격으로 건너뛴 프레임 또는 추론 대기열이 가득 찬 경우:
+                        # 마지막 실제 탐지에서 예측한 박스만 표시하고 이벤트 판단에서는 제외
+                        detections = box_propagator.predict(current_time)
+                        event_candidates = []
+                    else:
+                        # 실제 추론 결과와 캐시된 결과는 같은 방식으로 표시/이벤트 판단
+                        box_propagator.update(detections, current_time)
+                        last_detection_count = len(detections.above(BBOX_DISPLAY_THRESHOLD))
+                        event_candidates = detections.event_candidates(PERSON_CONFIDENCE_THRESHOLD, ANIMAL_CONFIDENCE_THRESHOLD)
+                        last_person_detected = any(is_person for _, _, is_person in event_candidates)
+                    if cache_segment is not None and is_real_detection:
+                        detection_cache.maybe_flush(cache_segment)
+                    if inference_stride.adapt(inference_executor.is_backed_up(), current_time):
+                        print(f"[추론 간격] {sid} 추론 대기열 상태에 따라 간격 변경: {inference_stride.stride}프레임마다 추론")
                 
-                annotated_frame_rgb = draw_detections_on_frame(frame_rgb, results, BBOX_DISPLAY_THRESHOLD)
-                annotated_frame_tir = draw_detections_on_frame(annotated_frame_tir, results, BBOX_DISPLAY_THRESHOLD)
+                    display_detections = detections.above(BBOX_DISPLAY_THRESHOLD)
+                    if not client_overlay:
+                        annotated_frame_rgb = draw_detections(frame_rgb, display_detections)
+                        annotated_frame_tir = draw_detections(annotated_frame_tir, display_detections)
+                    detection_count = len(display_detections)
                 
-                # 이벤트 발생 조건 확인
-                names = results[0].names
-                for r in results:
-                    for box in r.boxes:
-                        confidence = float(box.conf[0])
-                        detected_class_name = names[int(box.cls[0])]
-
-                        is_person = detected_class_name == 'person' and confidence >= PERSON_CONFIDENCE_THRESHOLD
-                        is_animal = detected_class_name in ['scrofa', 'inermis'] and confidence >= ANIMAL_CONFIDENCE_THRESHOLD
-
-                        if is_person or is_animal:
-                            is_person_detected = is_person # UI 경고용 플래그
-
-                            # DB 이벤트 생성 (라이브 모드 & 쿨다운 통과 시)
-                            if is_live and (time.time() - last_event_time > event_cooldown):
-                                last_event_time = time.time()
-                                detected_object_type = 'person' if is_person else detected_class_name
+                    # 이벤트 발생 조건 확인 (실제 탐지에서 임계값을 넘은 사람/동물만 원래 순서대로 확인)
+                    is_person_detected = last_person_detected # UI 경고용 플래그 (건너뛴 프레임은 마지막 실제 탐지 기준)
+                    for confidence, detected_class_name, is_person in event_candidates:
+                        # DB 이벤트 생성 (라이브 모드 & 쿨다운 통과 시)
+                        if is_live and (time.time() - last_event_time > event_cooldown):
+                            last_event_time = time.time()
+                            detected_object_type = 'person' if is_person else detected_class_name
                                 
-                                event_timestamp = time.time()  # 이벤트 발생 정확한 시간
-                                print(f"[{detected_object_type} 탐지] 카메라 {camera_id_for_db}에서 이벤트 발생. confidence: {confidence:.2f}")
+                            event_timestamp = time.time()  # 이벤트 발생 정확한 시간
+                            print(f"[{detected_object_type} 탐지] 카메라 {camera_id_for_db}에서 이벤트 발생. confidence: {confidence:.2f}")
                                 
-                                # 시간 기반 버퍼 검증: 10초 미만의 데이터가 있으면 녹화를 무시
-                                if not frame_buffer:
-                                    print(f"[녹화 무시] 버퍼가 비어있습니다.")
-                                    continue
+                            # 시간 기반 버퍼 검증: 10초 미만의 데이터가 있으면 녹화를 무시
+                            if not frame_buffer or frame_buffer.oldest_timestamp() is None:
+                                print(f"[녹화 무시] 버퍼가 비어있습니다.")
+                                continue
                                 
-                                # 가장 오래된 프레임과 이벤트 시간의 차이 확인
-                                oldest_frame_time = frame_buffer[0][0]
-                                buffer_duration = event_timestamp - oldest_frame_time
+                            # 가장 오래된 프레임과 이벤트 시간의 차이 확인
+                            oldest_frame_time = frame_buffer.oldest_timestamp()
+                            buffer_duration = event_timestamp - oldest_frame_time
                                 
-                                # 부동소수점 정밀도 문제를 고려하여 0.05초 여유를 둠
-                                required_duration = RECORD_SECONDS_BEFORE - 0.05
+                            # 부동소수점 정밀도 문제를 고려하여 0.05초 여유를 둠
+                            required_duration = RECORD_SECONDS_BEFORE - 0.05
                                 
-                                print(f"[녹화 검증] 버퍼 시간: {buffer_duration:.3f}초, 필요: {RECORD_SECONDS_BEFORE}초 (최소: {required_duration:.3f}초)")
+                            print(f"[녹화 검증] 버퍼 시간: {buffer_duration:.3f}초, 필요: {RECORD_SECONDS_BEFORE}초 (최소: {required_duration:.3f}초)")
                                 
-                                if buffer_duration < required_duration:
-                                    print(f"[녹화 무시] 버퍼에 충분한 시간 데이터가 없습니다. 현재: {buffer_duration:.3f}초, 최소 필요: {required_duration:.3f}초")
-                                    continue
+                            if buffer_duration < required_duration:
+                                print(f"[녹화 무시] 버퍼에 충분한 시간 데이터가 없습니다. 현재: {buffer_duration:.3f}초, 최소 필요: {required_duration:.3f}초")
+                                continue
                                 
-                                print(f"[녹화 시작] 이벤트 발생 시점(timestamp: {event_timestamp:.3f}) 기준 이전 {RECORD_SECONDS_BEFORE}초 + 이후 {RECORD_SECONDS_AFTER}초 녹화를 시작합니다.")
-                                print(f"[녹화] 버퍼 시간 범위: {buffer_duration:.1f}초, 프레임 수: {len(frame_buffer)}개")
+                            print(f"[녹화 시작] 이벤트 발생 시점(timestamp: {event_timestamp:.3f}) 기준 이전 {RECORD_SECONDS_BEFORE}초 + 이후 {RECORD_SECONDS_AFTER}초 녹화를 시작합니다.")
+                            print(f"[녹화] 버퍼 시간 범위: {buffer_duration:.1f}초, 프레임 수: {len(frame_buffer)}개")
                                 
-                                camera = Camera.query.get(int(camera_id_for_db))
-                                if not camera: # 예외 처리: 카메라가 DB에 없는 경우
-                                    print(f"경고: DB에서 카메라 ID {int(camera_id_for_db)}을 찾을 수 없습니다.")
-                                    continue
-
-                                new_event = DetectionEvent(camera_id=camera.id, detected_object=detected_object_type, confidence=confidence, user_id_on_duty=user_id)
-                                db.session.add(new_event)
-                                db.session.commit()
+                            camera = Camera.query.get(int(camera_id_for_db))
+                            if not camera: # 예외 처리: 카메라가 DB에 없는 경우
+                                print(f"경고: DB에서 카메라 ID {int(camera_id_for_db)}을 찾을 수 없습니다.")
+                                continue
+
+                            new_event = DetectionEvent(camera_id=camera.id, detected_object=detected_object_type, confidence=confidence, user_id_on_duty=user_id)
+                            db.session.add(new_event)
+                            db.session.commit()
                                 
-                                timestamp_str = datetime.fromtimestamp(event_timestamp).strftime("%Y%m%d_%H%M%S")
-                                filename = f"event_{timestamp_str}_cam{camera_id_for_db}.mp4"
-                                recordings_base_path = os.path.join(app.root_path, '..', RECORDINGS_FOLDER)
-                                file_path = os.path.join(recordings_base_path, filename)
-
-                                new_event_file = EventFile(event_id=new_event.id, file_type='video_rgb', file_path=filename)
-                                db.session.add(new_event_file)
-                                db.session.commit()
+                            timestamp_str = datetime.fromtimestamp(event_timestamp).strftime("%Y%m%d_%H%M%S")
+                            filename = f"event_{timestamp_str}_cam{camera_id_for_db}.mp4"
+                            recordings_base_path = os.path.join(app.root_path, '..', RECORDINGS_FOLDER)
+                            file_path = os.path.join(recordings_base_path, filename)
+
+                            new_event_file = EventFile(event_id=new_event.id, file_type='video_rgb', file_path=filename)
+                            db.session.add(new_event_file)
+                            db.session.commit()
                                 
-                                socketio.emit('new_event', new_event.to_dict())
+                            socketio.emit('new_event', new_event.to_dict())
                                 
-                                # 시간 기반 녹화 로직: 이전 10초 + 이후 10초
-                                current_recording = {
-                                    'file_path': file_path,
-                                    'event_timestamp': event_timestamp,  # 이벤트 발생 정확한 시간
-                                    'pre_event_frames': list(frame_buffer),  # 이벤트 이전 프레임들 (timestamp, frame) 튜플들
-                                    'post_event_frames': [],  # 이벤트 이후 프레임들
-                                    'start_time': event_timestamp,
-                                    'last_progress_time': -1,  # 진행률 출력 중복 방지용
-                                    'event_file_id': new_event_file.id  # DB 업데이트용 ID
-                                }
+                            # 시간 기반 녹화 로직: 이전 10초 + 이후 10초
+                            # 이벤트 이전 10초부터의 링 버퍼 구간을 고정하여 녹화기가 복사 없이 기록
+                            record_start = event_timestamp - RECORD_SECONDS_BEFORE
+                            pin_id = frame_buffer.pin(record_start)
+                            pre_frames = frame_buffer.view(record_start, event_timestamp)
+                            pre_frame_count = len(pre_frames)
+                            if pre_frame_count > 0:
+                                pre_duration = event_timestamp - float(pre_frames.timestamps[0])
+                                print(f"[녹화] 이전 프레임 {pre_frame_count}개 수집 완료 (시간 범위: {pre_duration:.1f}초), 이후 {RECORD_SECONDS_AFTER}초 프레임은 도착하는 대로 인코딩")
+                            else:
+                                print(f"[녹화] 이전 프레임 없음, 이후 {RECORD_SECONDS_AFTER}초 프레임은 도착하는 대로 인코딩")
                                 
-                                # 이전 프레임 통계
-                                pre_frame_count = len(current_recording['pre_event_frames'])
-                                if pre_frame_count > 0:
-                                    pre_duration = event_timestamp - current_recording['pre_event_frames'][0][0]
-                                    print(f"[녹화] 이전 프레임 {pre_frame_count}개 수집 완료 (시간 범위: {pre_duration:.1f}초), 이후 {RECORD_SECONDS_AFTER}초 프레임 수집 시작")
+                            # 녹화 FPS는 이전 구간의 실제 저장 속도로 고정 (이후 프레임은 타임스탬프에 맞춰 배치)
+                            record_fps = pre_frame_count / RECORD_SECONDS_BEFORE if pre_frame_count > 0 else FRAME_BUFFER_MAX_FPS
+                            original_filename = os.path.basename(file_path)
+                            event_file_id = new_event_file.id
+                            recording_buffer = frame_buffer
+                                
+                            def on_recording_complete(result_filename, original_filename=original_filename,
+                                                      event_file_id=event_file_id):
+                                """녹화 파일 마무리 시 호출되는 콜백 (녹화 스레드에서 실행)"""
+                                if result_filename and result_filename != original_filename:
+                                    # 확장자가 변경된 경우에만 DB 업데이트
+                                    print(f"[영상 저장 완료] 파일명 변경 감지: {original_filename} -> {result_filename}")
+                                    socketio.start_background_task(
+                                        update_event_file_path, 
+                                        event_file_id, 
+                                        result_filename
+                                    )
                                 else:
-                                    print(f"[녹화] 이전 프레임 없음, 이후 {RECORD_SECONDS_AFTER}초 프레임 수집 시작")
-                                break # 한 이벤트에 대해 한 번만 처리
-                    if is_person_detected:
-                        break
-
-            # 프레임 인코딩 및 전송
-            _, buffer_rgb = cv2.imencode('.jpg', annotated_frame_rgb)
-            _, buffer_tir = cv2.imencode('.jpg', annotated_frame_tir)
-            rgb_b64 = base64.b64encode(buffer_rgb).decode('utf-8')
-            tir_b64 = base64.b64encode(buffer_tir).decode('utf-8')
+                                    print(f"[영상 저장 완료] 파일명 변경 없음: {result_filename}")
+                                
+                            current_recording = {
+                                'file_path': file_path,
+                                'event_timestamp': event_timestamp,  # 이벤트 발생 정확한 시간
+                                'start_time': event_timestamp,
+                                'last_progress_time': -1,  # 진행률 출력 중복 방지용
+                                'event_file_id': event_file_id,  # DB 업데이트용 ID
+                                'recorder': ClipRecorder(
+                                    file_path, record_start, record_fps, pre_frames,
+                                    on_complete=on_recording_complete,
+                                    # 이전 구간 기록이 끝나면 링 버퍼 구간 고정 해제
+                                    on_pre_flushed=lambda pin_id=pin_id: recording_buffer.unpin(pin_id),
+                                ),
+                            }
+                            break # 한 이벤트에 대해 한 번만 처리
+
+                # 프레임 인코딩 및 전송
+                _, buffer_rgb = cv2.imencode('.jpg', annotated_frame_rgb)
+                _, buffer_tir = cv2.imencode('.jpg', annotated_frame_tir)
+                
+                # 'jpeg' 버퍼 모드: 전송용으로 인코딩한 바이트를 녹화 버퍼에 재사용 (원본 모드는 저장 차례일 때만 추가 인코딩)
+                if frame_buffer.mode == 'jpeg' and frame_buffer.wants(current_time):
+                    if FRAME_BUFFER_JPEG_SOURCE == 'annotated' or annotated_frame_rgb is frame_rgb:
+                        buffered_jpeg = buffer_rgb
+                    else:
+                        _, buffered_jpeg = cv2.imencode('.jpg', frame_rgb)
+                    if frame_buffer.write(current_time, buffered_jpeg) and current_recording is not None:
+                        current_recording['recorder'].append(current_time, buffered_jpeg)
+                sent_seq += 1
             
-            # 시험 영상인 경우 현재 시간과 길이 정보 추가
-            frame_data = {
-                'rgb': rgb_b64,
-                'tir': tir_b64,
-                'camera_id': 'test_video' if is_test_video else camera_id_for_db,
-                'person_detected': is_person_detected
-            }
+                # 이미지는 JPEG 바이트 그대로 두고 메타데이터만 헤더로 구성 (base64 변환은 구버전 구독자가 있을 때만)
+                # 시험 영상인 경우 현재 시간과 길이 정보 추가
+                frame_data = {
+                    'camera_id': 'test_video' if is_test_video else camera_id_for_db,
+                    'seq': sent_seq,
+                    'person_detected': is_person_detected,
+                    'detection_count': detection_count,
+                    'overlay': 'client' if client_overlay else 'server'
+                }
+                if client_overlay:
+                    # 클라이언트가 원본 프레임 위에 직접 그리도록 탐지 결과를 압축 배열로 함께 전송
+                    frame_data.update({
+                        'detections': display_detections.to_array() if display_detections is not None else [],
+                        'class_names': display_detections.class_names() if display_detections is not None else [],
+                        'frame_size': [frame_rgb.shape[1], frame_rgb.shape[0]]
+                    })
+                if grabber:
+                    frame_data.update({
+                        'capture_timestamp': current_time,
+                        'dropped_frames': grabber.dropped_count
+                    })
             
-            if is_test_video:
-                current_frame = cap.get(cv2.CAP_PROP_POS_FRAMES)
-                total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                video_fps = cap.get(cv2.CAP_PROP_FPS)
+                if is_test_video:
+                    # 현재 시간은 지금 보내는 프레임의 실제 영상 시각 (다음에 읽을 프레임 번호/FPS 추정이 아님)
+                    total_frames = rgb_seek_index.frame_count if rgb_seek_index else cap.get(cv2.CAP_PROP_FRAME_COUNT)
+                    total_duration = rgb_seek_index.duration if rgb_seek_index else total_frames / playback_clock.fps
                 
-                if video_fps > 0:
-                    current_time = current_frame / video_fps
-                    total_duration = total_frames / video_fps
+                    frame_data.update({
+                        'current_time': playback_clock.position,
+                        'duration': total_duration,
+                        'current_frame': video_frame_index,
+                        'total_frames': total_frames,
+                        'playback_rate': playback_clock.rate,
+                        'achieved_rate': playback_clock.achieved_rate()
+                    })
+            
+                frame_packet = make_frame_packet(frame_data, buffer_rgb, buffer_tir)
+                if is_live:
+                    emit_room_frame(frame_packet, sid)
+                    latest_frames[sid] = frame_packet
+                else:
+                    deliver(frame_packet, test_flow)
+                cpu_scheduler.record_frame(stream_key, current_time)
+                if grabber:
+                    socketio.sleep(0)  # 실시간은 캡처 속도가 곧 처리 속도이므로 양보만 함
                 else:
-                    current_time = 0
-                    total_duration = 0
+                    # 다음 프레임의 마감 시각까지만 대기 (처리에 걸린 시간은 대기 시간에서 자동으로 빠짐)
+                    socketio.sleep(playback_clock.wait_seconds(playback_clock.media_time(cap.get(cv2.CAP_PROP_POS_FRAMES))))
+        finally:
+            # 5. 종료 처리 --- (task.kill()로 greenlet이 종료되어도 캡처 스레드와 장치를 반드시 해제)
+            try:
+                cpu_scheduler.unregister_pipeline(stream_key)
+                if cache_segment is not None:
+                    detection_cache.close(cache_segment)  # 이번 재생에서 분석한 프레임을 디스크에 저장
+                if current_recording is not None:
+                    # 스트림이 중간에 끊겨도 지금까지 전달된 프레임으로 녹화 파일을 마무리
+                    current_recording['recorder'].finish()
+                if batch_server:
+                    batch_server.release_stream(stream_key)
+                if shared_model:
+                    get_model_registry().release(shared_model)
+                latest_frames.pop(sid, None)
+                stream_stats.pop(sid, None)
+                if grabber:
+                    grabber.stop()
+                    grabber_stats = grabber.stats()
+                    print(f"[정리] 캡처 스레드 종료 - 캡처: {grabber_stats['grabbed']}, 폐기: {grabber_stats['dropped']}")
+                if cap:
+                    cap.release()
+                    print(f"[정리] 카메라/비디오 캡처 해제 완료")
+                if tir_cap:
+                    tir_cap.release()
+                    print(f"[정리] TIR 비디오 캡처 해제 완료")
+                if live_tir_cap:
+                    live_tir_cap.release()
+                    print(f"[정리] TIR 카메라 캡처 해제 완료")
                 
-                frame_data.update({
-                    'current_time': current_time,
-                    'duration': total_duration,
-                    'current_frame': current_frame,
-                    'total_frames': total_frames
-                })
-            
-            socketio.emit('video_frame', frame_data, room=sid)
-            socketio.sleep(1 / adjusted_fps)
-
-    # 5. 종료 처리 ---
-    try:
-        if cap:
-            cap.release()
-            print(f"[정리] 카메라/비디오 캡처 해제 완료")
-        if tir_cap:
-            tir_cap.release()
-            print(f"[정리] TIR 비디오 캡처 해제 완료")
-        
-        # 시험 영상 제어 상태 정리
-        if is_test_video:
-            clear_test_video_control(sid)
-        
-        if is_live:
-            print(f"[실시간] 카메라 {video_source} 스트리밍 스레드 종료 (클라이언트: {sid})")
-        else:
-            print(f"[시험 영상] 분석 스레드 종료 (RGB: {os.path.basename(rgb_path)}, 클라이언트: {sid})")
-    except Exception as e:
-        print(f"[정리] 스레드 종료 중 오류 발생: {e}")
-    finally:
-        # 강제로 모든 OpenCV 창 닫기 (Windows에서 필요할 수 있음)
-        try:
-            cv2.destroyAllWindows()
-        except:
-            pass
\ No newline at end of file
+                # 시험 영상 제어 상태 정리
+                if is_test_video:
+                    clear_test_video_control(sid)
+                    remove_subscriber(sid, sid)
+                
+                if is_live:
+                    print(f"[실시간] 카메라 {video_source} 스트리밍 스레드 종료 (룸: {sid})")
+                else:
+                    print(f"[시험 영상] 분석 스레드 종료 (RGB: {os.path.basename(rgb_path)}, 클라이언트: {sid})")
+            except Exception as e:
+                print(f"[정리] 스레드 종료 중 오류 발생: {e}")
+            finally:
+                # 강제로 모든 OpenCV 창 닫기 (Windows에서 필요할 수 있음)
+                try:
+                    cv2.destroyAllWindows()
+                except:
+                    pass
@@ -5,13 +5,15 @@ from flask import current_app, request
 from flask_socketio import emit
 from ..extensions import socketio
 from ..services.video_service import start_video_processing
+from ..services import pipeline_service
 import logging
 import eventlet
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 수정: 클라이언트(sid)별로 여러 비디오 작업(camera_id: task)을 저장하도록 구조 변경
+# 클라이언트(sid)별 시험 영상 분석 작업 저장 ('test_video': task)
+# 실시간 카메라는 카메라 ID별 파이프라인(pipeline_service)으로 관리하여 여러 클라이언트가 공유
 video_tasks = {}
 
 @socketio.on('connect')
@@ -25,6 +27,9 @@ def handle_disconnect():
     client_sid = request.sid
     logger.info(f"클라이언트 연결 끊어짐: {client_sid}")
     
+    # 카메라 파이프라인 구독 해제 (마지막 구독자였다면 유예 시간 후 파이프라인 종료)
+    pipeline_service.unsubscribe_all(client_sid)
+    
     # 해당 클라이언트가 실행 중인 모든 비디오 작업을 종료
     if client_sid in video_tasks:
         # 사전 변경 중 반복 오류 방지를 위해 복사본 사용
@@ -62,7 +67,7 @@ def handle_start_stream(data):
         emit('error', {'message': 'Camera ID is required.'}, room=client_sid)
         return
 
-    if client_sid in video_tasks and camera_id in video_tasks.get(client_sid, {}):
+    if camera_id in pipeline_service.get_subscriptions(client_sid):
         logger.warning(f"Camera {camera_id} is already streaming for client {client_sid}")
         return
 
@@ -89,16 +94,14 @@ def handle_start_stream(data):
         'model': model_name,
         'user_id': user_id,
         'is_live_stream': True,
-        'is_multi_spectral': 'fusion' in model_name # 모델 이름에 'fusion'이 있으면 다중 스펙트럼으로 간주
+        'is_multi_spectral': 'fusion' in model_name, # 모델 이름에 'fusion'이 있으면 다중 스펙트럼으로 간주
+        'transport': data.get('transport'), # 'binary'이면 바이너리 프레임, 없으면 기존 base64 프레임
+        'ack': bool(data.get('ack')), # True이면 프레임마다 ack로 응답하는 클라이언트 (흐름 제어 적용)
+        'overlay': data.get('overlay') # 'client'이면 탐지 결과를 배열로 보내고 대시보드에서 그림 (첫 구독자 기준)
     }
 
-    task = eventlet.spawn(
-        start_video_processing,
-        current_app._get_current_object(),
-        client_sid,
-        stream_config
-    )
-    video_tasks[client_sid][camera_id] = task
+    # 카메라별 파이프라인에 구독 (첫 구독자이면 파이프라인이 시작되고, 이후 구독자는 같은 프레임을 공유)
+    pipeline_service.subscribe(current_app._get_current_object(), client_sid, stream_config)
 
 @socketio.on('stop_stream')
 def handle_stop_stream(data):
@@ -108,13 +111,8 @@ def handle_stop_stream(data):
     if camera_id is None:
         return
 
-    if client_sid in video_tasks and camera_id in video_tasks[client_sid]:
-        task = video_tasks[client_sid].pop(camera_id)
-        task.kill()
-        # 작업이 완전히 종료될 때까지 짧게 대기
-        import time
-        time.sleep(0.1)
-        logger.info(f"[실시간 스트림 중지] 사용자 요청으로 카메라 {camera_id} 스트리밍 중지: {client_sid}")
+    if pipeline_service.unsubscribe(client_sid, camera_id):
+        logger.info(f"[실시간 스트림 중지] 사용자 요청으로 카메라 {camera_id} 구독 해제: {client_sid}")
         emit('response', {'message': f'카메라 {camera_id} 스트리밍을 중지합니다.'})
     else:
         logger.warning(f"[실시간 스트림 중지] 중지할 스트리밍 작업이 없습니다: camera_id={camera_id}, client={client_sid}")
@@ -163,7 +161,9 @@ def handle_start_test_stream(data):
         'tir_path': tir_path,
         'model': model_name,
         'is_live_stream': False,
-        'is_multi_spectral': bool(tir_path) # TIR 경로가 있으면 다중 스펙트럼으로 간주
+        'is_multi_spectral': bool(tir_path), # TIR 경로가 있으면 다중 스펙트럼으로 간주
+        'transport': data.get('transport'),
+        'ack': bool(data.get('ack'))
     }
     
     task = eventlet.spawn(
@@ -0,0 +1,85 @@
+# /backend/benchmarks/attention_benchmark.py
+"""C2PSA Attention 연산 구현별 속도/메모리 비교
+
+C2PSA가 쓰이는 마지막 특징맵(stride 32) 크기를 입력 크기(imgsz)별로 만들어 eager(N x N 행렬 전체 생성),
+sdpa(torch scaled_dot_product_attention), chunked(query 분할) 구현의 프레임당 시간을 측정합니다.
+메모리는 attention 점수 행렬의 크기(GPU에서는 실제 최고 사용량)로 비교합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/attention_benchmark.py [--sizes 640 960 1280 1600 1920] [--repeats 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.custom_classes import (  # noqa: E402
+    ATTENTION_CHUNK_SIZE, ATTENTION_IMPLS, Attention, configure_attention,
+)
+
+FEATURE_STRIDE = 32  # C2PSA는 backbone 마지막(P5) 특징맵에서 동작
+
+
+def score_matrix_bytes(impl, batch, heads, n):
+    """구현별 attention 점수 행렬 크기 (sdpa는 fused 커널이라 행렬을 만들지 않음)"""
+    if impl == 'eager':
+        return batch * heads * n * n * 4
+    if impl == 'chunked':
+        return batch * heads * min(ATTENTION_CHUNK_SIZE, n) * n * 4
+    return 0
+
+
+def measure(module, x, repeats, device):
+    with torch.no_grad():
+        for _ in range(2):
+            module(x)
+        if device.type == 'cuda':
+            torch.cuda.synchronize()
+            torch.cuda.reset_peak_memory_stats()
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            module(x)
+            if device.type == 'cuda':
+                torch.cuda.synchronize()
+            times.append(time.perf_counter() - started)
+    peak = torch.cuda.max_memory_allocated() if device.type == 'cuda' else None
+    return statistics.median(times) * 1000, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attention 구현 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[640, 960, 1280, 1600, 1920])
+    parser.add_argument('--dim', type=int, default=128, help='C2PSA 내부 채널 수 (yolo11n: 128)')
+    parser.add_argument('--heads', type=int, default=2)
+    parser.add_argument('--batch', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    module = Attention(args.dim, num_heads=args.heads).to(device).eval()
+    print(f"[Attention 벤치마크] 장치: {device}, 채널: {args.dim}, 헤드: {args.heads}, 배치: {args.batch}, "
+          f"chunk: {ATTENTION_CHUNK_SIZE}")
+    print(f"  {'imgsz':>6} {'N':>6} {'구현':<8} {'시간(ms)':>10} {'eager 대비':>10} {'점수 행렬(MB)':>14} {'GPU 최고(MB)':>13}")
+
+    for size in args.sizes:
+        side = size // FEATURE_STRIDE
+        n = side * side
+        x = torch.randn(args.batch, args.dim, side, side, device=device)
+        eager_ms = None
+        for impl in ATTENTION_IMPLS:
+            configure_attention(module, impl)
+            ms, peak = measure(module, x, args.repeats, device)
+            eager_ms = eager_ms or ms
+            peak_text = f"{peak / 1024 / 1024:.1f}" if peak is not None else '-'
+            print(f"  {size:>6} {n:>6} {impl:<8} {ms:>10.2f} {eager_ms / ms:>9.2f}x "
+                  f"{score_matrix_bytes(impl, args.batch, args.heads, n) / 1024 / 1024:>14.1f} {peak_text:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# /backend/benchmarks/attention_parity_check.py
+"""C2PSA Attention 구현(sdpa, chunked)과 기존 eager 구현의 출력 일치 확인
+
+1. 임의 가중치의 Attention 모듈로 여러 특징맵 크기/배치에서 구현별 출력을 eager와 비교
+2. models_ai/의 체크포인트가 있으면 같은 체크포인트를 로드한 전체 모델 출력을 구현별로 비교
+   (가중치 구조가 바뀌지 않아 기존 체크포인트가 그대로 로드되는지도 함께 확인)
+허용 오차를 넘는 차이가 있으면 종료 코드 1을 반환합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/attention_parity_check.py [--model yolo11n_early_fusion_fin.pt] [--atol 1e-4]
+"""
+
+import argparse
+import os
+import sys
+
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.custom_classes import (  # noqa: E402
+    ATTENTION_CHUNK_SIZE, ATTENTION_IMPLS, Attention, Silence, SilenceChannel, configure_attention,
+)
+from app.services.settings_service import get_setting  # noqa: E402
+
+MODELS_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'models_ai')
+# chunk 경계를 지나는 크기(N > ATTENTION_CHUNK_SIZE)와 나누어 떨어지지 않는 크기를 포함
+FEATURE_SIZES = [(8, 8), (20, 20), (33, 35), (48, 48)]
+
+
+def compare(outputs, atol, label):
+    """eager 출력 대비 구현별 최대 오차 출력, 허용 오차 이내인지 반환"""
+    reference = outputs['eager']
+    passed = True
+    for impl, output in outputs.items():
+        if impl == 'eager':
+            continue
+        max_diff = (output - reference).abs().max().item()
+        ok = torch.allclose(output, reference, atol=atol, rtol=1e-4)
+        passed &= ok
+        print(f"  {label:<28} {impl:<8} 최대 오차: {max_diff:.2e} {'통과' if ok else '실패'}")
+    return passed
+
+
+def check_modules(atol):
+    torch.manual_seed(0)
+    passed = True
+    for dim, heads in ((128, 2), (256, 4)):
+        module = Attention(dim, num_heads=heads).eval()
+        for batch in (1, 2):
+            for height, width in FEATURE_SIZES:
+                x = torch.randn(batch, dim, height, width)
+                outputs = {}
+                with torch.no_grad():
+                    for impl in ATTENTION_IMPLS:
+                        configure_attention(module, impl)
+                        outputs[impl] = module(x)
+                passed &= compare(outputs, atol, f"dim={dim} B={batch} {height}x{width}")
+    return passed
+
+
+def check_checkpoint(model_name, imgsz, atol):
+    from ultralytics import YOLO
+    from ultralytics.nn.modules import conv
+
+    model_path = os.path.join(MODELS_FOLDER, model_name)
+    if not os.path.exists(model_path):
+        print(f"  체크포인트 없음, 건너뜀: {os.path.abspath(model_path)}")
+        return True
+    conv.Silence = Silence
+    conv.SilenceChannel = SilenceChannel
+
+    network = YOLO(model_path).model.float().eval()
+    channels = int(network.yaml.get('ch', 3))
+    x = torch.rand(1, channels, imgsz, imgsz, generator=torch.Generator().manual_seed(0))
+    outputs = {}
+    with torch.no_grad():
+        for impl in ATTENTION_IMPLS:
+            count = configure_attention(network, impl)
+            output = network(x)
+            outputs[impl] = output[0] if isinstance(output, (list, tuple)) else output
+    if count == 0:
+        print(f"  '{model_name}'에 Attention 모듈이 없어 비교하지 않음")
+        return True
+    return compare(outputs, atol, f"{model_name} {imgsz}x{imgsz} (Attention {count}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attention 구현 출력 일치 확인')
+    parser.add_argument('--model', default=get_setting('default_model', 'yolo11n_early_fusion.pt'))
+    parser.add_argument('--imgsz', type=int, default=1280, help='체크포인트 비교 입력 크기')
+    parser.add_argument('--atol', type=float, default=1e-4)
+    args = parser.parse_args()
+
+    print(f"[Attention 비교] 구현: {', '.join(ATTENTION_IMPLS)}, chunk: {ATTENTION_CHUNK_SIZE}")
+    passed = check_modules(args.atol)
+    passed &= check_checkpoint(args.model, args.imgsz, args.atol)
+    if not passed:
+        print("[Attention 비교] 실패: eager 구현과 출력이 다릅니다")
+        sys.exit(1)
+    print("[Attention 비교] 통과")
+
+
+if __name__ == '__main__':
+    main()
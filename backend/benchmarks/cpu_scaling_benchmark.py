@@ -0,0 +1,108 @@
+# /backend/benchmarks/cpu_scaling_benchmark.py
+"""파이프라인 수에 따른 CPU 추론 처리량 비교 (스레드 예산 적용 전/후)
+
+파이프라인 하나를 추론 워커 스레드 하나로 보고, 1~N개 파이프라인을 동시에 돌리면서
+- 기본: 각 워커가 PyTorch 기본값대로 모든 코어를 intra-op 스레드로 사용
+- 스케줄러: CpuScheduler가 나눈 워커당 스레드 예산(+ --affinity 시 코어 고정) 적용
+두 경우의 파이프라인별/전체 FPS와 확장 효율(전체 FPS / (파이프라인 수 x 1개일 때 FPS))을 출력합니다.
+models_ai/의 모델이 있으면 그 모델로, 없으면 비슷한 크기의 합성곱 네트워크로 측정합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/cpu_scaling_benchmark.py [--pipelines 4] [--seconds 5] [--affinity]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import torch
+import torch.nn as nn
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.cpu_scheduler import CpuScheduler  # noqa: E402
+from app.services.settings_service import get_setting  # noqa: E402
+
+MODELS_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'models_ai')
+
+
+def build_network(model_name, imgsz):
+    """측정용 네트워크와 입력 (체크포인트가 없으면 yolo11n 수준 연산량의 합성곱 네트워크)"""
+    model_path = os.path.join(MODELS_FOLDER, model_name)
+    if os.path.exists(model_path):
+        from ultralytics import YOLO
+        from ultralytics.nn.modules import conv
+        from app.services.custom_classes import Silence, SilenceChannel
+
+        conv.Silence = Silence
+        conv.SilenceChannel = SilenceChannel
+        network = YOLO(model_path).model.float().fuse(verbose=False).eval()
+        channels = int(network.yaml.get('ch', 3))
+        return network, torch.rand(1, channels, imgsz, imgsz), model_name
+
+    layers, channels = [], 4
+    for width in (16, 32, 64, 128, 256):
+        layers += [nn.Conv2d(channels, width, 3, 2, 1), nn.SiLU(), nn.Conv2d(width, width, 3, 1, 1), nn.SiLU()]
+        channels = width
+    return nn.Sequential(*layers).eval(), torch.rand(1, 4, imgsz, imgsz), '합성곱 네트워크 (체크포인트 없음)'
+
+
+def run_pipelines(network, x, count, seconds, scheduler=None):
+    """count개 워커 스레드가 seconds 동안 추론한 파이프라인별 FPS 목록"""
+    frames = [0] * count
+    stop = threading.Event()
+
+    def worker(index):
+        infer = scheduler.wrap(network) if scheduler else network
+        with torch.no_grad():
+            infer(x)  # 워밍업 (스레드 풀 생성)
+            while not stop.is_set():
+                infer(x)
+                frames[index] += 1
+
+    if scheduler:
+        for index in range(count):
+            scheduler.register_pipeline(index)
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if scheduler:
+        for index in range(count):
+            scheduler.unregister_pipeline(index)
+    return [f / seconds for f in frames]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CPU 스레드 예산 확장성 벤치마크')
+    parser.add_argument('--model', default=get_setting('default_model', 'yolo11n_early_fusion.pt'))
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--pipelines', type=int, default=4, help='최대 동시 파이프라인 수')
+    parser.add_argument('--seconds', type=float, default=5.0, help='파이프라인 수별 측정 시간')
+    parser.add_argument('--reserved-cores', type=int, default=1)
+    parser.add_argument('--affinity', action='store_true')
+    args = parser.parse_args()
+
+    network, x, description = build_network(args.model, args.imgsz)
+    print(f"[CPU 확장성] 네트워크: {description}, 입력: {list(x.shape)}, 코어: {os.cpu_count()}")
+
+    # 기본 동작을 먼저 측정 (스케줄러가 스레드 수를 바꾸기 전)
+    results = {'기본': [run_pipelines(network, x, n, args.seconds) for n in range(1, args.pipelines + 1)]}
+    scheduler = CpuScheduler(workers=args.pipelines, reserved_cores=args.reserved_cores, affinity=args.affinity)
+    results['스케줄러'] = [run_pipelines(network, x, n, args.seconds, scheduler) for n in range(1, args.pipelines + 1)]
+
+    print(f"  {'방식':<8} {'파이프라인':>10} {'파이프라인별 FPS':>18} {'전체 FPS':>10} {'확장 효율':>10}")
+    for mode, runs in results.items():
+        single = sum(runs[0])
+        for count, fps in enumerate(runs, start=1):
+            total = sum(fps)
+            efficiency = total / (count * single) if single else 0.0
+            print(f"  {mode:<8} {count:>10} {min(fps):>8.1f} ~ {max(fps):<7.1f} {total:>10.1f} {efficiency:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
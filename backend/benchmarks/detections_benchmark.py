@@ -0,0 +1,109 @@
+# /backend/benchmarks/detections_benchmark.py
+"""탐지 결과 후처리 마이크로 벤치마크 (박스별 텐서 인덱싱 vs Detections 배열 한 번 변환)
+
+탐지 0/10/100개인 YOLO Results를 만들어, 기존 방식(박스마다 box.conf[0] 등으로 접근하여
+RGB/TIR 두 번 그리기 + 이벤트 확인)과 Detections 방식의 프레임당 처리 시간을 비교합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/detections_benchmark.py [--repeat 200] [--device cpu]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.detections import Detections, draw_detections  # noqa: E402
+
+NAMES = {0: 'person', 1: 'scrofa', 2: 'inermis'}
+FRAME_SHAPE = (480, 640, 3)
+THRESHOLD = 0.7
+
+
+def make_results(count, device):
+    """탐지 count개(추적 ID 포함 7열)를 가진 Results 생성"""
+    rng = np.random.default_rng(count)
+    x1 = rng.uniform(0, FRAME_SHAPE[1] - 60, count)
+    y1 = rng.uniform(20, FRAME_SHAPE[0] - 60, count)
+    data = np.stack([
+        x1, y1, x1 + rng.uniform(10, 60, count), y1 + rng.uniform(10, 60, count),
+        np.arange(1, count + 1), rng.uniform(0.3, 1.0, count), rng.integers(0, 3, count),
+    ], axis=1).astype(np.float32).reshape(count, 7)
+    orig_img = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    return [Results(orig_img, path='', names=NAMES, boxes=torch.from_numpy(data).to(device))]
+
+
+def legacy_draw(frame, results):
+    """변경 전 draw_detections_on_frame과 같은 박스별 처리"""
+    annotated_frame = frame.copy()
+    names = results[0].names
+    for box in results[0].boxes:
+        confidence = float(box.conf[0])
+        if confidence < THRESHOLD:
+            continue
+        x1, y1, x2, y2 = map(int, box.xyxy[0])
+        class_name = names[int(box.cls[0])]
+        color = {'person': (0, 0, 255), 'scrofa': (255, 0, 0), 'inermis': (0, 255, 0)}.get(class_name, (255, 255, 0))
+        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
+        label = f'{class_name} {confidence:.2f}'
+        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
+        cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), (x1 + label_size[0], y1), color, -1)
+        cv2.putText(annotated_frame, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    return annotated_frame
+
+
+def legacy_frame(frame_rgb, frame_tir, results):
+    legacy_draw(frame_rgb, results)
+    legacy_draw(frame_tir, results)
+    person_detected = False
+    for r in results:
+        for box in r.boxes:
+            confidence = float(box.conf[0])
+            class_name = r.names[int(box.cls[0])]
+            if confidence >= THRESHOLD and class_name in ('person', 'scrofa', 'inermis'):
+                person_detected = class_name == 'person'
+    return person_detected
+
+
+def vectorized_frame(frame_rgb, frame_tir, results):
+    detections = Detections.from_results(results)
+    display_detections = detections.above(THRESHOLD)
+    draw_detections(frame_rgb, display_detections)
+    draw_detections(frame_tir, display_detections)
+    candidates = detections.event_candidates(THRESHOLD, THRESHOLD)
+    return any(is_person for _, _, is_person in candidates)
+
+
+def measure(fn, frame_rgb, frame_tir, results, repeat):
+    fn(frame_rgb, frame_tir, results)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(frame_rgb, frame_tir, results)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='탐지 결과 후처리 마이크로 벤치마크')
+    parser.add_argument('--repeat', type=int, default=200, help='측정 반복 횟수')
+    parser.add_argument('--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    args = parser.parse_args()
+
+    frame_rgb = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    frame_tir = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    print(f"[벤치마크] 장치: {args.device}, 반복: {args.repeat}")
+    print(f"{'탐지 수':>8}{'기존(ms)':>12}{'배열(ms)':>12}{'배속':>8}")
+    for count in (0, 10, 100):
+        results = make_results(count, args.device)
+        legacy_ms = measure(legacy_frame, frame_rgb, frame_tir, results, args.repeat)
+        vectorized_ms = measure(vectorized_frame, frame_rgb, frame_tir, results, args.repeat)
+        print(f"{count:>8}{legacy_ms:>12.3f}{vectorized_ms:>12.3f}{legacy_ms / vectorized_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
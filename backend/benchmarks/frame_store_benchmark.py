@@ -0,0 +1,96 @@
+# /backend/benchmarks/frame_store_benchmark.py
+"""시험 영상 프레임 읽기 비용 비교 (영상 디코딩 vs 미리 디코딩된 메모리 매핑 프레임)
+
+test_videos/의 RGB/TIR 영상 쌍을 frame_cache/에 미리 디코딩한 뒤, 스트림 루프와 같은 방식으로
+(RGB 읽기 + TIR 읽기/그레이스케일) 전체 프레임을 읽을 때의 처리 속도(FPS)와 프레임당 CPU 시간을 비교합니다.
+메모리 매핑 read()는 페이지를 읽지 않는 뷰를 반환하므로, 두 방식 모두 프레임 픽셀을 미리 할당한 버퍼로
+복사하여 실제로 프레임 데이터를 읽는 비용까지 측정합니다 (이후 전처리/인코딩이 픽셀을 읽는 것과 같은 조건).
+두 번째 이후 재생과 같은 조건을 보기 위해 각 방식마다 한 번 먼저 읽고(페이지 캐시 워밍업) 측정합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/frame_store_benchmark.py [--passes 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.frame_store import open_stored_video, predecode_pair  # noqa: E402
+from app.services.offline_analysis import TEST_VIDEOS_FOLDER, find_video_pairs  # noqa: E402
+
+
+def read_all(rgb_cap, tir_cap):
+    """두 캡처를 끝까지 읽고 프레임 수 반환 (TIR은 스트림 루프처럼 그레이스케일로 사용, 픽셀은 버퍼로 복사)"""
+    frames = 0
+    buffers = {}
+    while True:
+        ret, frame_rgb = rgb_cap.read()
+        if not ret:
+            break
+        touch(buffers, 'rgb', frame_rgb)
+        if tir_cap:
+            ret_tir, frame_tir = tir_cap.read()
+            if ret_tir:
+                if frame_tir.ndim == 3:
+                    frame_tir = cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)
+                touch(buffers, 'tir', frame_tir)
+        frames += 1
+    return frames
+
+
+def touch(buffers, name, frame):
+    """프레임 픽셀을 재사용 버퍼로 복사 (메모리 매핑 뷰의 페이지를 실제로 읽게 함)"""
+    buffer = buffers.get(name)
+    if buffer is None or buffer.shape != frame.shape:
+        buffer = buffers[name] = np.empty_like(frame)
+    np.copyto(buffer, frame)
+
+
+def measure(open_pair, passes):
+    """(FPS, 프레임당 CPU ms) - 첫 번째 읽기는 워밍업으로 제외"""
+    best = None
+    for index in range(passes + 1):
+        rgb_cap, tir_cap = open_pair()
+        wall, cpu = time.perf_counter(), time.process_time()
+        frames = read_all(rgb_cap, tir_cap)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        rgb_cap.release()
+        if tir_cap:
+            tir_cap.release()
+        if index and frames:
+            result = (frames / wall, cpu / frames * 1000)
+            best = result if best is None or result[0] > best[0] else best
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='미리 디코딩된 프레임 캐시 읽기 벤치마크')
+    parser.add_argument('--input', default=TEST_VIDEOS_FOLDER)
+    parser.add_argument('--passes', type=int, default=2, help='방식별 측정 반복 횟수 (가장 빠른 결과 사용)')
+    args = parser.parse_args()
+
+    print(f"  {'영상':<32} {'방식':<10} {'FPS':>9} {'CPU ms/프레임':>14}")
+    for rgb_path, tir_path in find_video_pairs(args.input):
+        entries = predecode_pair(rgb_path, tir_path)
+        if not all(entries.values()):
+            print(f"  {os.path.basename(rgb_path)}: 디스크 예산이 부족하여 건너뜀")
+            continue
+        methods = {
+            'decode': lambda: (cv2.VideoCapture(rgb_path), cv2.VideoCapture(tir_path) if tir_path else None),
+            'memmap': lambda: (open_stored_video(rgb_path), open_stored_video(tir_path, gray=True) if tir_path else None),
+        }
+        for method, open_pair in methods.items():
+            result = measure(open_pair, max(1, args.passes))
+            if result is None:
+                continue
+            fps, cpu_ms = result
+            print(f"  {os.path.basename(rgb_path):<32} {method:<10} {fps:>9.1f} {cpu_ms:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# /backend/benchmarks/frame_transport_benchmark.py
+"""프레임 전송 방식별 전송량 비교 (base64 JSON vs 바이너리 첨부)
+
+test_videos/의 RGB/TIR 영상 쌍을 읽어 서버와 같은 방식으로 JPEG 인코딩한 뒤,
+Socket.IO 패킷 크기와 직렬화 시간을 방식별로 측정하여 원본 FPS 기준 초당 전송량을 출력합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/frame_transport_benchmark.py [--frames 300]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.offline_analysis import TEST_VIDEOS_FOLDER, find_video_pairs  # noqa: E402
+
+
+def base64_packet(header, rgb_jpeg, tir_jpeg):
+    """기존 video_frame 이벤트의 텍스트 패킷 ('42[...]')"""
+    payload = dict(header)
+    payload['rgb'] = base64.b64encode(rgb_jpeg).decode('utf-8')
+    payload['tir'] = base64.b64encode(tir_jpeg).decode('utf-8')
+    return ['42' + json.dumps(['video_frame', payload], separators=(',', ':'))]
+
+
+def binary_packet(header, rgb_jpeg, tir_jpeg):
+    """video_frame_bin 이벤트의 바이너리 패킷 (텍스트 헤더 패킷 + 첨부 2개)"""
+    placeholders = [{'_placeholder': True, 'num': 0}, {'_placeholder': True, 'num': 1}]
+    text = '452-' + json.dumps(['video_frame_bin', header] + placeholders, separators=(',', ':'))
+    return [text, bytes(rgb_jpeg), bytes(tir_jpeg)]
+
+
+def packet_size(parts):
+    return sum(len(part.encode('utf-8')) if isinstance(part, str) else len(part) for part in parts)
+
+
+def measure_pair(rgb_path, tir_path, max_frames):
+    rgb_cap = cv2.VideoCapture(rgb_path)
+    tir_cap = cv2.VideoCapture(tir_path)
+    fps = rgb_cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    totals = {'base64': [0, 0.0], 'binary': [0, 0.0]}  # 방식 -> [바이트 합계, 직렬화 시간 합계]
+    frames = 0
+    while frames < max_frames:
+        ret_rgb, frame_rgb = rgb_cap.read()
+        ret_tir, frame_tir = tir_cap.read()
+        if not ret_rgb or not ret_tir:
+            break
+        _, rgb_jpeg = cv2.imencode('.jpg', frame_rgb)
+        _, tir_jpeg = cv2.imencode('.jpg', frame_tir)
+        frames += 1
+        header = {'camera_id': 1, 'seq': frames, 'person_detected': False,
+                  'capture_timestamp': time.time(), 'current_time': frames / fps}
+
+        for name, build in (('base64', base64_packet), ('binary', binary_packet)):
+            started = time.perf_counter()
+            parts = build(header, rgb_jpeg, tir_jpeg)
+            totals[name][1] += time.perf_counter() - started
+            totals[name][0] += packet_size(parts)
+
+    rgb_cap.release()
+    tir_cap.release()
+    return frames, fps, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 전송 방식별 전송량 비교')
+    parser.add_argument('--frames', type=int, default=300, help='영상 쌍마다 측정할 최대 프레임 수')
+    args = parser.parse_args()
+
+    pairs = [(rgb_path, tir_path) for rgb_path, tir_path in find_video_pairs(TEST_VIDEOS_FOLDER) if tir_path]
+    if not pairs:
+        print(f"[벤치마크] RGB/TIR 영상 쌍이 없습니다: {TEST_VIDEOS_FOLDER}")
+        return
+
+    print(f"{'영상':<32}{'프레임':>7}{'FPS':>7}{'base64 KB/s':>14}{'binary KB/s':>14}{'절감':>8}"
+          f"{'base64 ms':>11}{'binary ms':>11}")
+    for rgb_path, tir_path in pairs:
+        rgb_filename = os.path.basename(rgb_path)
+        frames, fps, totals = measure_pair(rgb_path, tir_path, args.frames)
+        if frames == 0:
+            print(f"{rgb_filename:<32} 프레임을 읽을 수 없음")
+            continue
+        rates = {name: total[0] / frames * fps / 1024 for name, total in totals.items()}
+        times = {name: total[1] / frames * 1000 for name, total in totals.items()}
+        saving = (1 - rates['binary'] / rates['base64']) * 100
+        print(f"{rgb_filename.replace('_rgb.mp4', ''):<32}{frames:>7}{fps:>7.1f}{rates['base64']:>14.1f}"
+              f"{rates['binary']:>14.1f}{saving:>7.1f}%{times['base64']:>11.3f}{times['binary']:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# /backend/benchmarks/fusion_preprocess_alloc_check.py
+"""융합 전처리 프레임당 메모리 할당 확인 (tracemalloc)
+
+FusionPreprocessor를 워밍업한 뒤 같은 크기의 프레임을 반복 처리하면서 tracemalloc으로
+Python/NumPy 할당량(증가량과 최고점)을 측정하고, 기존 np.concatenate 방식과 비교합니다.
+전처리기의 프레임당 할당이 허용치를 넘으면 종료 코드 1을 반환합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/fusion_preprocess_alloc_check.py [--frames 200] [--width 1280 --height 720]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.fusion_preprocess import FusionPreprocessor  # noqa: E402
+
+# 반복 중 생기는 작은 Python 객체(정수, 반환 값 래퍼 등) 외에 배열 할당이 없어야 함
+MAX_BYTES_PER_FRAME = 256
+
+
+def legacy_preprocess(frame_rgb, frame_tir_gray):
+    frame_tir_gray_reshaped = np.expand_dims(frame_tir_gray, axis=-1)
+    return np.concatenate((frame_rgb, frame_tir_gray_reshaped), axis=-1)
+
+
+def measure(fn, frames, count):
+    """워밍업 후 count번 호출하는 동안의 할당량 (증가량, 최고점, 프레임당 시간)"""
+    fn(*frames[0])
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    for i in range(count):
+        fn(*frames[i % len(frames)])
+    elapsed = time.perf_counter() - started
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, peak - before, elapsed / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='융합 전처리 메모리 할당 확인')
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--imgsz', type=int, default=640)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [(rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8),
+               rng.integers(0, 256, (args.height, args.width), dtype=np.uint8)) for _ in range(4)]
+
+    preprocessor = FusionPreprocessor(imgsz=args.imgsz)
+    results = {
+        '기존 (concatenate)': measure(legacy_preprocess, frames, args.frames),
+        '전처리기 (NCHW 텐서)': measure(preprocessor, frames, args.frames),
+    }
+
+    print(f"[할당 확인] 프레임: {args.width}x{args.height}, 입력 텐서: {list(preprocessor.tensor.shape)}, 반복: {args.frames}")
+    for name, (growth, peak, ms) in results.items():
+        print(f"  {name:<22} 증가량: {growth:>10} bytes, 최고점: {peak:>12} bytes, 프레임당: {ms:.3f}ms")
+
+    growth, peak, _ = results['전처리기 (NCHW 텐서)']
+    if peak > MAX_BYTES_PER_FRAME * args.frames or preprocessor.configure_count != 1:
+        print(f"[할당 확인] 실패: 전처리기가 프레임마다 메모리를 할당합니다 (최고점 {peak} bytes, 재할당 {preprocessor.configure_count}회)")
+        sys.exit(1)
+    print("[할당 확인] 통과: 워밍업 이후 프레임당 배열 할당 없음")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# /backend/benchmarks/fusion_preprocess_parity_check.py
+"""융합 전처리기(NCHW 텐서)와 기존 연결 입력(HxWx4 배열)의 모델 입력/탐지 결과 일치 확인
+
+test_videos/의 RGB/TIR 영상 쌍에서 프레임을 읽어 같은 모델에
+- 기존: np.concatenate로 만든 (B, G, R, T) HxWx4 배열 → model.predict (ultralytics가 letterbox/채널 처리)
+- 전처리기: FusionPreprocessor 텐서 → model.predict → to_frame_coords로 원본 좌표 변환
+을 각각 넣고, ultralytics가 기존 입력으로 만든 텐서와 전처리기 텐서의 최대 차이(채널 순서/letterbox 확인)와
+원본 프레임 좌표 탐지 박스의 일치율, confidence 차이를 비교합니다. 허용치를 벗어나면 종료 코드 1을 반환합니다.
+(onnx_parity_check.py는 양쪽에 같은 전처리기 텐서를 넣으므로 전처리 자체의 차이는 확인하지 못함)
+
+사용법 (backend/ 에서):
+    python benchmarks/fusion_preprocess_parity_check.py [--model yolo11n_early_fusion_fin.pt] [--frames 30]
+"""
+
+import argparse
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.custom_classes import Silence, SilenceChannel  # noqa: E402
+from app.services.detections import Detections, match_boxes  # noqa: E402
+from app.services.fusion_preprocess import create_fusion_preprocessor  # noqa: E402
+from app.services.model_registry import get_model_path  # noqa: E402
+from app.services.offline_analysis import TEST_VIDEOS_FOLDER, find_video_pairs  # noqa: E402
+from app.services.settings_service import get_setting  # noqa: E402
+
+MATCH_IOU = 0.9  # 같은 객체로 볼 최소 IoU (보간 반올림 수준의 차이만 허용)
+
+
+def read_frames(rgb_path, tir_path, count):
+    cap_rgb, cap_tir = cv2.VideoCapture(rgb_path), cv2.VideoCapture(tir_path)
+    try:
+        for _ in range(count):
+            ok_rgb, frame_rgb = cap_rgb.read()
+            ok_tir, frame_tir = cap_tir.read()
+            if not ok_rgb or not ok_tir:
+                break
+            if frame_tir.shape[:2] != frame_rgb.shape[:2]:
+                frame_tir = cv2.resize(frame_tir, (frame_rgb.shape[1], frame_rgb.shape[0]))
+            yield frame_rgb, cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)
+    finally:
+        cap_rgb.release()
+        cap_tir.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='융합 전처리기 / 기존 연결 입력 결과 비교')
+    parser.add_argument('--model', default=get_setting('default_model', 'yolo11n_early_fusion.pt'))
+    parser.add_argument('--frames', type=int, default=30, help='영상 쌍마다 비교할 프레임 수')
+    parser.add_argument('--conf', type=float, default=0.25, help='탐지 confidence 임계값')
+    parser.add_argument('--max-input-diff', type=float, default=2 / 255, help='허용하는 최대 입력 텐서 차이')
+    parser.add_argument('--min-match', type=float, default=0.95, help='허용하는 최소 박스 일치율')
+    parser.add_argument('--max-conf-diff', type=float, default=0.02, help='허용하는 최대 confidence 차이')
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+    from ultralytics.nn.modules import conv
+
+    conv.Silence = Silence
+    conv.SilenceChannel = SilenceChannel
+    model_path = get_model_path(args.model)
+    if not os.path.exists(model_path):
+        print(f"[전처리 비교] 모델 파일이 없습니다: {os.path.abspath(model_path)}")
+        sys.exit(1)
+    model = YOLO(model_path)
+    preprocessor = create_fusion_preprocessor(model)
+
+    pairs = [(rgb_path, tir_path) for rgb_path, tir_path in find_video_pairs(TEST_VIDEOS_FOLDER) if tir_path]
+    if not pairs:
+        print(f"[전처리 비교] RGB/TIR 영상 쌍이 없습니다: {os.path.abspath(TEST_VIDEOS_FOLDER)}")
+        sys.exit(1)
+
+    legacy_boxes = fused_boxes = matched = frames = shape_mismatches = 0
+    input_diff = 0.0
+    conf_diffs = []
+    for rgb_path, tir_path in pairs:
+        for frame_rgb, frame_tir_gray in read_frames(rgb_path, tir_path, args.frames):
+            stacked = np.concatenate((frame_rgb, np.expand_dims(frame_tir_gray, axis=-1)), axis=-1)
+            legacy = model.predict(stacked, conf=args.conf, verbose=False)
+            # ultralytics가 기존 입력으로 실제 모델에 넣는 텐서 (letterbox + 채널 처리 결과)
+            legacy_tensor = model.predictor.preprocess([stacked]).float().cpu()
+            fused_tensor = preprocessor(frame_rgb, frame_tir_gray)
+            if legacy_tensor.shape != fused_tensor.shape:
+                shape_mismatches += 1
+            else:
+                input_diff = max(input_diff, (legacy_tensor - fused_tensor).abs().max().item())
+            fused = model.predict(fused_tensor, conf=args.conf, verbose=False)
+
+            reference = Detections.from_results(legacy).data
+            candidate = preprocessor.to_frame_coords(Detections.from_results(fused)).data
+            pairs_matched = match_boxes(reference, candidate, MATCH_IOU)
+            legacy_boxes += len(reference)
+            fused_boxes += len(candidate)
+            matched += len(pairs_matched)
+            conf_diffs.extend(abs(float(reference[i, -2] - candidate[j, -2])) for i, j in pairs_matched)
+            frames += 1
+        print(f"  {os.path.basename(rgb_path)}: 누적 {frames}프레임")
+
+    if not frames:
+        print("[전처리 비교] 읽은 프레임이 없습니다")
+        sys.exit(1)
+
+    total = max(legacy_boxes, fused_boxes)
+    match_ratio = matched / total if total else 1.0
+    max_conf_diff = max(conf_diffs) if conf_diffs else 0.0
+    print(f"[전처리 비교] 모델: {args.model}, 영상 쌍: {len(pairs)}, 프레임: {frames}, "
+          f"입력: {list(preprocessor.tensor.shape)}")
+    print(f"  입력 텐서      최대 차이: {input_diff:.5f}, 크기 불일치: {shape_mismatches}프레임")
+    print(f"  박스 수        기존: {legacy_boxes}, 전처리기: {fused_boxes}, 일치: {matched} ({match_ratio:.1%})")
+    print(f"  confidence 차이  최대: {max_conf_diff:.4f}, 평균: {np.mean(conf_diffs) if conf_diffs else 0.0:.4f}")
+
+    if (shape_mismatches or input_diff > args.max_input_diff or match_ratio < args.min_match
+            or max_conf_diff > args.max_conf_diff):
+        print("[전처리 비교] 실패: 전처리기 입력/결과가 기존 연결 입력과 다릅니다")
+        sys.exit(1)
+    print("[전처리 비교] 통과")
+
+
+if __name__ == '__main__':
+    main()
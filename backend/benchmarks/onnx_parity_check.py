@@ -0,0 +1,112 @@
+# /backend/benchmarks/onnx_parity_check.py
+"""ONNX Runtime 백엔드와 PyTorch 결과 비교 (test_videos 기준)
+
+test_videos/의 RGB/TIR 영상 쌍에서 프레임을 읽어 같은 융합 입력 텐서를 PyTorch(YOLO)와
+ONNX Runtime 어댑터에 넣고, 탐지 박스를 클래스별 IoU로 짝지어 일치율과 confidence 차이,
+프레임당 추론 시간을 비교합니다. 일치율이나 confidence 차이가 허용치를 벗어나면 종료 코드 1을 반환합니다.
+ONNX 파일이 없거나 원본 .pt보다 오래되었으면 먼저 내보냅니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/onnx_parity_check.py [--model yolo11n_early_fusion_fin.pt] [--frames 30] [--export]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.detections import match_boxes  # noqa: E402
+from app.services.fusion_preprocess import FusionPreprocessor  # noqa: E402
+from app.services.offline_analysis import TEST_VIDEOS_FOLDER, find_video_pairs  # noqa: E402
+from app.services.onnx_backend import export_onnx, get_onnx_paths, load_onnx_model  # noqa: E402
+from app.services.settings_service import get_setting  # noqa: E402
+
+MATCH_IOU = 0.9             # 같은 객체로 볼 최소 IoU (수치 오차 수준의 차이만 허용)
+
+
+def read_frames(rgb_path, tir_path, count):
+    cap_rgb, cap_tir = cv2.VideoCapture(rgb_path), cv2.VideoCapture(tir_path)
+    try:
+        for _ in range(count):
+            ok_rgb, frame_rgb = cap_rgb.read()
+            ok_tir, frame_tir = cap_tir.read()
+            if not ok_rgb or not ok_tir:
+                break
+            if frame_tir.shape[:2] != frame_rgb.shape[:2]:
+                frame_tir = cv2.resize(frame_tir, (frame_rgb.shape[1], frame_rgb.shape[0]))
+            yield frame_rgb, cv2.cvtColor(frame_tir, cv2.COLOR_BGR2GRAY)
+    finally:
+        cap_rgb.release()
+        cap_tir.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ONNX Runtime / PyTorch 결과 비교')
+    parser.add_argument('--model', default=get_setting('default_model', 'yolo11n_early_fusion.pt'))
+    parser.add_argument('--frames', type=int, default=30, help='영상 쌍마다 비교할 프레임 수')
+    parser.add_argument('--export', action='store_true', help='ONNX 파일이 최신이어도 다시 내보내기')
+    parser.add_argument('--min-match', type=float, default=0.95, help='허용하는 최소 박스 일치율')
+    parser.add_argument('--max-conf-diff', type=float, default=0.02, help='허용하는 최대 confidence 차이')
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    if args.export:
+        export_onnx(args.model)
+    onnx_model = load_onnx_model(args.model)  # 커스텀 모듈 등록 후 내보내므로 아래 YOLO 로드도 가능
+    torch_model = YOLO(get_onnx_paths(args.model)[0])
+    preprocessor = FusionPreprocessor(imgsz=onnx_model.imgsz, stride=onnx_model.stride, auto=False)
+
+    pairs = [(rgb_path, tir_path) for rgb_path, tir_path in find_video_pairs(TEST_VIDEOS_FOLDER) if tir_path]
+    if not pairs:
+        print(f"[ONNX 비교] RGB/TIR 영상 쌍이 없습니다: {os.path.abspath(TEST_VIDEOS_FOLDER)}")
+        sys.exit(1)
+
+    torch_boxes = onnx_boxes = matched = frames = 0
+    conf_diffs = []
+    torch_seconds = onnx_seconds = 0.0
+    for rgb_path, tir_path in pairs:
+        for frame_rgb, frame_tir_gray in read_frames(rgb_path, tir_path, args.frames):
+            tensor = preprocessor(frame_rgb, frame_tir_gray)
+
+            started = time.perf_counter()
+            reference = torch_model.predict(tensor, verbose=False)[0].boxes.data.cpu().numpy()
+            torch_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            candidate = onnx_model.predict(tensor)[0].boxes.data.cpu().numpy()
+            onnx_seconds += time.perf_counter() - started
+
+            pairs = match_boxes(reference, candidate, MATCH_IOU)
+            pair_matched = len(pairs)
+            pair_diffs = [abs(float(reference[i, 4] - candidate[j, 4])) for i, j in pairs]
+            torch_boxes += len(reference)
+            onnx_boxes += len(candidate)
+            matched += pair_matched
+            conf_diffs.extend(pair_diffs)
+            frames += 1
+        print(f"  {os.path.basename(rgb_path)}: 누적 {frames}프레임")
+
+    if not frames:
+        print("[ONNX 비교] 읽은 프레임이 없습니다")
+        sys.exit(1)
+
+    match_ratio = matched / max(torch_boxes, onnx_boxes) if max(torch_boxes, onnx_boxes) else 1.0
+    max_conf_diff = max(conf_diffs) if conf_diffs else 0.0
+    print(f"[ONNX 비교] 모델: {args.model}, 영상 쌍: {len(pairs)}, 프레임: {frames}, 입력: {list(tensor.shape)}")
+    print(f"  박스 수          PyTorch: {torch_boxes}, ONNX: {onnx_boxes}, 일치: {matched} ({match_ratio:.1%})")
+    print(f"  confidence 차이  최대: {max_conf_diff:.4f}, 평균: {np.mean(conf_diffs) if conf_diffs else 0.0:.4f}")
+    print(f"  프레임당 추론    PyTorch: {torch_seconds / max(frames, 1) * 1000:.1f}ms, "
+          f"ONNX: {onnx_seconds / max(frames, 1) * 1000:.1f}ms")
+
+    if match_ratio < args.min_match or max_conf_diff > args.max_conf_diff:
+        print("[ONNX 비교] 실패: ONNX 결과가 PyTorch 결과와 허용치 이상 다릅니다")
+        sys.exit(1)
+    print("[ONNX 비교] 통과")
+
+
+if __name__ == '__main__':
+    main()
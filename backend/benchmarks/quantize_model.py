@@ -0,0 +1,50 @@
+# /backend/benchmarks/quantize_model.py
+"""조기 융합 모델의 INT8 양자화 변형 생성 및 정확도/속도 비교
+
+test_videos 프레임으로 (정적 양자화는 보정까지) 양자화 모델을 만들고, FP32 ONNX 모델의 탐지 결과를
+기준으로 mAP50/recall 하락폭과 프레임당 추론 시간을 측정합니다. 하락폭이 한도
+(--max-drift, 기본: settings.json의 quantization_max_drift) 이내인 변형만 models_ai/quantized_variants.json에
+등록되어 /api/models 목록에 나타나며, 하나라도 등록이 거부되면 종료 코드 1을 반환합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/quantize_model.py [--model yolo11n_early_fusion_fin.pt] [--mode static|dynamic|both]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.quantization import (  # noqa: E402
+    DEFAULT_CALIBRATION_FRAMES, DEFAULT_EVAL_FRAMES, QUANTIZATION_MODES, quantize_model,
+)
+from app.services.settings_service import get_setting  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='INT8 양자화 변형 생성')
+    parser.add_argument('--model', default=get_setting('default_model', 'yolo11n_early_fusion.pt'))
+    parser.add_argument('--mode', choices=QUANTIZATION_MODES + ('both',), default='static')
+    parser.add_argument('--calibration-frames', type=int, default=DEFAULT_CALIBRATION_FRAMES)
+    parser.add_argument('--eval-frames', type=int, default=DEFAULT_EVAL_FRAMES)
+    parser.add_argument('--max-drift', type=float, default=None, help='허용하는 최대 mAP50/recall 하락폭')
+    args = parser.parse_args()
+
+    modes = QUANTIZATION_MODES if args.mode == 'both' else (args.mode,)
+    results = [quantize_model(args.model, mode, calibration_frames=args.calibration_frames,
+                              eval_frames=args.eval_frames, max_drift=args.max_drift) for mode in modes]
+
+    print(f"[양자화] 원본: {args.model}, 평가 프레임: {results[0]['frames']}")
+    for result in results:
+        status = '등록' if result['registered'] else '거부'
+        print(f"  {result['name']:<44} {status}  mAP50: {result['map50']:.3f} (하락 {result['map50_drift']:.3f}), "
+              f"recall: {result['recall']:.3f} (하락 {result['recall_drift']:.3f}), "
+              f"{result['fp32_ms']:.1f}ms → {result['int8_ms']:.1f}ms ({result['speedup']:.2f}배), "
+              f"{result['fp32_size_mb']:.1f}MB → {result['size_mb']:.1f}MB")
+
+    if not all(result['registered'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
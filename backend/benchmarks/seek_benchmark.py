@@ -0,0 +1,124 @@
+# /backend/benchmarks/seek_benchmark.py
+"""시험 영상 시간 이동 지연/정확도 비교 (기존 FPS 기반 이동 vs 시간 이동 인덱스)
+
+test_videos/의 RGB/TIR 영상 쌍마다 임의의 시각 N개로 이동하면서
+- 기존: 초 x CAP_PROP_FPS로 계산한 프레임 번호로 두 캡처에 cap.set(CAP_PROP_POS_FRAMES)
+- 인덱스: seek_index.seek_pair (프레임 시각으로 목표를 찾고 키프레임부터 목표까지 디코딩)
+두 방식의 이동 + 첫 프레임 읽기 지연(평균/p95/최대)과, 처음부터 순서대로 디코딩한 기준 프레임과의
+일치율(RGB 정확도, TIR이 RGB와 같은 시각에 정렬된 비율)을 출력합니다. 인덱스 생성 시간도 함께 출력합니다.
+
+사용법 (backend/ 에서):
+    python benchmarks/seek_benchmark.py [--seeks 30] [--seed 0] [--rebuild]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from app.services.offline_analysis import TEST_VIDEOS_FOLDER, find_video_pairs  # noqa: E402
+from app.services.seek_index import get_index_path, load_seek_index, seek_pair  # noqa: E402
+
+
+def frame_digest(frame):
+    return hashlib.sha1(np.ascontiguousarray(frame).tobytes()).hexdigest()
+
+
+def reference_digests(video_path, frame_indices):
+    """처음부터 순서대로 디코딩하여 frame_indices 프레임의 해시 수집 (정확도 기준)"""
+    wanted = set(frame_indices)
+    last = max(wanted) if wanted else -1
+    digests = {}
+    cap = cv2.VideoCapture(video_path)
+    index = 0
+    while index <= last and cap.grab():
+        if index in wanted:
+            digests[index] = frame_digest(cap.retrieve()[1])
+        index += 1
+    cap.release()
+    return digests
+
+
+def legacy_seek(seconds, rgb_cap, tir_cap):
+    """기존 start_video_processing의 시간 이동 (FPS로 프레임 번호 계산)"""
+    video_fps = rgb_cap.get(cv2.CAP_PROP_FPS)
+    if video_fps <= 0:
+        video_fps = 30
+    seek_frame = int(seconds * video_fps)
+    rgb_cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
+    if tir_cap:
+        tir_cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
+
+
+def run_method(method, rgb_path, tir_path, times, rgb_index, tir_index):
+    """times로 차례로 이동하며 (지연 목록, RGB 프레임 해시 목록, TIR 프레임 해시 목록) 반환"""
+    rgb_cap = cv2.VideoCapture(rgb_path)
+    tir_cap = cv2.VideoCapture(tir_path) if tir_path else None
+    latencies, rgb_digests, tir_digests = [], [], []
+    for seconds in times:
+        started = time.perf_counter()
+        if method == 'legacy':
+            legacy_seek(seconds, rgb_cap, tir_cap)
+        else:
+            seek_pair(seconds, rgb_cap, rgb_index, tir_cap, tir_index)
+        ok, frame_rgb = rgb_cap.read()
+        frame_tir = tir_cap.read()[1] if tir_cap else None
+        latencies.append((time.perf_counter() - started) * 1000)
+        rgb_digests.append(frame_digest(frame_rgb) if ok else None)
+        tir_digests.append(frame_digest(frame_tir) if frame_tir is not None else None)
+    rgb_cap.release()
+    if tir_cap:
+        tir_cap.release()
+    return latencies, rgb_digests, tir_digests
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시험 영상 시간 이동 벤치마크')
+    parser.add_argument('--input', default=TEST_VIDEOS_FOLDER)
+    parser.add_argument('--seeks', type=int, default=30, help='영상 쌍마다 이동할 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rebuild', action='store_true', help='저장된 인덱스를 지우고 새로 생성')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"  {'영상':<32} {'방식':<8} {'평균(ms)':>9} {'p95(ms)':>9} {'최대(ms)':>9} {'RGB 정확':>9} {'TIR 정렬':>9}")
+    for rgb_path, tir_path in find_video_pairs(args.input):
+        if args.rebuild:
+            for path in (rgb_path, tir_path):
+                if path and os.path.exists(get_index_path(path)):
+                    os.remove(get_index_path(path))
+        started = time.perf_counter()
+        rgb_index = load_seek_index(rgb_path)
+        tir_index = load_seek_index(tir_path) if tir_path else None
+        build_seconds = time.perf_counter() - started
+        if rgb_index is None or not rgb_index.frame_count:
+            print(f"  {os.path.basename(rgb_path)}: 인덱스를 만들 수 없어 건너뜀")
+            continue
+
+        times = [rng.uniform(0, rgb_index.duration) for _ in range(args.seeks)]
+        # 정답: 각 시각에 표시되는 RGB 프레임과, 그 프레임 시각에 해당하는 TIR 프레임
+        rgb_targets = [rgb_index.frame_at(t) for t in times]
+        tir_targets = [tir_index.frame_at(rgb_index.time_of(f)) for f in rgb_targets] if tir_index else []
+        rgb_reference = reference_digests(rgb_path, rgb_targets)
+        tir_reference = reference_digests(tir_path, tir_targets) if tir_index else {}
+
+        name = os.path.basename(rgb_path)
+        print(f"  {name:<32} 인덱스 준비 {build_seconds:.2f}초 ({rgb_index.source}, {rgb_index.frame_count}프레임, "
+              f"키프레임 {len(rgb_index.keyframes)}개)")
+        for method in ('legacy', 'index'):
+            latencies, rgb_digests, tir_digests = run_method(method, rgb_path, tir_path, times, rgb_index, tir_index)
+            rgb_correct = np.mean([d == rgb_reference.get(f) for d, f in zip(rgb_digests, rgb_targets)])
+            tir_aligned = (np.mean([d == tir_reference.get(f) for d, f in zip(tir_digests, tir_targets)])
+                           if tir_targets else float('nan'))
+            print(f"  {'':<32} {method:<8} {np.mean(latencies):>9.1f} {np.percentile(latencies, 95):>9.1f} "
+                  f"{max(latencies):>9.1f} {rgb_correct:>9.0%} {tir_aligned:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -21,12 +21,18 @@ app = create_app(os.getenv('FLASK_ENV') or 'development')
 
 # --- Graceful Shutdown ---
 from app.sockets.events import video_tasks
+from app.services.pipeline_service import stop_all_pipelines
 import signal
 import sys
 
 def signal_handler(sig, frame):
     print('\nCtrl+C가 감지되었습니다. 서버를 종료합니다...')
     
+    # 모든 카메라 파이프라인 종료
+    stopped_pipelines = stop_all_pipelines()
+    if stopped_pipelines:
+        print(f"  - 카메라 파이프라인 {stopped_pipelines}개를 종료했습니다.")
+
     # 모든 활성 비디오 처리 스레드 종료
     tasks_to_kill = []
     for sid in list(video_tasks.keys()):
@@ -7,7 +7,7 @@ import EventLog from './EventLog';
 import TestModePanel from './TestModePanel';
 import FullscreenViewer from './FullscreenViewer';
 import EventDetailViewer from './EventDetailViewer';
-import { initSocket, disconnectSocket, subscribeToEvent, sendEvent } from '../services/socket';
+import { initSocket, disconnectSocket, subscribeToEvent, subscribeToVideoFrames, sendEvent } from '../services/socket';
 import { getDefaultModel } from '../services/api';
 import AuthContext from '../context/AuthContext';
 import alertSound from '../assets/alarm.mp3';
@@ -22,6 +22,7 @@ const Dashboard = () => {
   const [liveFrames, setLiveFrames] = useState({ 1: { rgb: null, tir: null } });
   const [isStreaming, setIsStreaming] = useState({ 1: false });
   const [personDetected, setPersonDetected] = useState({ 1: false });
+  const [degradedStreams, setDegradedStreams] = useState({ 1: false });
 
   const [viewer, setViewer] = useState(null);
   const openViewer = (cameraId, stream, title) => setViewer({ cameraId, stream, title });
@@ -48,7 +49,11 @@ const Dashboard = () => {
   const handleVideoFrame = useCallback((data) => {
     console.log('비디오 프레임 수신:', data.camera_id, '현재 모드:', modeRef.current);
     if (typeof data.camera_id === 'number' && modeRef.current === 'live') {
-      setLiveFrames(prev => ({ ...prev, [data.camera_id]: { rgb: data.rgb, tir: data.tir } }));
+      // 클라이언트 표시 모드이면 원본 프레임과 함께 받은 탐지 배열을 캔버스로 그림
+      const overlay = data.overlay === 'client'
+        ? { detections: data.detections, classNames: data.class_names, frameSize: data.frame_size }
+        : null;
+      setLiveFrames(prev => ({ ...prev, [data.camera_id]: { rgb: data.rgb, tir: data.tir, overlay } }));
       setPersonDetected(prev => ({ ...prev, [data.camera_id]: data.person_detected }));
     }
   }, []); // 의존성 배열 비움
@@ -82,12 +87,20 @@ const Dashboard = () => {
       setServerMessage(data.message);
     };
 
+    // 연결이 느려 서버가 프레임을 건너뛰는 중인지 여부
+    const handleStreamDegraded = (data) => {
+      console.log('스트림 전송 상태 변경:', data);
+      setDegradedStreams(prev => ({ ...prev, [data.camera_id]: data.degraded }));
+    };
+
     subscribeToEvent('response', handleResponse);
-    subscribeToEvent('video_frame', handleVideoFrame);
+    subscribeToEvent('stream_degraded', handleStreamDegraded);
+    const unsubscribeVideoFrames = subscribeToVideoFrames(handleVideoFrame); // 바이너리/base64 프레임 모두 이미지 src로 변환되어 전달됨
 
     // Cleanup 함수: 컴포넌트가 사라질 때 소켓 연결을 반드시 끊도록 수정
     return () => {
       console.log('Dashboard 언마운트: 스트림 중지 및 소켓 연결 해제');
+      if (unsubscribeVideoFrames) unsubscribeVideoFrames();
       // 현재 cameraIds를 사용하여 스트림 중지
       [1].forEach(id => { // cameraIds 대신 하드코딩된 값 사용
         sendEvent('stop_stream', { camera_id: id });
@@ -140,7 +153,10 @@ const Dashboard = () => {
         sendEvent('start_stream', { 
           camera_id: id,
           model: isAdmin ? modelToUse : undefined,
-          user_id: user.id
+          user_id: user.id,
+          transport: 'binary', // JPEG 바이트를 바이너리로 수신 (base64 대비 약 33% 전송량 절감)
+          ack: true, // 프레임마다 응답하여 연결이 느릴 때 서버가 이 클라이언트의 프레임만 건너뛰도록 함
+          overlay: 'client' // 서버는 원본 프레임만 인코딩하고 탐지 결과는 대시보드에서 그림
         });
         setIsStreaming(prev => ({ ...prev, [id]: true }));
       });
@@ -250,6 +266,8 @@ const Dashboard = () => {
                       isStreaming={isStreaming[cameraId]}
                       onStreamClick={() => openViewer(cameraId, 'rgb', `카메라 ${cameraId} - RGB`)}
                       personDetected={personDetected[cameraId]}
+                      degraded={degradedStreams[cameraId]}
+                      overlay={liveFrames[cameraId]?.overlay}
                     />
                     <VideoStream
                       title={`카메라 ${cameraId} - TIR`}
@@ -257,6 +275,8 @@ const Dashboard = () => {
                       isStreaming={isStreaming[cameraId]}
                       onStreamClick={() => openViewer(cameraId, 'tir', `카메라 ${cameraId} - TIR`)}
                       personDetected={personDetected[cameraId]}
+                      degraded={degradedStreams[cameraId]}
+                      overlay={liveFrames[cameraId]?.overlay}
                     />
                   </React.Fragment>
                 ))}
@@ -284,6 +304,7 @@ const Dashboard = () => {
         <FullscreenViewer
           title={viewer.title}
           frameData={liveFrames[viewer.cameraId]?.[viewer.stream]}
+          overlay={liveFrames[viewer.cameraId]?.overlay}
           onClose={closeViewer}
         />
       )}
@@ -0,0 +1,59 @@
+// /frontend/src/components/DetectionOverlay.js
+
+import React, { useEffect, useRef } from 'react';
+
+// 서버 그리기와 같은 객체 타입별 색상
+const CLASS_COLORS = {
+  person: 'rgb(255, 0, 0)',    // 빨강
+  scrofa: 'rgb(0, 0, 255)',    // 파랑
+  inermis: 'rgb(0, 255, 0)',   // 초록
+};
+const DEFAULT_COLOR = 'rgb(0, 255, 255)'; // 청록
+
+// 클라이언트 표시 모드('overlay': 'client')에서 원본 프레임 위에 탐지 결과를 그리는 캔버스
+// detections: [클래스 ID, confidence, x1, y1, x2, y2, 추적 ID] 배열, frameSize: [너비, 높이]
+const DetectionOverlay = ({ detections, classNames = [], frameSize }) => {
+  const canvasRef = useRef(null);
+
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    if (!canvas || !frameSize) return;
+
+    const [width, height] = frameSize;
+    if (canvas.width !== width) canvas.width = width;
+    if (canvas.height !== height) canvas.height = height;
+
+    const ctx = canvas.getContext('2d');
+    ctx.clearRect(0, 0, width, height);
+    ctx.font = 'bold 13px sans-serif';
+    ctx.lineWidth = 2;
+
+    (detections || []).forEach(([classId, confidence, x1, y1, x2, y2, trackId]) => {
+      const className = classNames[classId] ?? String(classId);
+      const color = CLASS_COLORS[className] || DEFAULT_COLOR;
+      const label = `${trackId >= 0 ? `#${trackId} ` : ''}${className} ${confidence.toFixed(2)}`;
+      const labelWidth = ctx.measureText(label).width;
+
+      // BBox 그리기
+      ctx.strokeStyle = color;
+      ctx.strokeRect(x1, y1, x2 - x1, y2 - y1);
+
+      // 라벨 배경 및 텍스트 그리기
+      ctx.fillStyle = color;
+      ctx.fillRect(x1, y1 - 20, labelWidth + 8, 20);
+      ctx.fillStyle = '#fff';
+      ctx.fillText(label, x1 + 4, y1 - 6);
+    });
+  }, [detections, classNames, frameSize]);
+
+  if (!frameSize) return null;
+
+  return (
+    <canvas
+      ref={canvasRef}
+      className="absolute top-0 left-0 w-full h-full pointer-events-none"
+    />
+  );
+};
+
+export default DetectionOverlay;
@@ -1,8 +1,9 @@
 // /frontend/src/components/FullscreenViewer.js
 
 import React, { useEffect } from 'react';
+import DetectionOverlay from './DetectionOverlay';
 
-const FullscreenViewer = ({ title, frameData, onClose }) => {
+const FullscreenViewer = ({ title, frameData, onClose, overlay = null }) => {
   // ESC로 닫기 (전역 스타일 변화 없음)
   useEffect(() => {
     const onEsc = (e) => e.key === 'Escape' && onClose();
@@ -38,12 +39,15 @@ const FullscreenViewer = ({ title, frameData, onClose }) => {
 
         {/* 컨텐츠 */}
         <div className="bg-black max-h-[62vh] overflow-auto">
-          <img
-            src={`data:image/jpeg;base64,${frameData}`}
-            alt={title}
-            className="block max-w-full max-h-[62vh] w-auto h-auto m-auto object-contain"
-            draggable={false}
-          />
+          <div className="relative w-fit m-auto">
+            <img
+              src={frameData}
+              alt={title}
+              className="block max-w-full max-h-[62vh] w-auto h-auto object-contain"
+              draggable={false}
+            />
+            {overlay && <DetectionOverlay {...overlay} />}
+          </div>
         </div>
       </div>
     </div>
@@ -2,7 +2,7 @@
 
 import React, { useState, useEffect, useRef } from 'react';
 import { getTestVideos, getModels } from '../services/api';
-import { sendEvent, subscribeToEvent, unsubscribeFromEvent } from '../services/socket';
+import { sendEvent, subscribeToVideoFrames } from '../services/socket';
 
 const TestModePanel = () => {
     const [testVideos, setTestVideos] = useState([]);
@@ -93,10 +93,10 @@ const TestModePanel = () => {
                 }
             }
         };
-        subscribeToEvent('video_frame', handleVideoFrame);
+        const unsubscribeVideoFrames = subscribeToVideoFrames(handleVideoFrame);
 
         return () => {
-            unsubscribeFromEvent('video_frame', handleVideoFrame);
+            if (unsubscribeVideoFrames) unsubscribeVideoFrames();
             if (isAnalyzing) {
                 sendEvent('stop_test_stream', {});
             }
@@ -352,7 +352,9 @@ const TestModePanel = () => {
         sendEvent('start_test_stream', { 
             rgb_filename: selectedRgbVideo,
             tir_filename: selectedTirVideo,
-            model: selectedModel
+            model: selectedModel,
+            transport: 'binary',
+            ack: true
         });
     };
 
@@ -513,7 +515,7 @@ const TestModePanel = () => {
                                 {isAnalyzing && rgbFrame && (
                                     <div className="absolute top-0 left-0 w-full h-full z-20 pointer-events-none">
                                         <img 
-                                            src={`data:image/jpeg;base64,${rgbFrame}`} 
+                                            src={rgbFrame} 
                                             alt="RGB Analysis Result" 
                                             className="w-full h-full object-contain opacity-80"
                                         />
@@ -547,7 +549,7 @@ const TestModePanel = () => {
                                 {isAnalyzing && tirFrame && (
                                     <div className="absolute top-0 left-0 w-full h-full z-20 pointer-events-none">
                                         <img 
-                                            src={`data:image/jpeg;base64,${tirFrame}`} 
+                                            src={tirFrame} 
                                             alt="TIR Analysis Result" 
                                             className="w-full h-full object-contain opacity-80"
                                         />
@@ -1,8 +1,9 @@
 // /frontend/src/components/VideoStream.js
 
 import React from 'react';
+import DetectionOverlay from './DetectionOverlay';
 
-const VideoStream = ({ title, frameData, isStreaming, onStreamClick, personDetected = false }) => {
+const VideoStream = ({ title, frameData, isStreaming, onStreamClick, personDetected = false, degraded = false, overlay = null }) => {
   // personDetected 값에 따라 부모 div의 배경 클래스를 동적으로 결정
   const containerClass = personDetected
     ? 'bg-blink-warning' // 탐지 시: 강화된 깜빡임 애니메이션 배경
@@ -27,19 +28,23 @@ const VideoStream = ({ title, frameData, isStreaming, onStreamClick, personDetec
         <p>스트리밍: {isStreaming ? '활성' : '비활성'}</p>
         <p>프레임 데이터: {debugInfo.hasFrameData ? '있음' : '없음'} ({debugInfo.frameDataLength} chars)</p>
         <p>탐지 상태: {personDetected ? '탐지됨' : '탐지 안됨'}</p>
+        {degraded && <p className="text-yellow-400">네트워크 지연: 일부 프레임을 건너뛰는 중</p>}
       </div>
 
       <div
         className={`relative bg-black rounded-md aspect-video flex items-center justify-center transition-all duration-300 border-2 ${borderColor} ${personDetected ? 'ring-4 ring-red-500 ring-opacity-50' : ''}`}
       >
         {frameData ? (
-          <img
-            src={`data:image/jpeg;base64,${frameData}`}
-            alt="Video Stream"
-            className="w-full h-auto object-contain"
-            onLoad={() => console.log(`${title} 이미지 로드 완료`)}
-            onError={(e) => console.error(`${title} 이미지 로드 실패:`, e)}
-          />
+          <div className="relative w-full">
+            <img
+              src={frameData}
+              alt="Video Stream"
+              className="w-full h-auto object-contain"
+              onLoad={() => console.log(`${title} 이미지 로드 완료`)}
+              onError={(e) => console.error(`${title} 이미지 로드 실패:`, e)}
+            />
+            {overlay && <DetectionOverlay {...overlay} />}
+          </div>
         ) : (
           <div className="text-center">
             <p className="text-gray-500 mb-2">
@@ -87,7 +87,7 @@ export const subscribeToEvent = (eventName, callback) => {
   }
 
   // 안전한 콜백 래퍼 생성
-  const safeCallback = (data) => {
+  const safeCallback = (...args) => {
     // 사용자 토큰 확인
     const token = localStorage.getItem('accessToken');
     if (!token) {
@@ -96,7 +96,7 @@ export const subscribeToEvent = (eventName, callback) => {
     }
     
     try {
-      callback(data);
+      callback(...args);
     } catch (error) {
       console.error(`이벤트 핸들러 오류 (${eventName}):`, error);
     }
@@ -132,6 +132,100 @@ export const unsubscribeFromEvent = (eventName, callback) => {
   }
 };
 
+// 비디오 프레임 구독자: 소켓 리스너는 하나만 등록하고 프레임마다 이미지 src를 한 번만 만들어 모든 구독자에게 전달
+// (구독자마다 Blob URL을 만들면 한 구독자가 새 URL을 만들며 다른 구독자가 방금 받은 URL을 해제하게 됨)
+const videoFrameSubscribers = new Set();
+let videoFrameSocket = null; // 공유 리스너가 등록된 소켓 (재연결로 소켓이 바뀌면 다시 등록)
+let unsubscribeSharedFrames = null;
+
+// 카메라/스트림별로 마지막에 만든 이미지 Blob URL (새 프레임이 오면 이전 URL 해제)
+let frameObjectUrls = {};
+
+const toFrameUrl = (key, jpegBuffer) => {
+  const url = URL.createObjectURL(new Blob([jpegBuffer], { type: 'image/jpeg' }));
+  if (frameObjectUrls[key]) {
+    URL.revokeObjectURL(frameObjectUrls[key]);
+  }
+  frameObjectUrls[key] = url;
+  return url;
+};
+
+const revokeFrameUrls = () => {
+  Object.values(frameObjectUrls).forEach((url) => URL.revokeObjectURL(url));
+  frameObjectUrls = {};
+};
+
+const publishVideoFrame = (frame) => {
+  videoFrameSubscribers.forEach((subscriber) => {
+    try {
+      subscriber(frame);
+    } catch (error) {
+      console.error('비디오 프레임 구독자 오류:', error);
+    }
+  });
+};
+
+// 스트림 시작 시 ack: true를 보낸 경우 서버가 ack 함수를 함께 보내므로, 구독자 수와 관계없이 프레임마다
+// 한 번만 즉시 응답하여 서버가 이 클라이언트의 미응답 프레임 수를 기준으로 흐름 제어(초과 프레임 폐기)를 할 수 있게 함
+const handleBinaryFrame = (header, rgb, tir, ack) => {
+  if (typeof ack === 'function') ack();
+  publishVideoFrame({
+    ...header,
+    rgb: toFrameUrl(`${header.camera_id}_rgb`, rgb),
+    tir: toFrameUrl(`${header.camera_id}_tir`, tir),
+  });
+};
+
+const handleBase64Frame = (data, ack) => {
+  if (typeof ack === 'function') ack();
+  publishVideoFrame({
+    ...data,
+    rgb: data.rgb ? `data:image/jpeg;base64,${data.rgb}` : null,
+    tir: data.tir ? `data:image/jpeg;base64,${data.tir}` : null,
+  });
+};
+
+const detachVideoFrameListeners = () => {
+  if (unsubscribeSharedFrames) unsubscribeSharedFrames();
+  unsubscribeSharedFrames = null;
+  videoFrameSocket = null;
+  revokeFrameUrls();
+};
+
+const attachVideoFrameListeners = () => {
+  if (videoFrameSocket === socket) return;
+  detachVideoFrameListeners();
+  const unsubscribeBinary = subscribeToEvent('video_frame_bin', handleBinaryFrame);
+  const unsubscribeBase64 = subscribeToEvent('video_frame', handleBase64Frame);
+  unsubscribeSharedFrames = () => {
+    if (unsubscribeBinary) unsubscribeBinary();
+    if (unsubscribeBase64) unsubscribeBase64();
+  };
+  videoFrameSocket = socket;
+};
+
+// 비디오 프레임 구독: 바이너리(video_frame_bin)와 기존 base64(video_frame) 프레임을 모두
+// { ...헤더, rgb: 이미지 src, tir: 이미지 src } 형태로 변환하여 callback에 전달
+export const subscribeToVideoFrames = (callback) => {
+  if (!socket) {
+    console.warn('소켓이 초기화되지 않았습니다. initSocket()을 먼저 호출하세요.');
+    return null;
+  }
+
+  // 같은 callback으로 여러 번 구독해도 구독마다 따로 해제되도록 래퍼로 등록
+  const subscriber = (frame) => callback(frame);
+  videoFrameSubscribers.add(subscriber);
+  attachVideoFrameListeners();
+
+  // 구독 해제 함수 반환 (마지막 구독자가 해제되면 공유 리스너와 Blob URL도 정리)
+  return () => {
+    videoFrameSubscribers.delete(subscriber);
+    if (videoFrameSubscribers.size === 0) {
+      detachVideoFrameListeners();
+    }
+  };
+};
+
 // 소켓 연결 상태 확인
 export const isSocketConnected = () => {
   return socket && socket.connected;